@@ -1,4 +1,28 @@
-from .main_window import MainWindow
-from .equation_solver import EquationSolver
+from .equation_solver import (BandMatrix, CholeskyFactorization, DimensionMismatchError, EquationSolver,
+                              IterativeSolution, LDLTFactorization, LUFactorization, MixedPrecisionSolution,
+                              NonSquareMatrixError, NotConvergedError, NotPositiveDefiniteError,
+                              NotSymmetricMatrixError, OutOfCoreLUFactorization, SingularMatrixError,
+                              SolveCancelledError, SolverError, SolveResult, SparseLUFactorization,
+                              StreamingLeastSquares, UpdatableLUFactorization)
 from .file_loader import LoadFiles
-__all__ = ["MainWindow", "EquationSolver","LoadFiles"]
+from .history_store import HistoryRecord, HistoryStore
+from .live_solver import LiveSolver
+from .parallel import ParallelSolver
+from .sparse_matrix import CSRMatrix, connected_components, minimum_degree, reverse_cuthill_mckee
+from .view_cache import ViewCache
+__all__ = ["MainWindow", "EquationSolver", "BandMatrix", "SolveResult", "IterativeSolution",
+           "MixedPrecisionSolution", "LUFactorization", "CholeskyFactorization", "LDLTFactorization",
+           "SparseLUFactorization", "UpdatableLUFactorization", "OutOfCoreLUFactorization", "StreamingLeastSquares",
+           "SolverError", "NonSquareMatrixError", "DimensionMismatchError", "SingularMatrixError",
+           "NotPositiveDefiniteError", "NotSymmetricMatrixError", "NotConvergedError", "SolveCancelledError",
+           "ParallelSolver", "LiveSolver", "LoadFiles", "HistoryStore", "HistoryRecord", "CSRMatrix",
+           "connected_components", "minimum_degree", "reverse_cuthill_mckee", "ViewCache"]
+
+
+def __getattr__(name):
+    # Интерфейс на flet загружается только по требованию, чтобы решатель можно
+    # было импортировать в рабочих процессах без UI-библиотеки
+    if name == "MainWindow":
+        from .main_window import MainWindow
+        return MainWindow
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
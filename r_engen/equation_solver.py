@@ -1,77 +1,627 @@
-import flet as ft
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from r_engen.sparse_matrix import CSRMatrix, minimum_degree, reverse_cuthill_mckee
+
+
+class SolverError(Exception):
+    """
+    Базовый класс ошибок решателя.
+
+    Атрибуты:
+    - message_key: ключ сообщения в разделе 'messages' файла переводов.
+    """
+    message_key = 'error'
+
+
+class NonSquareMatrixError(SolverError):
+    """Вызывается, когда матрица коэффициентов не квадратная"""
+    message_key = 'non_square_matrix_gauss'
+
+
+class DimensionMismatchError(SolverError, ValueError):
+    """
+    Вызывается, когда размеры правой части (или добавляемых строк) не совпадают с размерностью системы.
+
+    Атрибуты:
+    - expected: ожидаемая длина.
+    - actual: полученная длина.
+    """
+    message_key = 'dimension_mismatch'
+
+    def __init__(self, expected, actual):
+        super().__init__(f"expected length {expected}, got {actual}")
+        self.expected = expected
+        self.actual = actual
+
+    def __reduce__(self):
+        return self.__class__, (self.expected, self.actual)
+
+
+class NotSymmetricMatrixError(SolverError):
+    """Вызывается, когда методу для симметричных матриц (Холецкого, LDL^T) передана несимметричная матрица"""
+    message_key = 'not_symmetric'
+
+
+class SingularMatrixError(SolverError):
+    """
+    Вызывается, когда матрица вырождена (ведущий элемент равен нулю).
+
+    Атрибуты:
+    - column: номер столбца, в котором не нашлось ненулевого ведущего элемента.
+    """
+    message_key = 'zero_division'
+
+    def __init__(self, column=None):
+        super().__init__(f"matrix is singular at column {column}" if column is not None else "matrix is singular")
+        self.column = column
+
+    def __reduce__(self):
+        # Исключение передается между процессами, поэтому восстанавливается по номеру столбца
+        return self.__class__, (self.column,)
+
+
+class NotPositiveDefiniteError(SolverError):
+    """
+    Вызывается, когда матрица для разложения Холецкого не положительно определена.
+
+    Атрибуты:
+    - column: номер столбца, на котором диагональный элемент стал неположительным.
+    """
+    message_key = 'not_positive_definite'
+
+    def __init__(self, column):
+        super().__init__(f"matrix is not positive definite at column {column}")
+        self.column = column
+
+    def __reduce__(self):
+        return self.__class__, (self.column,)
+
+
+class NotConvergedError(SolverError):
+    """
+    Вызывается, когда итерационный метод не достиг требуемой точности.
+
+    Атрибуты:
+    - result: IterativeSolution с последним приближением и историей невязок.
+    """
+    message_key = 'not_converged'
+
+    def __init__(self, result):
+        super().__init__(f"no convergence after {result.iterations} iterations")
+        self.result = result
+
+    def __reduce__(self):
+        return self.__class__, (self.result,)
+
+
+class SolveCancelledError(SolverError):
+    """Вызывается функцией progress, чтобы прервать решение, ставшее ненужным"""
+    message_key = 'solve_cancelled'
+
+
+# Ширина панели столбцов для блочного исключения: внутри панели строки
+# обновляются по одному столбцу, а остаток матрицы - одним умножением матриц
+BLOCK_SIZE = 64
+# Размер блока многопоточного разложения: блок 256 x 256 float64 (512 КБ) помещается в L2
+TILE_SIZE = 256
+# Разреженное исключение выполняется на Python и выгоднее плотного LU, только пока
+# ширина ленты матрицы после упорядочивания RCM не больше n / SPARSE_BANDWIDTH_RATIO
+SPARSE_BANDWIDTH_RATIO = 32
+
+
+def _eliminate(M, n, epsilon, block_size=BLOCK_SIZE, perm=None, executor=None, tile_size=TILE_SIZE,
+               progress=None):
+    """
+    Выполняет прямой ход метода Гаусса с выбором ведущего элемента по столбцу
+    на месте, в массиве M размера n x m (m >= n).
+
+    Множители исключения сохраняются под диагональю (как в LAPACK getrf),
+    столбцы правее n-го преобразуются вместе с матрицей.
+
+    Параметры:
+    - M: двумерный массив float64, изменяется на месте
+    - n: количество исключаемых столбцов
+    - epsilon: порог, ниже которого ведущий элемент считается нулевым
+    - block_size: ширина панели столбцов
+    - perm: массив перестановки строк, изменяемый вместе с M (необязательно)
+    - executor: пул потоков для обновления оставшейся подматрицы (необязательно);
+      панель всегда разлагается последовательно
+    - tile_size: размер блоков, на которые делится обновление при заданном executor
+    - progress: функция progress(column, n), вызываемая после каждой панели (необязательно);
+      чтобы прервать исключение, она может вызвать исключение, например SolveCancelledError
+
+    Возвращает:
+    - None при успехе или номер столбца, в котором не нашлось ненулевого ведущего элемента
+    """
+    for k0 in range(0, n, block_size):
+        k1 = min(k0 + block_size, n)
+        for i in range(k0, k1):
+            # Поиск максимального элемента в текущем столбце
+            max_row = i + int(np.argmax(np.abs(M[i:, i])))
+
+            # Обмен строк для улучшения численной устойчивости
+            if max_row != i:
+                M[[i, max_row]] = M[[max_row, i]]
+                if perm is not None:
+                    perm[[i, max_row]] = perm[[max_row, i]]
+
+            if abs(M[i, i]) < epsilon:
+                return i
+
+            # Исключение внутри панели одной операцией ранга 1
+            M[i + 1:, i] /= M[i, i]
+            M[i + 1:, i + 1:k1] -= np.outer(M[i + 1:, i], M[i, i + 1:k1])
+
+        if k1 < M.shape[1]:
+            if executor is None:
+                _solve_panel_rows(M, k0, k1, k1, M.shape[1])
+                # Обновление оставшейся подматрицы одним умножением матриц
+                _update_block(M, k0, k1, k1, M.shape[0], k1, M.shape[1])
+            else:
+                _update_tiled(M, k0, k1, tile_size, executor)
+        if progress is not None:
+            progress(k1, n)
+    return None
+
+
+def _solve_panel_rows(M, k0, k1, c0, c1):
+    """
+    Вычисляет строки панели правее нее в столбцах c0..c1: U12 = L11^-1 * A12.
+
+    Параметры:
+    - M: двумерный массив, изменяется на месте
+    - k0, k1: границы панели
+    - c0, c1: границы столбцов блока
+    """
+    for i in range(k0 + 1, k1):
+        M[i, c0:c1] -= M[i, k0:i] @ M[k0:i, c0:c1]
+
+
+def _update_block(M, k0, k1, r0, r1, c0, c1):
+    """
+    Обновляет блок M[r0:r1, c0:c1] оставшейся подматрицы после разложения панели k0..k1.
+
+    Параметры:
+    - M: двумерный массив, изменяется на месте
+    - k0, k1: границы панели
+    - r0, r1: границы строк блока
+    - c0, c1: границы столбцов блока
+    """
+    M[r0:r1, c0:c1] -= M[r0:r1, k0:k1] @ M[k0:k1, c0:c1]
+
+
+def _update_tiled(M, k0, k1, tile_size, executor):
+    """
+    Обновляет оставшуюся подматрицу блоками на пуле потоков.
+
+    Сначала параллельно по блокам столбцов вычисляются строки U12, затем -
+    все блоки подматрицы. NumPy отпускает GIL на время умножения матриц,
+    поэтому блоки действительно обрабатываются одновременно.
+    """
+    n_rows, n_cols = M.shape
+    columns = [(c0, min(c0 + tile_size, n_cols)) for c0 in range(k1, n_cols, tile_size)]
+    for future in [executor.submit(_solve_panel_rows, M, k0, k1, c0, c1) for c0, c1 in columns]:
+        future.result()
+    rows = [(r0, min(r0 + tile_size, n_rows)) for r0 in range(k1, n_rows, tile_size)]
+    for future in [executor.submit(_update_block, M, k0, k1, r0, r1, c0, c1)
+                   for r0, r1 in rows for c0, c1 in columns]:
+        future.result()
+
+
+def _check_symmetric(A):
+    """
+    Проверяет за O(n^2), что квадратная матрица симметрична: методы для симметричных
+    матриц читают только нижний треугольник и для несимметричной матрицы дали бы
+    неверное решение без ошибки.
+
+    Исключения:
+    - NotSymmetricMatrixError: матрица не симметрична
+    """
+    if not np.allclose(A, A.T):
+        raise NotSymmetricMatrixError()
+
+
+def _dense_components(pattern):
+    """
+    Находит компоненты связности графа с плотной симметричной матрицей смежности.
+
+    Обход в ширину обрабатывает весь фронт одним вызовом numpy, поэтому каждая
+    строка pattern просматривается один раз и работа равна O(n^2) без построения
+    разреженной структуры; цикл на Python делает (число компонент) x (диаметр) шагов.
+
+    Параметры:
+    - pattern: булев массив n x n (True - ребро)
+
+    Возвращает:
+    - labels: массив (номер компоненты для каждой вершины)
+    - count: количество компонент
+    """
+    n = pattern.shape[0]
+    labels = np.full(n, -1, dtype=np.int64)
+    count = 0
+    for start in range(n):
+        if labels[start] >= 0:
+            continue
+        labels[start] = count
+        frontier = np.array([start])
+        while len(frontier):
+            frontier = np.flatnonzero(pattern[frontier].any(axis=0) & (labels < 0))
+            labels[frontier] = count
+        count += 1
+    return labels, count
+
+
+def _norm1(A, block_size=TILE_SIZE):
+    """
+    Вычисляет 1-норму матрицы (максимальную сумму модулей по столбцам).
+
+    Модули берутся по блокам столбцов, поэтому временная память - n x block_size,
+    а не копия |A| размера n x n.
+
+    Параметры:
+    - A: двумерный массив
+    - block_size: ширина блока столбцов
+
+    Возвращает:
+    - число
+    """
+    norm = 0.0
+    for c0 in range(0, A.shape[1], block_size):
+        norm = max(norm, float(np.abs(A[:, c0:c0 + block_size]).sum(axis=0).max()))
+    return norm
+
+
+def _permutation_sign(perm):
+    """
+    Вычисляет знак перестановки по ее циклам за O(n).
+
+    Параметры:
+    - perm: массив (перестановка)
+
+    Возвращает:
+    - 1 для четной перестановки, -1 для нечетной
+    """
+    visited = np.zeros(len(perm), dtype=bool)
+    transpositions = 0
+    for start in range(len(perm)):
+        length = 0
+        i = start
+        while not visited[i]:
+            visited[i] = True
+            i = perm[i]
+            length += 1
+        if length:
+            transpositions += length - 1
+    return -1 if transpositions % 2 else 1
+
+
+def _estimate_inverse_norm1(solve, solve_transposed, n, max_iterations=5):
+    """
+    Оценивает ||A^-1||_1 методом Хагера в варианте Хайэма (как LAPACK xLACON).
+
+    Каждый шаг - одно решение с A и одно с A^T по готовому разложению, то есть O(n^2).
+    В конце результат сравнивается с оценкой по знакочередующемуся вектору,
+    которая исправляет редкие случаи, когда градиентный подъем останавливается рано.
+
+    Параметры:
+    - solve: функция, решающая A x = b
+    - solve_transposed: функция, решающая A^T x = b
+    - n: размерность
+    - max_iterations: наибольшее количество шагов
+
+    Возвращает:
+    - число (оценка снизу для ||A^-1||_1)
+    """
+    if n == 0:
+        return 0.0
+    x = np.full(n, 1.0 / n)
+    estimate = 0.0
+    previous_index = None
+    for iteration in range(max_iterations):
+        y = solve(x)
+        new_estimate = np.abs(y).sum()
+        if iteration > 0 and new_estimate <= estimate:
+            break
+        estimate = new_estimate
+        z = solve_transposed(np.where(y >= 0, 1.0, -1.0))
+        index = int(np.argmax(np.abs(z)))
+        if iteration > 0 and (index == previous_index or np.abs(z[index]) <= z @ x):
+            break
+        previous_index = index
+        x = np.zeros(n)
+        x[index] = 1.0
+
+    alternating = np.linspace(1.0, 2.0, n) * np.where(np.arange(n) % 2, -1.0, 1.0)
+    return max(estimate, 2.0 * np.abs(solve(alternating)).sum() / (3.0 * n))
+
 
 class EquationSolver:
     """
     Класс для решения системы уравнений.
 
+    Решатель не зависит от интерфейса: ошибки сообщаются исключениями
+    SolverError, а их перевод и показ выполняет вызывающая сторона. Все
+    атрибуты необязательны и сохранены для совместимости со страницами.
+
     Атрибуты:
     - page: объект страницы, на которой отображается решение.
     - size: размерность системы уравнений.
     - current_language: текущий язык интерфейса.
     - entries: введенные пользователем значения.
     """
-    def __init__(self, page, size, current_language, entries):
+    def __init__(self, page=None, size=None, current_language=None, entries=None):
         self.page = page
         self.size = size
         self.current_language = current_language
         self.entries = entries
 
-    def the_triangular_matrix(self, A, B):
+    def solve(self, A, b, method='auto', progress=None):
+        """
+        Решает систему выбранным методом.
+
+        Параметры:
+        - A: плотная матрица, CSRMatrix или BandMatrix
+        - b: вектор (столбец свободных членов)
+        - method: 'auto', 'Gauss', 'lu', 'lu_tiled', 'mixed', 'cholesky', 'ldlt', 'sparse', 'banded',
+          'least_squares', 'cg', 'bicgstab' или 'gmres'
+        - progress: функция progress(done, total), вызываемая по ходу решения любым методом:
+          для прямых методов - сколько столбцов исключено, для итерационных - номер
+          итерации, для наименьших квадратов - сколько строк обработано; может прервать
+          решение исключением (например, SolveCancelledError)
+
+        Возвращает:
+        - SolveResult: решение, выбранный путь и затраченное время
+
+        Исключения:
+        - ValueError: неизвестный метод
+        """
+        if method == 'auto':
+            return self.solve_auto(A, b, progress)
+
+        start = time.perf_counter()
+        iterations = None
+        factorization = None
+        if method == 'Gauss':
+            factorization, y = self.gauss_factorize(A, b, progress)
+            x = self.backward_substitution(factorization.LU, y)
+        elif method == 'lu':
+            factorization = self.factorize(A, progress=progress)
+            x = factorization.solve(b)
+        elif method == 'lu_tiled':
+            factorization = self.factorize(A, tile_size=TILE_SIZE, num_threads=os.cpu_count(), progress=progress)
+            x = factorization.solve(b)
+        elif method == 'mixed':
+            result = self.solve_mixed_precision(A, b, progress=progress)
+            x, iterations = result.x, result.iterations
+        elif method == 'cholesky':
+            factorization = self.cholesky_decomposition(A, progress=progress)
+            x = factorization.solve(b)
+        elif method == 'ldlt':
+            x = self.solve_ldlt(A, b, progress)
+        elif method == 'sparse':
+            x = self.solve_sparse(A, b, progress)
+        elif method == 'banded':
+            x = self.solve_banded(A, b, progress)
+        elif method == 'least_squares':
+            x = self.solve_least_squares(A, b, progress)
+        elif method in ('cg', 'bicgstab', 'gmres'):
+            iterative_methods = {'cg': self.solve_cg, 'bicgstab': self.solve_bicgstab, 'gmres': self.solve_gmres}
+            result = iterative_methods[method](A, b, preconditioner='jacobi', progress=progress)
+            if not result.converged:
+                raise NotConvergedError(result)
+            x, iterations = result.x, result.iterations
+        else:
+            raise ValueError(f"unknown method: {method}")
+        return SolveResult(x, method, solve_time=time.perf_counter() - start, iterations=iterations,
+                           factorization=factorization)
+
+    def detect_structure(self, A):
+        """
+        Определяет структуру плотной матрицы за O(n^2) и выбирает самый дешевый метод решения.
+
+        Параметры:
+        - A: двумерный массив
+
+        Возвращает:
+        - route: 'diagonal', 'upper_triangular', 'lower_triangular', 'banded',
+          'block_diagonal', 'spd', 'sparse' или 'lu'
+        - labels: номера блоков для 'block_diagonal', иначе None
+        """
+        n = A.shape[0]
+        nonzero = A != 0
+        # Ширина ленты - по первому и последнему ненулевому элементу строк, без списка индексов
+        present = nonzero.any(axis=1)
+        first = np.argmax(nonzero, axis=1)
+        last = n - 1 - np.argmax(nonzero[:, ::-1], axis=1)
+        index = np.arange(n)
+        lower = int(np.max((index - first)[present], initial=0))
+        upper = int(np.max((last - index)[present], initial=0))
+
+        if lower == 0 and upper == 0:
+            return 'diagonal', None
+        if lower == 0:
+            return 'upper_triangular', None
+        if upper == 0:
+            return 'lower_triangular', None
+        # Ленточный алгоритм выгоден, пока ширина ленты мала по сравнению с n
+        if 4 * (lower + upper + 1) <= n:
+            return 'banded', None
+
+        diagonal = np.diagonal(A)
+        if np.all(diagonal > 0) and np.array_equal(A, A.T):
+            return 'spd', None
+
+        labels, count = _dense_components(nonzero | nonzero.T)
+        if count > 1:
+            return 'block_diagonal', labels
+
+        if n >= 64 and np.count_nonzero(nonzero) <= 0.05 * n * n:
+            # Заполнение при исключении оцениваем шириной ленты после упорядочивания RCM:
+            # у случайной разреженной матрицы она близка к n, и плотное LU намного быстрее
+            rows, columns = np.nonzero(nonzero)
+            pattern = CSRMatrix.from_coo(rows, columns, A[rows, columns], A.shape)
+            position = np.empty(n, dtype=np.int64)
+            position[reverse_cuthill_mckee(pattern)] = np.arange(n)
+            bandwidth = int(np.max(np.abs(position[rows] - position[columns])))
+            if SPARSE_BANDWIDTH_RATIO * bandwidth <= n:
+                return 'sparse', None
+        return 'lu', None
+
+    def solve_auto(self, A, b, progress=None):
+        """
+        Определяет структуру матрицы и решает систему самым дешевым подходящим методом.
+
+        Треугольные и диагональные матрицы решаются подстановкой, ленточные -
+        ленточным алгоритмом, блочно-диагональные - поблочно, симметричные с
+        положительной диагональю - разложением Холецкого (если матрица не
+        положительно определена - разложением LDL^T), остальные - разреженным
+        или плотным LU. Переопределенные системы решаются методом наименьших квадратов.
+
+        Параметры:
+        - A: плотная матрица, CSRMatrix или BandMatrix
+        - b: вектор (столбец свободных членов)
+        - progress: функция progress(done, total), вызываемая по ходу решения (см. solve, необязательно)
+
+        Возвращает:
+        - SolveResult: решение, выбранный путь, время определения структуры и время решения
+        """
+        start = time.perf_counter()
+        if isinstance(A, CSRMatrix):
+            route, labels = 'sparse', None
+        elif isinstance(A, BandMatrix):
+            route, labels = 'banded', None
+        else:
+            A = np.asarray(A, dtype=np.float64)
+            if A.ndim != 2 or A.shape[0] < A.shape[1]:
+                raise NonSquareMatrixError()
+            if A.shape[0] > A.shape[1]:
+                route, labels = 'least_squares', None
+            else:
+                route, labels = self.detect_structure(A)
+        detection_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        b = np.asarray(b, dtype=np.float64)
+        factorization = None
+        if route == 'diagonal':
+            diagonal = np.diagonal(A)
+            if np.any(diagonal == 0):
+                raise SingularMatrixError(int(np.argmax(diagonal == 0)))
+            x = b / diagonal
+            # Диагональная и верхнетреугольная матрицы - сами себе упакованное LU (L = E)
+            factorization = LUFactorization(self, A, np.arange(A.shape[0]), _norm1(A))
+        elif route == 'upper_triangular':
+            self._check_triangular(A)
+            x = self.backward_substitution(A, b)
+            factorization = LUFactorization(self, A, np.arange(A.shape[0]), _norm1(A))
+        elif route == 'lower_triangular':
+            # Нижнетреугольная система с обратным порядком строк и столбцов становится верхнетреугольной
+            self._check_triangular(A)
+            x = self.backward_substitution(A[::-1, ::-1], b[::-1])[::-1]
+            # A = (A D^-1) D, где D - диагональ A: множители L - столбцы A, деленные на диагональ
+            LU = A / np.diagonal(A)
+            np.fill_diagonal(LU, np.diagonal(A))
+            factorization = LUFactorization(self, LU, np.arange(A.shape[0]), _norm1(A))
+        elif route == 'block_diagonal':
+            x = np.empty_like(b)
+            for block in range(labels.max() + 1):
+                indices = np.flatnonzero(labels == block)
+                x[indices] = self.solve_auto(A[np.ix_(indices, indices)], b[indices], progress).x
+        elif route == 'spd':
+            try:
+                factorization = self.cholesky_decomposition(A, progress=progress)
+                x = factorization.solve(b)
+            except NotPositiveDefiniteError:
+                route = 'ldlt'
+                x = self.solve_ldlt(A, b, progress)
+        elif route == 'sparse':
+            x = self.solve_sparse(A, b, progress)
+        elif route == 'banded':
+            x = self.solve_banded(A, b, progress)
+        elif route == 'least_squares':
+            x = self.solve_least_squares(A, b, progress)
+        else:
+            factorization = self.factorize(A, progress=progress)
+            x = factorization.solve(b)
+        return SolveResult(x, route, detection_time, time.perf_counter() - start, factorization=factorization)
+
+    def _check_triangular(self, A):
+        """Проверяет, что на диагонали треугольной матрицы нет нулей."""
+        zeros = np.flatnonzero(np.abs(np.diagonal(A)) < 1e-10)
+        if len(zeros):
+            raise SingularMatrixError(int(zeros[0]))
+
+    def the_triangular_matrix(self, A, B, progress=None):
         """
         Приводит матрицу к треугольному виду.
 
+        Исключение выполняется над непрерывным массивом float64: выбор ведущего
+        элемента делается одним argmax по столбцу, а строки обновляются целыми
+        массивами (см. _eliminate).
+
         Параметры:
-        - A: двумерный список (матрица коэффициентов системы уравнений)
-        - B: список (столбец свободных членов)
-        - page: объект страницы для отображения сообщений об ошибках
+        - A: двумерный список или массив (матрица коэффициентов системы уравнений)
+        - B: список или массив (столбец свободных членов)
+        - progress: функция progress(column, n), вызываемая по ходу исключения (необязательно)
 
         Возвращает:
-        - A: список (Матрица перемех) или None, если матрица не квадратная
-        - B: список (решение системы уравнений)
+        - A: массив (верхнетреугольная матрица)
+        - B: массив (преобразованный столбец свободных членов)
+
+        Исключения:
+        - NonSquareMatrixError: матрица не квадратная
+        - SingularMatrixError: матрица вырождена
         """
-        n = len(A)
-        if len(A) != len(A[0]):
-            self.show_error_alert(self.page.translations['messages']['non_square_matrix_gauss'][self.current_language])
-            return None, None
+        # Вырожденность проверяется при выборе ведущих элементов (см. gauss_factorize)
+        factorization, B = self.gauss_factorize(A, B, progress)
+        return np.triu(factorization.LU), B
 
-        det = 1
-        epsilon = 1e-10
+    def gauss_factorize(self, A, B, progress=None):
+        """
+        Выполняет прямой ход метода Гаусса, сохраняя множители и перестановку строк.
 
-        for i in range(n):
-            max_elem = abs(A[i][i])
-            max_row = i
+        Результат прямого хода - это LU-разложение, поэтому по нему без
+        дополнительной работы вычисляются определитель, ранг и оценка числа
+        обусловленности, а также решаются системы с другими правыми частями.
 
-            # Поиск максимального элемента в текущем столбце
-            for k in range(i + 1, n):
-                if abs(A[k][i]) > max_elem:
-                    max_elem = abs(A[k][i])
-                    max_row = k
+        Параметры:
+        - A: двумерный список или массив (матрица коэффициентов системы уравнений)
+        - B: список или массив (столбец свободных членов)
+        - progress: функция progress(column, n), вызываемая по ходу исключения (необязательно)
 
-            # Обмен строк для улучшения численной устойчивости
-            A[i], A[max_row] = A[max_row], A[i]
-            B[i], B[max_row] = B[max_row], B[i]
+        Возвращает:
+        - LUFactorization: разложение матрицы A
+        - B: массив (преобразованный столбец свободных членов)
 
-            # Проверка на деление на ноль
-            if abs(A[i][i]) < epsilon:
-                self.show_error_alert(self.page.translations['messages']['zero_division'][self.current_language])
-                return None, None
+        Исключения:
+        - NonSquareMatrixError: матрица не квадратная
+        - SingularMatrixError: матрица вырождена
+        """
+        A = np.asarray(A, dtype=np.float64)
+        B = np.asarray(B, dtype=np.float64)
+        if A.ndim != 2 or A.shape[0] != A.shape[1]:
+            raise NonSquareMatrixError()
 
-            # Приведение матрицы к треугольному виду
-            for j in range(i + 1, n):
-                coef = A[j][i] / A[i][i]
-                for k in range(i, n):
-                    A[j][k] -= coef * A[i][k]
-                B[j] -= coef * B[i]
+        n = A.shape[0]
+        epsilon = 1e-10
 
-            # Расчет определителя
-            det *= A[i][i]  # знак не важен
+        # Расширенная матрица [A | B]: столбец свободных членов преобразуется
+        # вместе с матрицей, поэтому обмены строк выполняются один раз
+        augmented = np.empty((n, n + 1), dtype=np.float64)
+        augmented[:, :n] = A
+        augmented[:, n] = B
+        perm = np.arange(n)
 
-        A_test = [row for row in A if any(abs(el) > epsilon for el in row)]
-        if len(A) != len(A_test):
-            self.show_error_alert(self.page.translations['messages']['non_square_matrix_gauss'][self.current_language])
-            return None, None
+        failed_column = _eliminate(augmented, n, epsilon, perm=perm, progress=progress)
+        # Проверка на деление на ноль
+        if failed_column is not None:
+            raise SingularMatrixError(failed_column)
 
-        return A, B
+        return LUFactorization(self, augmented[:, :n], perm, _norm1(A)), augmented[:, n].copy()
 
     def solve_lu(self, A, b):
         """
@@ -82,94 +632,1915 @@ class EquationSolver:
         - b: список (столбец свободных членов)
 
         Возвращает:
-        - x: список (решение системы уравнений)
+        - x: массив (решение системы уравнений)
         """
-        L, U = self.lu_decomposition(A)
-        y = self.forward_substitution(L, b)
-        x = self.backward_substitution(U, y)
-        return x
+        return self.factorize(A).solve(b)
 
-    def lu_decomposition(self, A):
+    def factorize(self, A, dtype=np.float64, tile_size=None, num_threads=None, progress=None):
         """
-        Выполняет LU-разложение матрицы A.
+        Вычисляет LU-разложение один раз для последующего решения с разными правыми частями.
 
         Параметры:
-        - A: двумерный список (исходная матрица)
+        - A: двумерный список или массив (матрица коэффициентов системы уравнений)
+        - dtype: тип чисел, в котором выполняется и хранится разложение
+        - tile_size, num_threads, progress: см. lu_decomposition
 
         Возвращает:
-        - L: двумерный список (нижнетреугольная матрица L)
-        - U: двумерный список (верхнетреугольная матрица U)
+        - LUFactorization: объект разложения
         """
-        n = len(A)
-        L = [[0.0] * n for _ in range(n)]
-        U = [[0.0] * n for _ in range(n)]
+        if not isinstance(A, np.ndarray):
+            A = np.asarray(A, dtype=np.float64)
+        LU, perm = self.lu_decomposition(A, dtype, tile_size=tile_size, num_threads=num_threads, progress=progress)
+        return LUFactorization(self, LU, perm, _norm1(A))
 
-        for i in range(n):
-            L[i][i] = 1.0
+    def factorize_out_of_core(self, A, path, memory_limit=2 ** 30):
+        """
+        Выполняет LU-разложение матрицы, не помещающейся в оперативную память.
 
-        for k in range(n):
-            U[k][k] = A[k][k]
-            for j in range(k + 1, n):
-                L[j][k] = A[j][k] / U[k][k]
-                U[k][j] = A[k][j]
-            for i in range(k + 1, n):
-                for j in range(k + 1, n):
-                    A[i][j] -= L[i][k] * U[k][j]
+        Матрица копируется в файл path (numpy.memmap, хранение по столбцам) и
+        разлагается в нем на месте по панелям столбцов: в памяти одновременно
+        находятся только текущая панель и один блок столбцов оставшейся части,
+        ширина панели подбирается так, чтобы уложиться в memory_limit байт.
+        Перестановки строк каждой панели применяются только к столбцам правее
+        нее (как в LINPACK), поэтому уже записанные множители L не переписываются,
+        а перестановки повторяются при решении. Множители и перестановки остаются
+        на диске, и разложение можно открыть повторно (OutOfCoreLUFactorization.open).
+
+        Параметры:
+        - A: двумерный массив, numpy.memmap или путь к файлу .npy (квадратная матрица)
+        - path: str, путь к файлу для множителей L и U
+        - memory_limit: приблизительный объем оперативной памяти для разложения, в байтах
+
+        Возвращает:
+        - OutOfCoreLUFactorization: объект разложения
+
+        Исключения:
+        - NonSquareMatrixError: матрица не квадратная
+        - SingularMatrixError: матрица вырождена
+        """
+        if isinstance(A, str):
+            A = np.load(A, mmap_mode='r')
+        elif not isinstance(A, np.ndarray):
+            A = np.asarray(A, dtype=np.float64)
+        if A.ndim != 2 or A.shape[0] != A.shape[1]:
+            raise NonSquareMatrixError()
+
+        n = A.shape[0]
+        # Панель, блок оставшейся части и временный результат умножения - по n x width чисел
+        width = int(max(1, min(n, memory_limit // (3 * 8 * max(n, 1)))))
+        LU = np.lib.format.open_memmap(path, mode='w+', dtype=np.float64, shape=(n, n), fortran_order=True)
+        for c0 in range(0, n, width):
+            LU[:, c0:c0 + width] = A[:, c0:c0 + width]
+
+        perms = []
+        for k0 in range(0, n, width):
+            k1 = min(k0 + width, n)
+            panel = np.array(LU[k0:, k0:k1])
+            perm = np.arange(n - k0)
+            failed_column = _eliminate(panel, k1 - k0, 1e-10, perm=perm)
+            if failed_column is not None:
+                raise SingularMatrixError(k0 + failed_column)
+            LU[k0:, k0:k1] = panel
+            perms.append(perm)
+
+            # Перестановка строк, U12 = L11^-1 * A12 и обновление A22 -= L21 * U12 по блокам столбцов
+            for c0 in range(k1, n, width):
+                c1 = min(c0 + width, n)
+                block = np.array(LU[k0:, c0:c1])[perm]
+                block[:k1 - k0] = self.forward_substitution(panel[:k1 - k0], block[:k1 - k0])
+                block[k1 - k0:] -= panel[k1 - k0:] @ block[:k1 - k0]
+                LU[k0:, c0:c1] = block
+        LU.flush()
+
+        factorization = OutOfCoreLUFactorization(self, path, LU, width, perms)
+        factorization.save()
+        return factorization
+
+    def factorize_updatable(self, A, max_rank=32, tol=1e-10, progress=None):
+        """
+        Вычисляет LU-разложение, к которому можно применять изменения матрицы малого ранга.
+
+        Параметры:
+        - A: двумерный список или массив
+        - max_rank: наибольший накопленный ранг изменений до повторного разложения
+        - tol: допустимая относительная невязка решения после изменений
+        - progress: функция progress(column, n), вызываемая по ходу разложения (необязательно)
+
+        Возвращает:
+        - UpdatableLUFactorization: объект разложения
+        """
+        return UpdatableLUFactorization(self, A, max_rank, tol, progress)
+
+    def lu_decomposition(self, A, dtype=np.float64, tile_size=None, num_threads=None, progress=None):
+        """
+        Выполняет LU-разложение матрицы A с выбором ведущего элемента по столбцу (PA = LU).
+
+        L и U хранятся упакованными в одном массиве, как в LAPACK getrf:
+        под диагональю - множители L (единичная диагональ L не хранится),
+        на диагонали и выше - U. Исходная матрица A не изменяется.
+
+        Параметры:
+        - A: двумерный список или массив (исходная матрица)
+        - dtype: тип чисел разложения (float32 вдвое уменьшает память и трафик)
+        - tile_size: размер блока обновления оставшейся подматрицы (по умолчанию TILE_SIZE)
+        - num_threads: количество потоков; при значении больше 1 оставшаяся подматрица
+          обновляется блоками tile_size x tile_size параллельно. Ширина панели и порядок
+          вычислений внутри блоков не меняются, поэтому выбор ведущих элементов тот же,
+          что и в однопоточном разложении
+        - progress: функция progress(column, n), вызываемая после каждой панели (необязательно)
+
+        Возвращает:
+        - LU: двумерный массив (упакованные множители L и U)
+        - perm: массив (перестановка строк: строка i матрицы PA - это строка perm[i] матрицы A)
+
+        Исключения:
+        - NonSquareMatrixError: матрица не квадратная
+        - SingularMatrixError: матрица вырождена
+        """
+        LU = np.array(A, dtype=dtype)
+        if LU.ndim != 2 or LU.shape[0] != LU.shape[1]:
+            raise NonSquareMatrixError()
+
+        n = LU.shape[0]
+        perm = np.arange(n)
+        if num_threads and num_threads > 1 and n > BLOCK_SIZE:
+            with ThreadPoolExecutor(max_workers=num_threads) as executor:
+                failed_column = _eliminate(LU, n, 1e-10, perm=perm, executor=executor,
+                                           tile_size=tile_size or TILE_SIZE, progress=progress)
+        else:
+            failed_column = _eliminate(LU, n, 1e-10, perm=perm, progress=progress)
+        if failed_column is not None:
+            raise SingularMatrixError(failed_column)
+
+        return LU, perm
+
+    def solve_mixed_precision(self, A, b, tol=None, max_refinements=10, progress=None):
+        """
+        Решает систему LU-разложением в float32 с итерационным уточнением в float64.
+
+        Разложение (O(n^3)) выполняется в одинарной точности и используется на
+        всех шагах уточнения: невязка r = b - Ax считается в double, поправка
+        находится по тому же разложению. Если уточнение перестает уменьшать
+        невязку, выполняется полное разложение в float64.
+
+        Параметры:
+        - A: двумерный список или массив
+        - b: вектор (столбец свободных членов)
+        - tol: допустимая нормированная невязка ||b - Ax|| / (||A|| ||x|| + ||b||)
+          (по умолчанию - машинная точность double, умноженная на sqrt(n))
+        - max_refinements: максимальное число шагов уточнения
+        - progress: функция progress(column, n), вызываемая по ходу разложений (необязательно)
+
+        Возвращает:
+        - MixedPrecisionSolution: решение, число шагов уточнения и история невязок
+          по разложению в float32, признак перехода на разложение в float64 и невязка
+          его решения; converged - достигнута ли точность tol итоговым решением
+          (после перехода на float64 она может быть и не достигнута)
+        """
+        A = np.asarray(A, dtype=np.float64)
+        b = np.asarray(b, dtype=np.float64)
+        n = A.shape[0]
+        if tol is None:
+            tol = np.finfo(np.float64).eps * np.sqrt(n)
+        A_norm = np.linalg.norm(A, np.inf)
+        b_norm = np.linalg.norm(b, np.inf)
+
+        def backward_error(x, r):
+            return float(np.linalg.norm(r, np.inf) / (A_norm * np.linalg.norm(x, np.inf) + b_norm or 1.0))
+
+        residuals = []
+        refinements = 0
+        try:
+            factorization = self.factorize(A, dtype=np.float32, progress=progress)
+        except SingularMatrixError:
+            # В одинарной точности матрица неотличима от вырожденной
+            factorization = None
+
+        if factorization is not None:
+            x = factorization.solve(b)
+            while True:
+                r = b - A @ x
+                residuals.append(backward_error(x, r))
+                if residuals[-1] <= tol:
+                    return MixedPrecisionSolution(x, refinements, residuals, True, factorization)
+                # Уточнение застопорилось: невязка уменьшилась меньше чем вдвое
+                if refinements == max_refinements or (refinements > 0 and residuals[-1] > 0.5 * residuals[-2]):
+                    break
+                x += factorization.solve(r)
+                refinements += 1
+
+        factorization = self.factorize(A, progress=progress)
+        x = factorization.solve(b)
+        fallback_residual = backward_error(x, b - A @ x)
+        return MixedPrecisionSolution(x, refinements, residuals, fallback_residual <= tol, factorization,
+                                      fallback_residual)
+
+    def solve_least_squares(self, A, b, progress=None):
+        """
+        Решает переопределенную систему (строк больше, чем неизвестных) методом
+        наименьших квадратов через QR-разложение (см. StreamingLeastSquares).
+
+        Параметры:
+        - A: двумерный список или массив m x n, m >= n
+        - b: вектор длины m
+        - progress: функция progress(rows, m), вызываемая после каждой порции строк (необязательно)
+
+        Возвращает:
+        - x: массив длины n (минимизирует ||A x - b||)
+        """
+        return StreamingLeastSquares(np.shape(A)[1], self).add_rows(A, b, progress).solution()
+
+    def solve_cholesky(self, A, b):
+        """
+        Решает систему с симметричной положительно определенной матрицей разложением Холецкого.
+
+        Параметры:
+        - A: двумерный список или массив (симметричная матрица)
+        - b: вектор или матрица n x k (столбцы свободных членов)
+
+        Возвращает:
+        - x: массив (решение системы уравнений)
+        """
+        return self.cholesky_decomposition(A).solve(b)
+
+    def cholesky_decomposition(self, A, block_size=BLOCK_SIZE, progress=None):
+        """
+        Выполняет разложение Холецкого A = L L^T.
+
+        Читается только нижний треугольник A, и хранится только нижний
+        треугольник L - построчными блоками: блок строк J содержит столбцы
+        0..(J + 1) * block_size, поэтому память и число операций примерно
+        вдвое меньше, чем у LU-разложения. Основная работа выполняется
+        умножением блоков матриц.
+
+        Параметры:
+        - A: двумерный список или массив
+        - block_size: высота блока строк
+        - progress: функция progress(column, n), вызываемая после каждого блока (необязательно)
+
+        Возвращает:
+        - CholeskyFactorization: объект разложения
+
+        Исключения:
+        - NonSquareMatrixError: матрица не квадратная
+        - NotSymmetricMatrixError: матрица не симметрична
+        - NotPositiveDefiniteError: матрица не положительно определена
+        """
+        A = np.asarray(A, dtype=np.float64)
+        if A.ndim != 2 or A.shape[0] != A.shape[1]:
+            raise NonSquareMatrixError()
+        _check_symmetric(A)
+
+        n = A.shape[0]
+        blocks = []
+        for J0 in range(0, n, block_size):
+            J1 = min(J0 + block_size, n)
+            panel = np.array(A[J0:J1, :J1])
+
+            # Внедиагональные блоки: L[J, K] = (A[J, K] - L[J, :K] L[K, :K]^T) L[K, K]^-T
+            for K, block in enumerate(blocks):
+                K0 = K * block_size
+                K1 = K0 + block.shape[0]
+                panel[:, K0:K1] -= panel[:, :K0] @ block[:, :K0].T
+                for c in range(K0, K1):
+                    panel[:, c] -= panel[:, K0:c] @ block[c - K0, K0:c]
+                    panel[:, c] /= block[c - K0, c]
+
+            # Диагональный блок
+            panel[:, J0:J1] = np.tril(panel[:, J0:J1]) - np.tril(panel[:, :J0] @ panel[:, :J0].T)
+            for c in range(J0, J1):
+                i = c - J0
+                pivot = panel[i, c] - panel[i, J0:c] @ panel[i, J0:c]
+                if pivot <= 0.0:
+                    raise NotPositiveDefiniteError(c)
+                panel[i, c] = np.sqrt(pivot)
+                panel[i + 1:, c] = (panel[i + 1:, c] - panel[i + 1:, J0:c] @ panel[i, J0:c]) / panel[i, c]
+            blocks.append(panel)
+            if progress is not None:
+                progress(J1, n)
+
+        # 1-норма симметричной матрицы по нижнему треугольнику: суммы по столбцам и по строкам без диагонали
+        lower = np.abs(np.tril(A))
+        norm1 = (lower.sum(axis=0) + lower.sum(axis=1) - np.diagonal(lower)).max() if n else 0.0
+        return CholeskyFactorization(self, blocks, block_size, norm1)
 
-        return L, U
+    def solve_ldlt(self, A, b, progress=None):
+        """
+        Решает систему с симметричной (в том числе знаконеопределенной) матрицей разложением LDL^T.
+
+        Параметры:
+        - A: двумерный список или массив (симметричная матрица)
+        - b: вектор или матрица n x k (столбцы свободных членов)
+        - progress: функция progress(column, n), вызываемая после каждой панели (необязательно)
+
+        Возвращает:
+        - x: массив (решение системы уравнений)
+        """
+        return self.ldlt_decomposition(A, progress=progress).solve(b)
+
+    def ldlt_decomposition(self, A, block_size=BLOCK_SIZE, progress=None):
+        """
+        Выполняет разложение P A P^T = L D L^T с симметричным выбором ведущего
+        элемента по Банчу-Кауфману (блоки D размера 1x1 и 2x2).
+
+        Как и в LAPACK (sytrf), читается и изменяется только нижний треугольник
+        одной копии A: под диагональю сохраняются множители L, на диагонали и
+        поддиагонали блоков 2x2 - элементы D. Столбцы разлагаются панелями
+        ширины block_size: внутри панели обновления от ее столбцов применяются
+        к одному нужному столбцу, а нижний треугольник оставшейся подматрицы
+        обновляется после панели блочными умножениями матриц.
+
+        Параметры:
+        - A: двумерный список или массив (симметричная матрица)
+        - block_size: ширина панели столбцов
+        - progress: функция progress(column, n), вызываемая после каждой панели (необязательно)
+
+        Возвращает:
+        - LDLTFactorization: объект разложения
+
+        Исключения:
+        - NonSquareMatrixError: матрица не квадратная
+        - NotSymmetricMatrixError: матрица не симметрична
+        - SingularMatrixError: матрица вырождена
+        """
+        A = np.asarray(A, dtype=np.float64)
+        if A.ndim != 2 or A.shape[0] != A.shape[1]:
+            raise NonSquareMatrixError()
+        _check_symmetric(A)
+
+        n = A.shape[0]
+        W = np.tril(A)
+        perm = np.arange(n)
+        pivot_sizes = []
+        alpha = (1 + np.sqrt(17)) / 8
+        epsilon = 1e-10
+        # Столбцы L D текущей панели: обновление оставшейся подматрицы равно L (L D)^T
+        LD = np.empty((n, block_size + 1))
+
+        def swap(i, j):
+            # Симметричная перестановка строк и столбцов i < j, записанная в нижнем треугольнике
+            if i == j:
+                return
+            W[[i, j], :i] = W[[j, i], :i]
+            LD[[i, j]] = LD[[j, i]]
+            W[i, i], W[j, j] = W[j, j], W[i, i]
+            middle = W[i + 1:j, i].copy()
+            W[i + 1:j, i] = W[j, i + 1:j]
+            W[j, i + 1:j] = middle
+            W[j + 1:, [i, j]] = W[j + 1:, [j, i]]
+            perm[[i, j]] = perm[[j, i]]
+
+        def column(c, k):
+            # Строки k..n столбца c оставшейся подматрицы с учетом столбцов текущей панели
+            values = np.concatenate((W[c, k:c], W[c:, c]))
+            if m:
+                values -= W[k:, k0:k0 + m] @ LD[c, :m]
+            return values
+
+        k = 0
+        while k < n:
+            k0, m = k, 0
+            while k < n and m < block_size:
+                current = column(k, k)
+                diagonal = abs(current[0])
+                r = k + 1 + int(np.argmax(np.abs(current[1:]))) if k + 1 < n else k
+                largest = abs(current[r - k]) if r != k else 0.0
+                if max(diagonal, largest) < epsilon:
+                    raise SingularMatrixError(k)
+
+                size = 1
+                if diagonal < alpha * largest:
+                    row_r = np.abs(column(r, k))
+                    pivot_r = row_r[r - k]
+                    row_r[r - k] = 0.0
+                    sigma = row_r.max()
+                    if diagonal * sigma >= alpha * largest ** 2:
+                        pass
+                    elif pivot_r >= alpha * sigma:
+                        swap(k, r)
+                        current = column(k, k)
+                    else:
+                        swap(k + 1, r)
+                        size = 2
+
+                if size == 1:
+                    W[k, k] = current[0]
+                    W[k + 1:, k] = current[1:] / current[0]
+                    LD[k:, m] = current
+                else:
+                    C = np.empty((n - k, 2))
+                    C[:, 0] = column(k, k)
+                    C[1:, 1] = column(k + 1, k + 1)
+                    C[0, 1] = C[1, 0]
+                    D = C[:2]
+                    if abs(np.linalg.det(D)) < epsilon:
+                        raise SingularMatrixError(k)
+                    W[k, k], W[k + 1, k], W[k + 1, k + 1] = D[0, 0], D[1, 0], D[1, 1]
+                    W[k + 2:, k:k + 2] = C[2:] @ np.linalg.inv(D)
+                    LD[k:, m:m + 2] = C
+                pivot_sizes.append(size)
+                k += size
+                m += size
+
+            # Нижний треугольник оставшейся подматрицы по блокам строк
+            for r0 in range(k, n, block_size):
+                r1 = min(r0 + block_size, n)
+                W[r0:r1, k:r1] -= W[r0:r1, k0:k] @ LD[k:r1, :m].T
+            if progress is not None:
+                progress(k, n)
+
+        return LDLTFactorization(self, W, perm, pivot_sizes)
 
     def forward_substitution(self, L, b):
         """
         Выполняет прямую подстановку.
 
+        Используется только часть L под диагональю, диагональ считается
+        единичной, поэтому можно передавать упакованный результат lu_decomposition.
+
         Параметры:
-        - L: двумерный список (нижнетреугольная матрица L)
-        - b: список (столбец свободных членов)
+        - L: двумерный массив (нижнетреугольная матрица L или упакованное LU)
+        - b: вектор или матрица n x k (столбцы свободных членов)
 
         Возвращает:
-        - y: список (результат прямой подстановки)
+        - y: массив (результат прямой подстановки)
         """
-        n = len(L)
-        y = [0.0] * n
-        for i in range(n):
-            y[i] = b[i]
-            for j in range(i):
-                y[i] -= L[i][j] * y[j]
+        if not isinstance(L, np.ndarray):
+            L = np.asarray(L, dtype=np.float64)
+        y = np.array(b, dtype=np.float64)
+        for i in range(1, L.shape[0]):
+            y[i] -= L[i, :i] @ y[:i]
         return y
 
     def backward_substitution(self, U, y):
         """
         Выполняет обратную подстановку.
 
+        Используется только диагональ и часть U над ней, поэтому можно
+        передавать упакованный результат lu_decomposition.
+
         Параметры:
-        - U: двумерный список (верхнетреугольная матрица U)
-        - y: список (результат прямой подстановки)
+        - U: двумерный массив (верхнетреугольная матрица U или упакованное LU)
+        - y: вектор или матрица n x k (результат прямой подстановки)
 
         Возвращает:
-        - x: список (решение системы уравнений)
+        - x: массив (решение системы уравнений)
         """
-        n = len(U)
-        x = [0.0] * n
-        for i in range(n - 1, -1, -1):
-            x[i] = y[i]
-            for j in range(i + 1, n):
-                x[i] -= U[i][j] * x[j]
-            x[i] /= U[i][i]
+        if not isinstance(U, np.ndarray):
+            U = np.asarray(U, dtype=np.float64)
+        x = np.array(y, dtype=np.float64)
+        for i in range(U.shape[0] - 1, -1, -1):
+            x[i] -= U[i, i + 1:] @ x[i + 1:]
+            x[i] /= U[i, i]
         return x
 
-    def show_error_alert(self, message):
-        alert_dialog = ft.AlertDialog(
-            title=ft.Text(self.page.translations['messages']['error'][self.current_language]),
-            content=ft.Text(message),
-            actions=[ft.TextButton("OK", on_click=lambda e: self.close_dialog())],
-            actions_alignment=ft.MainAxisAlignment.END,
-        )
+    def solve_batch(self, A, b):
+        """
+        Решает сразу много независимых систем одинаковой размерности методом Гаусса.
 
-        self.page.dialog = alert_dialog
-        alert_dialog.open = True
-        self.page.update()
+        Исключение выполняется одновременно для всего пакета: каждый шаг по столбцу -
+        это несколько операций над массивами формы (k, n, n), поэтому накладные
+        расходы Python не зависят от количества систем. Вырожденные системы не
+        вызывают сообщения об ошибке, а отмечаются флагом.
 
-    def close_dialog(self):
-        self.page.dialog.open = False
-        self.page.update()
+        Параметры:
+        - A: массив формы (k, n, n) (матрицы коэффициентов)
+        - b: массив формы (k, n) (столбцы свободных членов)
 
+        Возвращает:
+        - X: массив формы (k, n) (решения; для вырожденных систем - nan)
+        - singular: массив bool длины k (True, если система вырождена)
+        """
+        A = np.asarray(A, dtype=np.float64)
+        b = np.asarray(b, dtype=np.float64)
+        k, n = b.shape
+        epsilon = 1e-10
+
+        # Расширенные матрицы [A | b] всего пакета
+        M = np.empty((k, n, n + 1), dtype=np.float64)
+        M[:, :, :n] = A
+        M[:, :, n] = b
+        singular = np.zeros(k, dtype=bool)
+        systems = np.arange(k)
+
+        for i in range(n):
+            # Выбор ведущего элемента по столбцу сразу для всех систем
+            max_rows = i + np.argmax(np.abs(M[:, i:, i]), axis=1)
+            current_rows = M[:, i, :].copy()
+            M[:, i, :] = M[systems, max_rows, :]
+            M[systems, max_rows, :] = current_rows
+
+            pivots = M[:, i, i]
+            zero_pivots = np.abs(pivots) < epsilon
+            singular |= zero_pivots
+            pivots = np.where(zero_pivots, 1.0, pivots)
+
+            coef = M[:, i + 1:, i] / pivots[:, None]
+            M[:, i + 1:, i:] -= coef[:, :, None] * M[:, None, i, i:]
+
+        diagonal = np.where(singular[:, None], 1.0, np.diagonal(M[:, :, :n], axis1=1, axis2=2))
+        X = np.empty((k, n), dtype=np.float64)
+        for i in range(n - 1, -1, -1):
+            X[:, i] = (M[:, i, n] - np.einsum('kj,kj->k', M[:, i, i + 1:n], X[:, i + 1:])) / diagonal[:, i]
+        X[singular] = np.nan
+        return X, singular
+
+    def solve_sparse(self, A, b, progress=None):
+        """
+        Решает систему с разреженной матрицей методом разреженного LU-разложения.
+
+        Параметры:
+        - A: CSRMatrix или плотная матрица (будет сжата)
+        - b: вектор или матрица n x k (столбцы свободных членов)
+        - progress: функция progress(column, n), вызываемая по ходу исключения (необязательно)
+
+        Возвращает:
+        - x: массив (решение системы уравнений)
+        """
+        return self.factorize_sparse(A, progress=progress).solve(b)
+
+    def factorize_sparse(self, A, pivot_threshold=0.1, ordering='minimum_degree', dense_threshold=0.3,
+                         progress=None):
+        """
+        Выполняет разреженное LU-разложение.
+
+        Строки и столбцы сначала переставляются так, чтобы уменьшить заполнение:
+        по умолчанию упорядочиванием минимальной степени, ordering='rcm' - по RCM
+        (сужение ленты). Затем строки исключаются по столбцам; в качестве
+        ведущей берется самая короткая строка среди тех, чей элемент не меньше
+        pivot_threshold от максимального по модулю в столбце (пороговый выбор
+        ведущего элемента). Хранятся только ненулевые элементы множителей.
+
+        Последние исключаемые строки при таком порядке обычно почти плотные,
+        поэтому как только доля ненулевых элементов в оставшейся подматрице
+        достигает dense_threshold, она разлагается как плотная блочным
+        исключением (операциями над массивами NumPy).
+
+        Исключение разреженной части выполняется на Python, поэтому метод
+        рассчитан на системы до нескольких десятков тысяч неизвестных с
+        небольшим заполнением (например, двумерные сеточные задачи). Для
+        трехмерных задач заполнение растет быстрее, и лучше использовать
+        итерационные методы (solve_cg, solve_gmres).
+
+        Параметры:
+        - A: CSRMatrix или плотная матрица (будет сжата)
+        - pivot_threshold: порог выбора ведущего элемента (0 < pivot_threshold <= 1)
+        - ordering: упорядочивание строк и столбцов ('minimum_degree' или 'rcm')
+        - dense_threshold: доля ненулевых элементов, начиная с которой оставшаяся
+          подматрица разлагается как плотная
+        - progress: функция progress(column, n), вызываемая каждые BLOCK_SIZE столбцов (необязательно)
+
+        Возвращает:
+        - SparseLUFactorization: объект разложения
+
+        Исключения:
+        - NonSquareMatrixError: матрица не квадратная
+        - SingularMatrixError: матрица вырождена
+        - ValueError: неизвестное упорядочивание
+        """
+        if not isinstance(A, CSRMatrix):
+            A = CSRMatrix.from_dense(A)
+        if A.shape[0] != A.shape[1]:
+            raise NonSquareMatrixError()
+        if ordering == 'minimum_degree':
+            permutation = minimum_degree(A)
+        elif ordering == 'rcm':
+            permutation = reverse_cuthill_mckee(A)
+        else:
+            raise ValueError(f"unknown ordering: {ordering}")
+
+        n = A.shape[0]
+        epsilon = 1e-10
+        rows = A.permute(permutation, permutation).rows()
+
+        # Для каждого столбца - множество еще не исключенных строк с ненулевым элементом в нем
+        column_rows = [set() for _ in range(n)]
+        for row_index, row in enumerate(rows):
+            for column in row:
+                column_rows[column].add(row_index)
+        # Количество ненулевых элементов в еще не исключенных строках
+        active = A.nnz
+
+        pivot_rows = []
+        lower = []
+        upper = []
+        dense_rows = dense = None
+        for k in range(n):
+            if progress is not None and k % BLOCK_SIZE == 0:
+                progress(k, n)
+            remaining = n - k
+            if remaining >= BLOCK_SIZE and active >= dense_threshold * remaining * remaining:
+                dense_rows, dense = self._factorize_dense_rest(rows, k, epsilon, progress)
+                break
+
+            candidates = column_rows[k]
+            largest = max((abs(rows[r][k]) for r in candidates), default=0.0)
+            if largest < epsilon:
+                raise SingularMatrixError(k)
+
+            pivot = min((r for r in candidates if abs(rows[r][k]) >= pivot_threshold * largest),
+                        key=lambda r: (len(rows[r]), -abs(rows[r][k])))
+            pivot_row = rows[pivot]
+            rows[pivot] = None
+            active -= len(pivot_row)
+            for column in pivot_row:
+                column_rows[column].discard(pivot)
+
+            pivot_value = pivot_row.pop(k)
+            multipliers = []
+            for r in candidates:
+                row = rows[r]
+                multiplier = row.pop(k) / pivot_value
+                multipliers.append((r, multiplier))
+                active -= 1
+                for column, value in pivot_row.items():
+                    if column in row:
+                        row[column] -= multiplier * value
+                    else:
+                        row[column] = -multiplier * value
+                        column_rows[column].add(r)
+                        active += 1
+            column_rows[k] = None
+
+            pivot_rows.append(pivot)
+            lower.append((np.array([r for r, _ in multipliers], dtype=np.int64),
+                          np.array([m for _, m in multipliers], dtype=np.float64)))
+            upper.append((pivot_value,
+                          np.fromiter(pivot_row.keys(), dtype=np.int64, count=len(pivot_row)),
+                          np.fromiter(pivot_row.values(), dtype=np.float64, count=len(pivot_row))))
+
+        return SparseLUFactorization(permutation, np.array(pivot_rows, dtype=np.int64), lower, upper,
+                                     dense_rows, dense)
+
+    def _factorize_dense_rest(self, rows, k, epsilon, progress=None):
+        """
+        Разлагает оставшуюся подматрицу разреженного исключения как плотную.
+
+        Параметры:
+        - rows: строки в виде словарей {столбец: значение} (исключенные - None)
+        - k: номер первого неисключенного столбца
+        - epsilon: порог, ниже которого ведущий элемент считается нулевым
+        - progress: функция progress(column, n) для всей матрицы (необязательно)
+
+        Возвращает:
+        - (номера оставшихся строк, LUFactorization их подматрицы в столбцах k..n)
+
+        Исключения:
+        - SingularMatrixError: подматрица вырождена
+        """
+        remaining_rows = np.array([r for r, row in enumerate(rows) if row is not None], dtype=np.int64)
+        size = len(remaining_rows)
+        M = np.zeros((size, size), dtype=np.float64)
+        for i, r in enumerate(remaining_rows):
+            row = rows[r]
+            M[i, np.fromiter(row.keys(), dtype=np.int64, count=len(row)) - k] = \
+                np.fromiter(row.values(), dtype=np.float64, count=len(row))
+        perm = np.arange(size)
+        panel_progress = None
+        if progress is not None:
+            def panel_progress(column, n):
+                progress(k + column, k + n)
+        column = _eliminate(M, size, epsilon, perm=perm, progress=panel_progress)
+        if column is not None:
+            raise SingularMatrixError(k + column)
+        return remaining_rows, LUFactorization(self, M, perm)
+
+    def solve_banded(self, A, b, progress=None):
+        """
+        Решает систему с ленточной матрицей за O(n * w^2), где w - ширина ленты.
+
+        Для трехдиагональной матрицы используется метод прогонки (алгоритм Томаса);
+        если прогонка встречает нулевой ведущий элемент, система решается
+        ленточным LU-разложением с выбором ведущего элемента.
+
+        Параметры:
+        - A: BandMatrix или плотная матрица (будет сжата в ленточный формат)
+        - b: вектор (столбец свободных членов)
+        - progress: функция progress(row, n), вызываемая каждые BLOCK_SIZE строк прямого хода (необязательно)
+
+        Возвращает:
+        - x: массив (решение системы уравнений)
+        """
+        if not isinstance(A, BandMatrix):
+            A = BandMatrix.from_dense(A)
+        b = np.asarray(b, dtype=np.float64)
+        if A.lower == 1 and A.upper == 1:
+            x = self._thomas(A, b, progress)
+            if x is not None:
+                return x
+        return self._banded_lu_solve(A, b, progress)
+
+    def _thomas(self, A, b, progress=None):
+        """
+        Метод прогонки для трехдиагональной матрицы без перестановок строк.
+
+        Возвращает:
+        - x: массив или None, если встретился нулевой ведущий элемент
+        """
+        n = A.shape[0]
+        upper = A.data[0, 1:].tolist()
+        diagonal = A.data[1].tolist()
+        lower = A.data[2, :-1].tolist()
+        d = b.tolist()
+        epsilon = 1e-10
+
+        # Прямой ход: прогоночные коэффициенты
+        c = [0.0] * n
+        if abs(diagonal[0]) < epsilon:
+            return None
+        c_prev = upper[0] / diagonal[0] if n > 1 else 0.0
+        d_prev = d[0] / diagonal[0]
+        c[0] = c_prev
+        d[0] = d_prev
+        for i in range(1, n):
+            if progress is not None and i % BLOCK_SIZE == 0:
+                progress(i, n)
+            denominator = diagonal[i] - lower[i - 1] * c_prev
+            if abs(denominator) < epsilon:
+                return None
+            c_prev = upper[i] / denominator if i < n - 1 else 0.0
+            d_prev = (d[i] - lower[i - 1] * d_prev) / denominator
+            c[i] = c_prev
+            d[i] = d_prev
+
+        # Обратный ход
+        for i in range(n - 2, -1, -1):
+            d[i] -= c[i] * d[i + 1]
+        return np.array(d)
+
+    def _banded_lu_solve(self, A, b, progress=None):
+        """
+        Ленточное LU-разложение с выбором ведущего элемента по столбцу и решение системы.
+
+        Строка i хранится сжатой: W[i, c - i + kl] = A[i, c] для столбцов
+        c от i - kl до i + kl + ku (перестановки расширяют верхнюю ленту до kl + ku).
+
+        Возвращает:
+        - x: массив (решение системы уравнений)
+        """
+        n = A.shape[0]
+        kl, ku = A.lower, A.upper
+        width = 2 * kl + ku + 1
+        span = kl + ku + 1
+        epsilon = 1e-10
+
+        # Дополнительные нулевые строки снизу избавляют от проверок границ
+        W = np.zeros((n + kl, width), dtype=np.float64)
+        for offset in range(-kl, ku + 1):
+            rows = np.arange(max(0, -offset), min(n, n - offset))
+            W[rows, offset + kl] = A.data[ku - offset, rows + offset]
+
+        y = np.zeros(n + kl, dtype=np.float64)
+        y[:n] = b
+        shifts = np.arange(1, kl + 1)
+        # Для строки k + d столбцы k..k + span - 1 занимают позиции kl - d..kl - d + span - 1
+        below_columns = (kl - shifts)[:, None] + np.arange(span)
+        for k in range(n):
+            if progress is not None and k % BLOCK_SIZE == 0:
+                progress(k, n)
+            below_rows = k + shifts
+            candidates = np.concatenate(([W[k, kl]], W[below_rows[:n - 1 - k], kl - shifts[:n - 1 - k]]))
+            d = int(np.argmax(np.abs(candidates)))
+            if abs(candidates[d]) < epsilon:
+                raise SingularMatrixError(k)
+            if d:
+                pivot_row = W[k + d, kl - d:kl - d + span].copy()
+                W[k + d, kl - d:kl - d + span] = W[k, kl:kl + span]
+                W[k, kl:kl + span] = pivot_row
+                y[k], y[k + d] = y[k + d], y[k]
+            if kl:
+                multipliers = W[below_rows, kl - shifts] / W[k, kl]
+                W[below_rows[:, None], below_columns] -= multipliers[:, None] * W[k, kl:kl + span]
+                y[below_rows] -= multipliers * y[k]
+
+        x = np.zeros(n + span, dtype=np.float64)
+        for k in range(n - 1, -1, -1):
+            x[k] = (y[k] - W[k, kl + 1:kl + span] @ x[k + 1:k + span]) / W[k, kl]
+        return x[:n]
+
+    def solve_cg(self, A, b, tol=1e-10, max_iterations=None, preconditioner=None, progress=None):
+        """
+        Решает систему с симметричной положительно определенной матрицей методом
+        сопряженных градиентов.
+
+        Параметры:
+        - A: плотная матрица или CSRMatrix
+        - b: вектор (столбец свободных членов)
+        - tol: допустимая относительная невязка ||b - Ax|| / ||b||
+        - max_iterations: максимальное число итераций (по умолчанию 10 * n)
+        - preconditioner: None или 'jacobi' (диагональный предобусловливатель)
+        - progress: функция progress(iteration, max_iterations), вызываемая на каждой итерации (необязательно)
+
+        Возвращает:
+        - IterativeSolution: решение, число итераций и история невязок
+        """
+        A, b, x, inverse_diagonal, max_iterations, b_norm = self._prepare_iterative(A, b, max_iterations,
+                                                                                    preconditioner)
+        residuals = []
+        if b_norm == 0.0:
+            return IterativeSolution(x, 0, residuals, True)
+
+        r = b - A @ x
+        z = inverse_diagonal * r
+        p = z.copy()
+        rz = r @ z
+        for iteration in range(1, max_iterations + 1):
+            if progress is not None:
+                progress(iteration, max_iterations)
+            Ap = A @ p
+            alpha = rz / (p @ Ap)
+            x += alpha * p
+            r -= alpha * Ap
+            residuals.append(float(np.linalg.norm(r)) / b_norm)
+            if residuals[-1] < tol:
+                return IterativeSolution(x, iteration, residuals, True)
+            z = inverse_diagonal * r
+            rz_next = r @ z
+            p = z + (rz_next / rz) * p
+            rz = rz_next
+        return IterativeSolution(x, max_iterations, residuals, False)
+
+    def solve_bicgstab(self, A, b, tol=1e-10, max_iterations=None, preconditioner=None, progress=None):
+        """
+        Решает систему с произвольной невырожденной матрицей стабилизированным
+        методом бисопряженных градиентов (BiCGSTAB).
+
+        Параметры:
+        - A: плотная матрица или CSRMatrix
+        - b: вектор (столбец свободных членов)
+        - tol: допустимая относительная невязка ||b - Ax|| / ||b||
+        - max_iterations: максимальное число итераций (по умолчанию 10 * n)
+        - preconditioner: None или 'jacobi' (диагональный предобусловливатель)
+        - progress: функция progress(iteration, max_iterations), вызываемая на каждой итерации (необязательно)
+
+        Возвращает:
+        - IterativeSolution: решение, число итераций и история невязок
+        """
+        A, b, x, inverse_diagonal, max_iterations, b_norm = self._prepare_iterative(A, b, max_iterations,
+                                                                                    preconditioner)
+        residuals = []
+        if b_norm == 0.0:
+            return IterativeSolution(x, 0, residuals, True)
+
+        r = b - A @ x
+        r_hat = r.copy()
+        rho = alpha = omega = 1.0
+        v = np.zeros_like(b)
+        p = np.zeros_like(b)
+        for iteration in range(1, max_iterations + 1):
+            if progress is not None:
+                progress(iteration, max_iterations)
+            rho_next = r_hat @ r
+            if rho_next == 0.0 or omega == 0.0:
+                # Метод остановился: дальнейшие итерации не изменят решение
+                return IterativeSolution(x, iteration - 1, residuals, False)
+            p = r + (rho_next / rho) * (alpha / omega) * (p - omega * v)
+            rho = rho_next
+            p_hat = inverse_diagonal * p
+            v = A @ p_hat
+            alpha = rho / (r_hat @ v)
+            s = r - alpha * v
+            s_norm = float(np.linalg.norm(s)) / b_norm
+            if s_norm < tol:
+                x += alpha * p_hat
+                residuals.append(s_norm)
+                return IterativeSolution(x, iteration, residuals, True)
+            s_hat = inverse_diagonal * s
+            t = A @ s_hat
+            omega = (t @ s) / (t @ t)
+            x += alpha * p_hat + omega * s_hat
+            r = s - omega * t
+            residuals.append(float(np.linalg.norm(r)) / b_norm)
+            if residuals[-1] < tol:
+                return IterativeSolution(x, iteration, residuals, True)
+        return IterativeSolution(x, max_iterations, residuals, False)
+
+    def solve_gmres(self, A, b, tol=1e-10, max_iterations=None, preconditioner=None, restart=30,
+                    progress=None):
+        """
+        Решает систему с произвольной невырожденной матрицей методом GMRES с перезапусками.
+
+        Параметры:
+        - A: плотная матрица или CSRMatrix
+        - b: вектор (столбец свободных членов)
+        - tol: допустимая относительная невязка ||b - Ax|| / ||b||
+        - max_iterations: максимальное общее число итераций (по умолчанию 10 * n)
+        - preconditioner: None или 'jacobi' (диагональный предобусловливатель)
+        - restart: размерность подпространства Крылова между перезапусками
+        - progress: функция progress(iteration, max_iterations), вызываемая на каждой итерации (необязательно)
+
+        Возвращает:
+        - IterativeSolution: решение, число итераций и история невязок
+        """
+        A, b, x, inverse_diagonal, max_iterations, b_norm = self._prepare_iterative(A, b, max_iterations,
+                                                                                    preconditioner)
+        residuals = []
+        if b_norm == 0.0:
+            return IterativeSolution(x, 0, residuals, True)
+
+        n = len(b)
+        restart = min(restart, n)
+        iteration = 0
+        while iteration < max_iterations:
+            r = b - A @ x
+            beta = float(np.linalg.norm(r))
+            if beta / b_norm < tol:
+                return IterativeSolution(x, iteration, residuals, True)
+
+            V = np.zeros((restart + 1, n))
+            H = np.zeros((restart + 1, restart))
+            cs = np.zeros(restart)
+            sn = np.zeros(restart)
+            g = np.zeros(restart + 1)
+            V[0] = r / beta
+            g[0] = beta
+
+            for j in range(restart):
+                if progress is not None:
+                    progress(iteration + 1, max_iterations)
+                # Ортогонализация Арнольди (модифицированный Грам-Шмидт)
+                w = A @ (inverse_diagonal * V[j])
+                for i in range(j + 1):
+                    H[i, j] = w @ V[i]
+                    w -= H[i, j] * V[i]
+                H[j + 1, j] = np.linalg.norm(w)
+                # Нулевая норма означает, что подпространство инвариантно и решение точное
+                breakdown = H[j + 1, j] == 0.0
+                if not breakdown:
+                    V[j + 1] = w / H[j + 1, j]
+
+                # Вращения Гивенса приводят H к верхнетреугольному виду
+                for i in range(j):
+                    H[i, j], H[i + 1, j] = cs[i] * H[i, j] + sn[i] * H[i + 1, j], \
+                                           -sn[i] * H[i, j] + cs[i] * H[i + 1, j]
+                denominator = np.hypot(H[j, j], H[j + 1, j])
+                cs[j], sn[j] = H[j, j] / denominator, H[j + 1, j] / denominator
+                H[j, j] = denominator
+                H[j + 1, j] = 0.0
+                g[j], g[j + 1] = cs[j] * g[j], -sn[j] * g[j]
+
+                iteration += 1
+                residuals.append(abs(g[j + 1]) / b_norm)
+                if residuals[-1] < tol or iteration >= max_iterations or breakdown:
+                    break
+
+            y = self.backward_substitution(H[:j + 1, :j + 1], g[:j + 1])
+            x += inverse_diagonal * (V[:j + 1].T @ y)
+            if residuals[-1] < tol:
+                return IterativeSolution(x, iteration, residuals, True)
+        return IterativeSolution(x, iteration, residuals, False)
+
+    def _prepare_iterative(self, A, b, max_iterations, preconditioner):
+        """
+        Подготавливает общие данные итерационных методов.
+
+        Возвращает:
+        - A, b в виде массивов/CSRMatrix, нулевое начальное приближение, обратную
+          диагональ предобусловливателя, число итераций и норму b
+        """
+        if not isinstance(A, CSRMatrix):
+            A = np.asarray(A, dtype=np.float64)
+        b = np.asarray(b, dtype=np.float64)
+        n = len(b)
+        inverse_diagonal = np.ones(n)
+        if preconditioner == 'jacobi':
+            diagonal = A.diagonal()
+            inverse_diagonal = np.divide(1.0, diagonal, out=np.ones(n), where=diagonal != 0)
+        if max_iterations is None:
+            max_iterations = 10 * n
+        return A, b, np.zeros(n), inverse_diagonal, max_iterations, float(np.linalg.norm(b))
+
+
+class BandMatrix:
+    """
+    Ленточная матрица в компактном формате LAPACK (gb): хранятся только диагонали ленты.
+
+    Элемент A[i, j] при -lower <= j - i <= upper находится в data[upper + i - j, j],
+    поэтому память - O(n * (lower + upper + 1)).
+
+    Атрибуты:
+    - lower: количество поддиагоналей (kl).
+    - upper: количество наддиагоналей (ku).
+    - data: массив формы (lower + upper + 1, n).
+    - shape: размер матрицы (n, n).
+    """
+    def __init__(self, lower, upper, data):
+        self.lower = int(lower)
+        self.upper = int(upper)
+        self.data = np.asarray(data, dtype=np.float64)
+        n = self.data.shape[1]
+        self.shape = (n, n)
+
+    @classmethod
+    def from_diagonals(cls, lower, diagonal, upper):
+        """
+        Создает трехдиагональную матрицу из трех диагоналей.
+
+        Параметры:
+        - lower: поддиагональ (длина n - 1)
+        - diagonal: главная диагональ (длина n)
+        - upper: наддиагональ (длина n - 1)
+
+        Возвращает:
+        - BandMatrix
+        """
+        diagonal = np.asarray(diagonal, dtype=np.float64)
+        data = np.zeros((3, len(diagonal)), dtype=np.float64)
+        data[0, 1:] = upper
+        data[1] = diagonal
+        data[2, :-1] = lower
+        return cls(1, 1, data)
+
+    @classmethod
+    def from_dense(cls, A):
+        """
+        Сжимает плотную матрицу, определяя ширину ленты по ненулевым элементам.
+
+        Параметры:
+        - A: двумерный список или массив
+
+        Возвращает:
+        - BandMatrix
+        """
+        A = np.asarray(A, dtype=np.float64)
+        if A.ndim != 2 or A.shape[0] != A.shape[1]:
+            raise NonSquareMatrixError()
+        rows, columns = np.nonzero(A)
+        lower = int(np.max(rows - columns, initial=0))
+        upper = int(np.max(columns - rows, initial=0))
+        data = np.zeros((lower + upper + 1, A.shape[0]), dtype=np.float64)
+        for offset in range(-lower, upper + 1):
+            data[upper - offset, max(0, offset):A.shape[0] + min(0, offset)] = np.diagonal(A, offset)
+        return cls(lower, upper, data)
+
+    def to_dense(self):
+        """
+        Преобразует матрицу в плотный массив.
+
+        Возвращает:
+        - двумерный массив
+        """
+        n = self.shape[0]
+        A = np.zeros((n, n), dtype=np.float64)
+        for offset in range(-self.lower, self.upper + 1):
+            rows = np.arange(max(0, -offset), min(n, n - offset))
+            A[rows, rows + offset] = self.data[self.upper - offset, rows + offset]
+        return A
+
+    def diagonal(self):
+        """Возвращает главную диагональ матрицы."""
+        return self.data[self.upper].copy()
+
+    def __matmul__(self, x):
+        """
+        Умножает матрицу на вектор за O(n * (lower + upper + 1)).
+
+        Параметры:
+        - x: вектор
+
+        Возвращает:
+        - массив
+        """
+        x = np.asarray(x, dtype=np.float64)
+        n = self.shape[0]
+        result = np.zeros(n, dtype=np.float64)
+        for offset in range(-self.lower, self.upper + 1):
+            rows = np.arange(max(0, -offset), min(n, n - offset))
+            result[rows] += self.data[self.upper - offset, rows + offset] * x[rows + offset]
+        return result
+
+
+class LUFactorization:
+    """
+    Класс для многократного решения систем с одной и той же матрицей коэффициентов.
+
+    Разложение PA = LU вычисляется один раз (O(n^3)), каждое следующее решение
+    стоит O(n^2) на столбец правых частей.
+
+    Атрибуты:
+    - solver: объект EquationSolver, выполняющий подстановки.
+    - LU: упакованные множители L и U (см. EquationSolver.lu_decomposition).
+    - perm: перестановка строк.
+    - norm1: 1-норма исходной матрицы (нужна для оценки числа обусловленности).
+    - size: размерность системы уравнений.
+    """
+    def __init__(self, solver, LU, perm, norm1=None):
+        self.solver = solver
+        self.LU = LU
+        self.perm = perm
+        self.norm1 = norm1
+        self.size = LU.shape[0]
+
+    def solve(self, b):
+        """
+        Решает систему для одной или нескольких правых частей.
+
+        Параметры:
+        - b: вектор длины n или матрица n x k (столбцы правых частей)
+
+        Возвращает:
+        - x: массив той же формы, что и b (решение системы уравнений)
+
+        Исключения:
+        - DimensionMismatchError: длина b не равна размерности системы
+        """
+        b = np.asarray(b, dtype=np.float64)
+        if b.ndim not in (1, 2) or b.shape[0] != self.size:
+            raise DimensionMismatchError(self.size, b.shape[0] if b.ndim else 0)
+        y = self.solver.forward_substitution(self.LU, b[self.perm])
+        return self.solver.backward_substitution(self.LU, y)
+
+    def inverse(self):
+        """
+        Вычисляет обратную матрицу, решая систему для столбцов единичной матрицы.
+
+        Возвращает:
+        - двумерный массив (обратная матрица)
+        """
+        return self.solve(np.eye(self.size))
+
+    def solve_transposed(self, b):
+        """
+        Решает транспонированную систему A^T x = b по тому же разложению.
+
+        A^T = U^T L^T P. Матрица U^T нижнетреугольная, L^T - верхнетреугольная
+        с единичной диагональю; после обращения порядка строк и столбцов они
+        меняются местами, и подходят обычные подстановки по упакованному LU.
+
+        Параметры:
+        - b: вектор длины n или матрица n x k (столбцы правых частей)
+
+        Возвращает:
+        - x: массив той же формы, что и b
+        """
+        b = np.asarray(b, dtype=np.float64)
+        reversed_transpose = self.LU.T[::-1, ::-1]
+        w = self.solver.backward_substitution(reversed_transpose, b[::-1])
+        v = self.solver.forward_substitution(reversed_transpose, w)[::-1]
+        x = np.empty_like(v)
+        x[self.perm] = v
+        return x
+
+    def slogdet(self):
+        """
+        Вычисляет знак и натуральный логарифм модуля определителя без переполнения.
+
+        det(A) = sign(P) * prod(diag(U)).
+
+        Возвращает:
+        - sign: 1.0, -1.0 или 0.0
+        - logdet: логарифм модуля определителя (-inf для вырожденной матрицы)
+        """
+        diagonal = np.diagonal(self.LU).astype(np.float64)
+        sign = _permutation_sign(self.perm) * np.prod(np.sign(diagonal))
+        with np.errstate(divide='ignore'):
+            logdet = np.log(np.abs(diagonal)).sum()
+        return float(sign), float(logdet)
+
+    def det(self):
+        """
+        Вычисляет определитель матрицы (может переполниться, см. slogdet).
+
+        Возвращает:
+        - число
+        """
+        sign, logdet = self.slogdet()
+        return sign * np.exp(logdet)
+
+    def rank(self, tol=None):
+        """
+        Оценивает численный ранг по диагонали U.
+
+        Параметры:
+        - tol: порог для |u_ii|; по умолчанию n * eps * max|u_ii|
+
+        Возвращает:
+        - int
+        """
+        diagonal = np.abs(np.diagonal(self.LU))
+        if tol is None:
+            tol = self.size * np.finfo(self.LU.dtype).eps * diagonal.max(initial=0.0)
+        return int(np.count_nonzero(diagonal > tol))
+
+    def condition_estimate(self):
+        """
+        Оценивает число обусловленности ||A||_1 * ||A^-1||_1 за O(n^2)
+        методом Хагера-Хайэма, не вычисляя обратную матрицу.
+
+        Возвращает:
+        - число (оценка снизу, на практике обычно точная в пределах множителя 3)
+        """
+        return self.norm1 * _estimate_inverse_norm1(self.solve, self.solve_transposed, self.size)
+
+
+
+class UpdatableLUFactorization:
+    """
+    Класс для повторного решения системы после изменений матрицы малого ранга.
+
+    Хранит LU-разложение исходной матрицы A0 и накопленные изменения A = A0 + U V^T.
+    Решение с измененной матрицей находится по формуле Шермана-Моррисона-Вудбери:
+    A^-1 b = y - Z (I + V^T Z)^-1 V^T y, где y = A0^-1 b, Z = A0^-1 U,
+    то есть за O(n^2) на изменение вместо O(n^3) на новое разложение.
+
+    Когда суммарный ранг изменений превышает max_rank или невязка решения
+    становится больше tol, матрица разлагается заново.
+
+    Атрибуты:
+    - solver: объект EquationSolver.
+    - A: текущая матрица (с учетом всех изменений).
+    - factorization: LUFactorization исходной матрицы A0.
+    - U, V, Z: накопленные множители изменения и Z = A0^-1 U (n x k).
+    - max_rank: наибольший накопленный ранг до повторного разложения.
+    - tol: допустимая относительная невязка решения.
+    - refactorizations: количество выполненных повторных разложений.
+    - size: размерность системы уравнений.
+    """
+    def __init__(self, solver, A, max_rank=32, tol=1e-10, progress=None):
+        self.solver = solver
+        self.A = np.array(A, dtype=np.float64)
+        self.size = self.A.shape[0]
+        self.max_rank = max_rank
+        self.tol = tol
+        self.refactorizations = 0
+        self._factorize(progress)
+
+    def _factorize(self, progress=None):
+        """Разлагает текущую матрицу и сбрасывает накопленные изменения."""
+        self.factorization = self.solver.factorize(self.A, progress=progress)
+        self.U = np.zeros((self.size, 0))
+        self.V = np.zeros((self.size, 0))
+        self.Z = np.zeros((self.size, 0))
+        self._capacitance = None
+
+    def refactor(self, progress=None):
+        """
+        Выполняет новое LU-разложение текущей матрицы.
+
+        Параметры:
+        - progress: функция progress(column, n), вызываемая по ходу разложения (необязательно)
+        """
+        self._factorize(progress)
+        self.refactorizations += 1
+
+    def update(self, U, V, progress=None):
+        """
+        Применяет изменение ранга k: A = A + U V^T.
+
+        Параметры:
+        - U: массив n x k или вектор длины n
+        - V: массив n x k или вектор длины n
+        - progress: функция progress(column, n) для повторного разложения (необязательно)
+
+        Возвращает:
+        - self
+        """
+        U = np.asarray(U, dtype=np.float64).reshape(self.size, -1)
+        V = np.asarray(V, dtype=np.float64).reshape(self.size, -1)
+        self.A += U @ V.T
+        if self.U.shape[1] + U.shape[1] > self.max_rank:
+            self.refactor(progress)
+            return self
+        self.U = np.hstack([self.U, U])
+        self.V = np.hstack([self.V, V])
+        self.Z = np.hstack([self.Z, self.factorization.solve(U)])
+        self._capacitance = None
+        return self
+
+    def update_entry(self, i, j, value):
+        """
+        Заменяет один элемент матрицы (изменение ранга 1).
+
+        Параметры:
+        - i, j: номер строки и столбца
+        - value: новое значение
+
+        Возвращает:
+        - self
+        """
+        u = np.zeros(self.size)
+        u[i] = value - self.A[i, j]
+        v = np.zeros(self.size)
+        v[j] = 1.0
+        return self.update(u, v)
+
+    def update_row(self, i, values):
+        """
+        Заменяет строку матрицы (изменение ранга 1).
+
+        Параметры:
+        - i: номер строки
+        - values: новые значения строки
+
+        Возвращает:
+        - self
+        """
+        u = np.zeros(self.size)
+        u[i] = 1.0
+        return self.update(u, np.asarray(values, dtype=np.float64) - self.A[i])
+
+    def update_column(self, j, values):
+        """
+        Заменяет столбец матрицы (изменение ранга 1).
+
+        Параметры:
+        - j: номер столбца
+        - values: новые значения столбца
+
+        Возвращает:
+        - self
+        """
+        v = np.zeros(self.size)
+        v[j] = 1.0
+        return self.update(np.asarray(values, dtype=np.float64) - self.A[:, j], v)
+
+    def update_matrix(self, A, progress=None):
+        """
+        Переходит к новой матрице, применяя изменения только отличающихся строк
+        или только отличающихся столбцов - смотря чего меньше.
+
+        Если и тех, и других больше, чем позволяет max_rank, матрица разлагается заново.
+
+        Параметры:
+        - A: двумерный список или массив той же размерности
+        - progress: функция progress(column, n) для повторного разложения (необязательно)
+
+        Возвращает:
+        - self
+        """
+        A = np.asarray(A, dtype=np.float64)
+        difference = A != self.A
+        rows = np.flatnonzero(np.any(difference, axis=1))
+        columns = np.flatnonzero(np.any(difference, axis=0))
+        if self.U.shape[1] + min(len(rows), len(columns)) > self.max_rank:
+            self.A = np.array(A)
+            self.refactor(progress)
+        elif len(rows) <= len(columns):
+            if len(rows):
+                U = np.zeros((self.size, len(rows)))
+                U[rows, np.arange(len(rows))] = 1.0
+                self.update(U, (A[rows] - self.A[rows]).T, progress)
+        else:
+            V = np.zeros((self.size, len(columns)))
+            V[columns, np.arange(len(columns))] = 1.0
+            self.update(A[:, columns] - self.A[:, columns], V, progress)
+        return self
+
+    def solve(self, b, progress=None):
+        """
+        Решает систему с текущей матрицей для одной или нескольких правых частей.
+
+        Параметры:
+        - b: вектор длины n или матрица n x k
+        - progress: функция progress(column, n) для повторного разложения, если оно понадобится (необязательно)
+
+        Возвращает:
+        - x: массив той же формы, что и b
+
+        Исключения:
+        - SingularMatrixError: измененная матрица вырождена
+        """
+        b = np.asarray(b, dtype=np.float64)
+        x = self._solve_updated(b, progress)
+        residual = np.linalg.norm(self.A @ x - b, np.inf)
+        scale = np.linalg.norm(self.A, np.inf) * np.linalg.norm(x, np.inf) + np.linalg.norm(b, np.inf)
+        if self.U.shape[1] and not residual <= self.tol * (scale or 1.0):
+            # Накопленные изменения испортили точность: разлагаем текущую матрицу заново
+            self.refactor(progress)
+            x = self.factorization.solve(b)
+        return x
+
+    def _solve_updated(self, b, progress=None):
+        """Решение по формуле Шермана-Моррисона-Вудбери."""
+        y = self.factorization.solve(b)
+        if not self.U.shape[1]:
+            return y
+        if self._capacitance is None:
+            try:
+                self._capacitance = self.solver.factorize(np.eye(self.U.shape[1]) + self.V.T @ self.Z)
+            except SingularMatrixError:
+                # Матрица емкости вырождена вместе с A (или почти вырождена) - проверяем разложением
+                self.refactor(progress)
+                return self.factorization.solve(b)
+        return y - self.Z @ self._capacitance.solve(self.V.T @ y)
+
+
+class OutOfCoreLUFactorization:
+    """
+    Класс для решения систем по LU-разложению, хранящемуся на диске
+    (см. EquationSolver.factorize_out_of_core).
+
+    При решении множители читаются с диска по одной панели столбцов,
+    поэтому память - O(n * panel_width) для любого размера матрицы.
+
+    Атрибуты:
+    - solver: объект EquationSolver, выполняющий подстановки.
+    - path: путь к файлу с множителями L и U.
+    - LU: numpy.memmap n x n (хранение по столбцам).
+    - panel_width: ширина панели столбцов.
+    - perms: перестановки строк k0..n для каждой панели.
+    - size: размерность системы уравнений.
+    """
+    def __init__(self, solver, path, LU, panel_width, perms):
+        self.solver = solver
+        self.path = path
+        self.LU = LU
+        self.panel_width = panel_width
+        self.perms = perms
+        self.size = LU.shape[0]
+
+    def save(self):
+        """Сохраняет перестановки рядом с файлом множителей (path + '.pivots.npz')."""
+        np.savez(self.path + '.pivots.npz', panel_width=self.panel_width,
+                 perms=np.concatenate(self.perms) if self.perms else np.zeros(0, dtype=np.int64))
+
+    @classmethod
+    def open(cls, solver, path):
+        """
+        Открывает сохраненное разложение для новых решений без повторного разложения.
+
+        Параметры:
+        - solver: объект EquationSolver
+        - path: путь к файлу с множителями
+
+        Возвращает:
+        - OutOfCoreLUFactorization
+        """
+        LU = np.load(path, mmap_mode='r')
+        with np.load(path + '.pivots.npz') as pivots:
+            panel_width = int(pivots['panel_width'])
+            flat = pivots['perms']
+        perms = []
+        offset = 0
+        for k0 in range(0, LU.shape[0], panel_width):
+            perms.append(flat[offset:offset + LU.shape[0] - k0])
+            offset += LU.shape[0] - k0
+        return cls(solver, path, LU, panel_width, perms)
+
+    def solve(self, b):
+        """
+        Решает систему для одной или нескольких правых частей.
+
+        Параметры:
+        - b: вектор длины n или матрица n x k (столбцы правых частей)
+
+        Возвращает:
+        - x: массив той же формы, что и b (решение системы уравнений)
+        """
+        x = np.array(b, dtype=np.float64)
+        n = self.size
+        # Прямой ход: перестановка панели, затем L11 и L21 этой панели
+        for perm, k0 in zip(self.perms, range(0, n, self.panel_width)):
+            k1 = min(k0 + self.panel_width, n)
+            panel = np.asarray(self.LU[k0:, k0:k1])
+            x[k0:] = x[k0:][perm]
+            x[k0:k1] = self.solver.forward_substitution(panel[:k1 - k0], x[k0:k1])
+            x[k1:] -= panel[k1 - k0:] @ x[k0:k1]
+        # Обратный ход по панелям столбцов U справа налево
+        for k0 in reversed(range(0, n, self.panel_width)):
+            k1 = min(k0 + self.panel_width, n)
+            panel = np.asarray(self.LU[:k1, k0:k1])
+            x[k0:k1] = self.solver.backward_substitution(panel[k0:k1], x[k0:k1])
+            x[:k0] -= panel[:k0] @ x[k0:k1]
+        return x
+
+
+class CholeskyFactorization:
+    """
+    Класс для многократного решения систем по разложению Холецкого A = L L^T.
+
+    Атрибуты:
+    - solver: объект EquationSolver, выполняющий подстановки.
+    - blocks: блоки строк нижнего треугольника L (см. EquationSolver.cholesky_decomposition).
+    - block_size: высота блока строк.
+    - norm1: 1-норма исходной матрицы (нужна для оценки числа обусловленности).
+    - size: размерность системы уравнений.
+    """
+    def __init__(self, solver, blocks, block_size, norm1=None):
+        self.solver = solver
+        self.blocks = blocks
+        self.block_size = block_size
+        self.norm1 = norm1
+        self.size = blocks[-1].shape[1] if blocks else 0
+
+    def diagonal(self):
+        """
+        Возвращает диагональ множителя L.
+
+        Возвращает:
+        - массив
+        """
+        return np.concatenate([np.diagonal(block[:, J * self.block_size:])
+                               for J, block in enumerate(self.blocks)]) if self.blocks else np.zeros(0)
+
+    def slogdet(self):
+        """
+        Вычисляет знак и натуральный логарифм определителя: det(A) = prod(diag(L))^2 > 0.
+
+        Возвращает:
+        - sign: 1.0
+        - logdet: логарифм определителя
+        """
+        return 1.0, float(2.0 * np.log(self.diagonal()).sum())
+
+    def det(self):
+        """
+        Вычисляет определитель матрицы (может переполниться, см. slogdet).
+
+        Возвращает:
+        - число
+        """
+        return np.exp(self.slogdet()[1])
+
+    def rank(self, tol=None):
+        """
+        Оценивает численный ранг по диагонали L.
+
+        Параметры:
+        - tol: порог для l_ii^2; по умолчанию n * eps * max(l_ii^2)
+
+        Возвращает:
+        - int
+        """
+        pivots = self.diagonal() ** 2
+        if tol is None:
+            tol = self.size * np.finfo(np.float64).eps * pivots.max(initial=0.0)
+        return int(np.count_nonzero(pivots > tol))
+
+    def condition_estimate(self):
+        """
+        Оценивает число обусловленности ||A||_1 * ||A^-1||_1 за O(n^2)
+        методом Хагера-Хайэма (матрица симметрична, поэтому A^T = A).
+
+        Возвращает:
+        - число
+        """
+        return self.norm1 * _estimate_inverse_norm1(self.solve, self.solve, self.size)
+
+    def lower(self):
+        """
+        Собирает множитель L в плотную нижнетреугольную матрицу.
+
+        Возвращает:
+        - двумерный массив
+        """
+        L = np.zeros((self.size, self.size))
+        for J, block in enumerate(self.blocks):
+            J0 = J * self.block_size
+            L[J0:J0 + block.shape[0], :block.shape[1]] = np.tril(block, J0)
+        return L
+
+    def solve(self, b):
+        """
+        Решает систему для одной или нескольких правых частей.
+
+        Параметры:
+        - b: вектор длины n или матрица n x k (столбцы правых частей)
+
+        Возвращает:
+        - x: массив той же формы, что и b (решение системы уравнений)
+        """
+        y = np.array(b, dtype=np.float64)
+        # Прямой ход: L y = b
+        for J, block in enumerate(self.blocks):
+            J0 = J * self.block_size
+            J1 = J0 + block.shape[0]
+            y[J0:J1] -= block[:, :J0] @ y[:J0]
+            for i in range(J0, J1):
+                y[i] -= block[i - J0, J0:i] @ y[J0:i]
+                y[i] /= block[i - J0, i]
+        # Обратный ход: L^T x = y
+        for J in range(len(self.blocks) - 1, -1, -1):
+            block = self.blocks[J]
+            J0 = J * self.block_size
+            J1 = J0 + block.shape[0]
+            y[J0:J1] = self.solver.backward_substitution(block[:, J0:J1].T, y[J0:J1])
+            y[:J0] -= block[:, :J0].T @ y[J0:J1]
+        return y
+
+
+class LDLTFactorization:
+    """
+    Класс для многократного решения систем по разложению P A P^T = L D L^T.
+
+    Атрибуты:
+    - solver: объект EquationSolver, выполнивший разложение.
+    - factors: упакованное разложение (см. EquationSolver.ldlt_decomposition): под
+      диагональю - множители L (единичная диагональ не хранится), на диагонали и
+      поддиагонали блоков 2x2 - элементы D; часть над диагональю не используется.
+    - perm: симметричная перестановка строк и столбцов.
+    - pivot_sizes: размеры блоков D по порядку.
+    - size: размерность системы уравнений.
+    """
+    def __init__(self, solver, factors, perm, pivot_sizes):
+        self.solver = solver
+        self.factors = factors
+        self.perm = perm
+        self.pivot_sizes = pivot_sizes
+        self.size = factors.shape[0]
+
+    def solve(self, b):
+        """
+        Решает систему для одной или нескольких правых частей.
+
+        Подстановки выполняются по столбцам упакованных множителей: L y = P b,
+        затем D z = y по блокам, затем L^T w = z.
+
+        Параметры:
+        - b: вектор длины n или матрица n x k (столбцы правых частей)
+
+        Возвращает:
+        - x: массив той же формы, что и b (решение системы уравнений)
+
+        Исключения:
+        - DimensionMismatchError: длина b не равна размерности системы
+        """
+        b = np.asarray(b, dtype=np.float64)
+        if b.ndim not in (1, 2) or b.shape[0] != self.size:
+            raise DimensionMismatchError(self.size, b.shape[0] if b.ndim else 0)
+        F = self.factors
+        y = b[self.perm]
+        starts = np.cumsum([0] + self.pivot_sizes[:-1])
+
+        for k, size in zip(starts, self.pivot_sizes):
+            if size == 1:
+                y[k + 1:] -= np.multiply.outer(F[k + 1:, k], y[k])
+            else:
+                y[k + 2:] -= F[k + 2:, k:k + 2] @ y[k:k + 2]
+
+        for k, size in zip(starts, self.pivot_sizes):
+            if size == 1:
+                y[k] /= F[k, k]
+            else:
+                D = np.array([[F[k, k], F[k + 1, k]], [F[k + 1, k], F[k + 1, k + 1]]])
+                y[k:k + 2] = np.linalg.solve(D, y[k:k + 2])
+
+        for k, size in zip(starts[::-1], self.pivot_sizes[::-1]):
+            if size == 1:
+                y[k] -= F[k + 1:, k] @ y[k + 1:]
+            else:
+                y[k:k + 2] -= F[k + 2:, k:k + 2].T @ y[k + 2:]
+
+        x = np.empty_like(y)
+        x[self.perm] = y
+        return x
+
+
+class SolveResult:
+    """
+    Класс с результатом решения системы.
+
+    Атрибуты:
+    - x: массив (решение системы уравнений).
+    - method: метод, которым фактически решена система (для 'auto' - выбранный путь).
+    - detection_time: время определения структуры матрицы в секундах.
+    - solve_time: время решения в секундах.
+    - iterations: количество итераций для итерационных методов, иначе None.
+    - factorization: LUFactorization или CholeskyFactorization, если система решена
+      методом Гаусса, плотным LU-разложением, разложением Холецкого или подстановкой
+      (диагональная и треугольные матрицы), иначе None. По нему без повторного
+      разложения вычисляются определитель, ранг и оценка числа обусловленности.
+    """
+    def __init__(self, x, method, detection_time=0.0, solve_time=0.0, iterations=None, factorization=None):
+        self.x = x
+        self.method = method
+        self.detection_time = detection_time
+        self.solve_time = solve_time
+        self.iterations = iterations
+        self.factorization = factorization
+
+    def slogdet(self):
+        """Знак и логарифм модуля определителя (см. LUFactorization.slogdet) или None без разложения."""
+        return self.factorization.slogdet() if self.factorization is not None else None
+
+    def det(self):
+        """Определитель матрицы или None, если система решена без разложения."""
+        return self.factorization.det() if self.factorization is not None else None
+
+    def rank(self, tol=None):
+        """Численный ранг матрицы или None, если система решена без разложения."""
+        return self.factorization.rank(tol) if self.factorization is not None else None
+
+    def condition_estimate(self):
+        """Оценка числа обусловленности в 1-норме за O(n^2) или None, если система решена без разложения."""
+        return self.factorization.condition_estimate() if self.factorization is not None else None
+
+
+class IterativeSolution:
+    """
+    Класс с результатом итерационного метода решения.
+
+    Атрибуты:
+    - x: массив (найденное решение).
+    - iterations: количество выполненных итераций.
+    - residuals: список относительных невязок ||b - Ax|| / ||b|| после каждой итерации.
+    - converged: True, если достигнута требуемая точность.
+    """
+    def __init__(self, x, iterations, residuals, converged):
+        self.x = x
+        self.iterations = iterations
+        self.residuals = residuals
+        self.converged = converged
+
+
+class MixedPrecisionSolution(IterativeSolution):
+    """
+    Класс с результатом решения в смешанной точности (см. EquationSolver.solve_mixed_precision).
+
+    Атрибуты:
+    - x: итоговое решение.
+    - iterations: число шагов уточнения по разложению в float32 (переход на float64 не считается).
+    - residuals: нормированные невязки шагов уточнения по разложению в float32.
+    - converged: True, если итоговое решение достигло требуемой точности.
+    - factorization: LUFactorization, по которому получено итоговое решение.
+    - fallback_residual: нормированная невязка решения по разложению в float64
+      или None, если переход на float64 не понадобился.
+    """
+    def __init__(self, x, iterations, residuals, converged, factorization, fallback_residual=None):
+        super().__init__(x, iterations, residuals, converged)
+        self.factorization = factorization
+        self.fallback_residual = fallback_residual
+
+    @property
+    def fallback(self):
+        """True, если пришлось выполнить разложение в float64."""
+        return self.fallback_residual is not None
+
+
+class SparseLUFactorization:
+    """
+    Класс для решения систем по разреженному LU-разложению (см. EquationSolver.factorize_sparse).
+
+    Атрибуты:
+    - ordering: перестановка строк и столбцов, уменьшающая заполнение.
+    - pivot_rows: номер ведущей строки на каждом шаге разреженного исключения.
+    - lower: для каждого шага - номера исключаемых строк и их множители.
+    - upper: для каждого шага - ведущий элемент, столбцы и значения остальной части ведущей строки.
+    - dense_rows: номера строк, оставшихся к переходу на плотное разложение (или None).
+    - dense: LUFactorization оставшейся подматрицы (или None).
+    - size: размерность системы уравнений.
+    """
+    def __init__(self, ordering, pivot_rows, lower, upper, dense_rows=None, dense=None):
+        self.ordering = ordering
+        self.pivot_rows = pivot_rows
+        self.lower = lower
+        self.upper = upper
+        self.dense_rows = dense_rows
+        self.dense = dense
+        self.size = len(ordering)
+
+    @property
+    def nnz(self):
+        """Количество хранимых элементов множителей L и U (плотная часть считается целиком)."""
+        dense = self.dense.LU.size if self.dense is not None else 0
+        return (sum(len(rows) for rows, _ in self.lower) + sum(len(columns) + 1 for _, columns, _ in self.upper)
+                + dense)
+
+    def solve(self, b):
+        """
+        Решает систему для одной или нескольких правых частей.
+
+        Параметры:
+        - b: вектор длины n или матрица n x k (столбцы правых частей)
+
+        Возвращает:
+        - x: массив той же формы, что и b (решение системы уравнений)
+        """
+        c = np.array(np.asarray(b, dtype=np.float64)[self.ordering])
+
+        # Прямой ход: повторяем над правой частью исключение строк
+        y = np.empty_like(c)
+        for k, (rows, multipliers) in enumerate(self.lower):
+            y[k] = c[self.pivot_rows[k]]
+            if len(rows):
+                c[rows] -= np.multiply.outer(multipliers, y[k])
+
+        # Обратный ход: сначала плотная часть, затем строки U
+        z = np.empty_like(c)
+        steps = len(self.upper)
+        if self.dense is not None:
+            z[steps:] = self.dense.solve(c[self.dense_rows])
+        for k in range(steps - 1, -1, -1):
+            pivot_value, columns, values = self.upper[k]
+            z[k] = (y[k] - values @ z[columns]) / pivot_value
+
+        x = np.empty_like(z)
+        x[self.ordering] = z
+        return x
+
+
+class StreamingLeastSquares:
+    """
+    Класс для решения переопределенной системы A x ~ b методом наименьших квадратов
+    по строкам, поступающим частями.
+
+    Хранится только верхнетреугольный множитель R (n x n) расширенной матрицы [A | b]
+    и вектор Q^T b, поэтому память O(n^2) не зависит от количества строк. Каждая
+    новая порция строк присоединяется к R отражениями Хаусхолдера: отражение для
+    столбца j затрагивает только строку j множителя R и строки порции, так что
+    порция из m строк обрабатывается за O(m n^2).
+
+    Атрибуты:
+    - solver: объект EquationSolver, выполняющий обратную подстановку.
+    - size: количество неизвестных n.
+    - chunk_size: наибольшее количество строк, обрабатываемых за один раз.
+    - R: двумерный массив n x (n + 1): множитель R и столбец Q^T b.
+    - rows: количество обработанных строк.
+    - residual_sum_of_squares: сумма квадратов невязок ||A x - b||^2 для текущего решения.
+    """
+    def __init__(self, n_columns, solver=None, chunk_size=4096):
+        self.solver = solver if solver is not None else EquationSolver()
+        self.size = int(n_columns)
+        self.chunk_size = chunk_size
+        self.R = np.zeros((self.size, self.size + 1), dtype=np.float64)
+        self.rows = 0
+        self.residual_sum_of_squares = 0.0
+
+    def add_rows(self, A, b, progress=None):
+        """
+        Присоединяет строки к разложению.
+
+        A может быть массивом в памяти или numpy.memmap: строки читаются
+        частями по chunk_size, вся матрица целиком не копируется.
+
+        Параметры:
+        - A: двумерный массив m x n (новые строки матрицы)
+        - b: вектор длины m (соответствующие свободные члены)
+        - progress: функция progress(rows, m), вызываемая после каждой порции (необязательно)
+
+        Возвращает:
+        - self, чтобы вызовы можно было объединять в цепочку
+
+        Исключения:
+        - DimensionMismatchError: количество столбцов A не равно n или длины A и b не совпадают
+        """
+        if np.ndim(A) != 2 or np.shape(A)[1] != self.size:
+            raise DimensionMismatchError(self.size, np.shape(A)[-1] if np.ndim(A) else 0)
+        if np.ndim(b) != 1 or len(b) != np.shape(A)[0]:
+            raise DimensionMismatchError(np.shape(A)[0], np.shape(b)[0] if np.ndim(b) else 0)
+        for start in range(0, np.shape(A)[0], self.chunk_size):
+            chunk = np.empty((min(self.chunk_size, np.shape(A)[0] - start), self.size + 1))
+            chunk[:, :self.size] = A[start:start + len(chunk)]
+            chunk[:, self.size] = b[start:start + len(chunk)]
+            self._update(chunk)
+            if progress is not None:
+                progress(start + len(chunk), np.shape(A)[0])
+        return self
+
+    def extend(self, chunks):
+        """
+        Присоединяет строки из итератора порций (A, b), например из потока данных.
+
+        Параметры:
+        - chunks: итерируемый объект пар (A, b)
+
+        Возвращает:
+        - self
+        """
+        for A, b in chunks:
+            self.add_rows(A, b)
+        return self
+
+    def _update(self, chunk):
+        """
+        Обнуляет порцию строк отражениями Хаусхолдера, обновляя R на месте.
+
+        Параметры:
+        - chunk: двумерный массив m x (n + 1) (строки [A | b]), изменяется на месте
+        """
+        R = self.R
+        for j in range(self.size):
+            column = chunk[:, j]
+            column_norm = column @ column
+            if column_norm == 0.0:
+                continue
+            norm = np.sqrt(R[j, j] ** 2 + column_norm)
+            alpha = -norm if R[j, j] >= 0 else norm
+            # Вектор отражения: (R[j, j] - alpha) в строке j и column в строках порции
+            head = R[j, j] - alpha
+            beta = 1.0 / (alpha * head)
+            w = beta * (head * R[j, j + 1:] + column @ chunk[:, j + 1:])
+            R[j, j + 1:] += head * w
+            chunk[:, j + 1:] += np.outer(column, w)
+            R[j, j] = alpha
+        # После исключения в последнем столбце порции остаются компоненты невязки
+        residual = chunk[:, self.size]
+        self.residual_sum_of_squares += float(residual @ residual)
+        self.rows += len(chunk)
+
+    def solution(self):
+        """
+        Вычисляет текущее решение задачи наименьших квадратов: R x = Q^T b.
+
+        Возвращает:
+        - x: массив длины n
+
+        Исключения:
+        - SingularMatrixError: столбцы обработанных строк линейно зависимы
+          (или строк пока меньше, чем неизвестных)
+        """
+        diagonal = np.abs(np.diagonal(self.R))
+        tol = self.size * np.finfo(np.float64).eps * diagonal.max(initial=0.0)
+        if self.size and not np.all(diagonal > tol):
+            raise SingularMatrixError(int(np.argmin(diagonal > tol)))
+        return self.solver.backward_substitution(self.R[:, :self.size], self.R[:, self.size])
@@ -1,32 +1,340 @@
 import json
+import os
+import time
+from itertools import islice
+
+import numpy as np
+
+from r_engen.sparse_matrix import CSRMatrix
+
+
+def _data_lines(file, comments='#'):
+    """Возвращает строки файла, содержащие данные (без пустых строк и комментариев)."""
+    return (line for line in file if line.split(comments, 1)[0].strip())
+
+
+class TranslationCatalog:
+    """
+    Класс с загруженными переводами.
+
+    Кроме исходного словаря translations[раздел][ключ][язык] для каждого языка
+    заранее построена плоская таблица {(раздел, ключ): текст}, поэтому поиск
+    текста - одно обращение к словарю, а смена языка - выбор другой таблицы.
+
+    Атрибуты:
+    - path: абсолютный путь к файлу переводов.
+    - mtime: время изменения файла при загрузке.
+    - checked: время последней проверки mtime (time.monotonic()).
+    - translations: исходный словарь переводов.
+    - tables: словарь {язык: {(раздел, ключ): текст}}.
+    """
+    def __init__(self, path, mtime, translations):
+        self.path = path
+        self.mtime = mtime
+        self.checked = time.monotonic()
+        self.translations = translations
+        self.tables = {}
+        for section, keys in translations.items():
+            for key, texts in keys.items():
+                for language, text in texts.items():
+                    self.tables.setdefault(language, {})[(section, key)] = text
+
+    def text(self, section, key, language):
+        """
+        Возвращает перевод.
+
+        Параметры:
+        - section: раздел ('menu', 'buttons', 'labels', 'messages')
+        - key: ключ текста
+        - language: код языка
+
+        Возвращает:
+        - str
+        """
+        return self.tables[language][(section, key)]
+
 
 class LoadFiles:
     """
     Класс для загрузки файлов.
 
     Методы:
+    - load_catalog: возвращает общий для всего процесса каталог переводов.
     - load_translations: загружает переводы из файла JSON.
+    - load_csv: загружает расширенную матрицу [A | b] из CSV/TSV по частям.
+    - load_npy: загружает массив .npy без копирования (отображение файла в память).
+    - load_npz: загружает систему из архива .npz.
+    - load_matrix_market: загружает матрицу в формате Matrix Market.
+    - load_system: выбирает загрузчик по расширению файла.
     """
+    # Каталоги переводов, общие для всех страниц и сессий процесса: {абсолютный путь: TranslationCatalog}
+    catalogs = {}
+    # Как часто (в секундах) проверять, не изменился ли файл переводов
+    check_interval = 1.0
+
     def __init__(self):
         pass
 
-    def load_translations(self, file_path):
+    @classmethod
+    def load_catalog(cls, file_path):
         """
-        Загружает переводы из файла JSON.
+        Возвращает каталог переводов, загружая файл только при первом обращении
+        или после его изменения.
+
+        Время изменения файла проверяется не чаще раза в check_interval секунд,
+        поэтому при переходах между страницами файл не открывается и не читается.
 
         Параметры:
         - file_path: str, путь к файлу с переводами.
 
         Возвращает:
-        - dict, словарь с переводами.
+        - TranslationCatalog
         """
+        path = os.path.abspath(file_path)
+        catalog = cls.catalogs.get(path)
+        if catalog is not None and time.monotonic() - catalog.checked < cls.check_interval:
+            return catalog
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            mtime = None
+        if catalog is not None and catalog.mtime == mtime:
+            catalog.checked = time.monotonic()
+            return catalog
+
         translations = {}
         try:
-            with open(file_path, 'r', encoding='utf-8') as file:
+            with open(path, 'r', encoding='utf-8') as file:
                 translations = json.load(file)
         except FileNotFoundError:
             print(f"Файл с переводами не найден: {file_path}")
         except json.JSONDecodeError:
             print(f"Ошибка декодирования файла с переводами: {file_path}")
+        catalog = TranslationCatalog(path, mtime, translations)
+        cls.catalogs[path] = catalog
+        return catalog
+
+    def load_translations(self, file_path):
+        """
+        Загружает переводы из файла JSON (из общего каталога, см. load_catalog).
+
+        Параметры:
+        - file_path: str, путь к файлу с переводами.
+
+        Возвращает:
+        - dict, словарь с переводами.
+        """
+        return LoadFiles.load_catalog(file_path).translations
+
+    def load_csv(self, file_path, delimiter=None, chunk_rows=65536):
+        """
+        Загружает расширенную матрицу системы [A | b] из CSV или TSV.
+
+        Файл читается дважды: сначала считаются строки с данными, затем под
+        всю матрицу выделяется один массив, и порции по chunk_rows строк
+        разбираются одним вызовом numpy и записываются прямо в него. Поэтому
+        в памяти нет ни всего текста файла, ни копий отдельных порций.
+
+        Параметры:
+        - file_path: str, путь к файлу.
+        - delimiter: разделитель (по умолчанию табуляция для .tsv, иначе запятая).
+        - chunk_rows: количество строк в порции.
+
+        Возвращает:
+        - A: двумерный массив (матрица коэффициентов).
+        - b: массив (столбец свободных членов, последний столбец файла).
 
-        return translations
+        Исключения:
+        - ValueError: файл пуст, в нем есть нечисловые значения или строки разной длины.
+        """
+        if delimiter is None:
+            delimiter = '\t' if file_path.lower().endswith('.tsv') else ','
+        with open(file_path, 'r', encoding='utf-8') as file:
+            n_rows = sum(1 for _ in _data_lines(file))
+        if not n_rows:
+            raise ValueError(f"файл не содержит данных: {file_path}")
+
+        augmented = None
+        with open(file_path, 'r', encoding='utf-8') as file:
+            lines = _data_lines(file)
+            start = 0
+            while True:
+                chunk = list(islice(lines, chunk_rows))
+                if not chunk:
+                    break
+                values = np.loadtxt(chunk, delimiter=delimiter, ndmin=2, comments='#')
+                if augmented is None:
+                    augmented = np.empty((n_rows, values.shape[1]))
+                elif values.shape[1] != augmented.shape[1]:
+                    raise ValueError(f"строки разной длины: {augmented.shape[1]} и {values.shape[1]} значений")
+                augmented[start:start + len(values)] = values
+                start += len(values)
+        if start != n_rows:
+            raise ValueError(f"файл изменился во время чтения: {file_path}")
+        return augmented[:, :-1], augmented[:, -1]
+
+    def load_npy(self, file_path):
+        """
+        Загружает расширенную матрицу [A | b] из файла .npy.
+
+        Файл отображается в память (mmap): данные читаются с диска по мере
+        обращения, а A и b - представления того же буфера без копирования.
+
+        Параметры:
+        - file_path: str, путь к файлу.
+
+        Возвращает:
+        - A: двумерный массив (матрица коэффициентов).
+        - b: массив (столбец свободных членов).
+
+        Исключения:
+        - ValueError: массив не двумерный.
+        """
+        augmented = np.load(file_path, mmap_mode='r')
+        if augmented.ndim != 2:
+            raise ValueError(f"ожидается двумерный массив [A | b], получен массив формы {augmented.shape}")
+        return augmented[:, :-1], augmented[:, -1]
+
+    def load_npz(self, file_path):
+        """
+        Загружает систему из архива .npz.
+
+        Архив должен содержать массивы 'A' и 'b' или один массив - расширенную
+        матрицу [A | b]. Массивы внутри zip-архива нельзя отобразить в память, они читаются целиком.
+
+        Параметры:
+        - file_path: str, путь к файлу.
+
+        Возвращает:
+        - A: двумерный массив (матрица коэффициентов).
+        - b: массив (столбец свободных членов).
+
+        Исключения:
+        - ValueError: архив не содержит системы в ожидаемом виде.
+        """
+        with np.load(file_path) as archive:
+            if 'A' in archive.files and 'b' in archive.files:
+                return archive['A'], archive['b']
+            if len(archive.files) == 1:
+                augmented = archive[archive.files[0]]
+                if augmented.ndim == 2:
+                    return augmented[:, :-1], augmented[:, -1]
+        raise ValueError("архив .npz должен содержать массивы 'A' и 'b' или одну расширенную матрицу")
+
+    def load_matrix_market(self, file_path, chunk_rows=65536):
+        """
+        Загружает матрицу в формате Matrix Market (.mtx).
+
+        Координатный формат разбирается порциями и возвращается как CSRMatrix,
+        плотный формат (array) - как двумерный массив. Для симметричных матриц
+        хранится только нижний треугольник, он отражается. Массивы индексов и
+        значений выделяются один раз по числу элементов из заголовка (вдвое
+        больше для симметричных матриц), и порции записываются прямо в них.
+
+        Параметры:
+        - file_path: str, путь к файлу.
+        - chunk_rows: количество строк в порции.
+
+        Возвращает:
+        - CSRMatrix для формата coordinate или массив для формата array.
+
+        Исключения:
+        - ValueError: неверный или неподдерживаемый заголовок, число элементов не совпадает с заголовком.
+        """
+        with open(file_path, 'r', encoding='utf-8') as file:
+            header = file.readline().lower().split()
+            if len(header) < 5 or header[0] != '%%matrixmarket' or header[1] != 'matrix':
+                raise ValueError(f"неверный заголовок Matrix Market: {file_path}")
+            layout, field, symmetry = header[2], header[3], header[4]
+            if field not in ('real', 'integer', 'pattern') or symmetry not in ('general', 'symmetric'):
+                raise ValueError(f"неподдерживаемый тип Matrix Market: {field} {symmetry}")
+
+            line = file.readline()
+            while line.startswith('%') or not line.strip():
+                line = file.readline()
+            sizes = [int(value) for value in line.split()]
+
+            if layout == 'array':
+                n_rows, n_cols = sizes[0], sizes[1]
+                values = np.loadtxt(file, ndmin=1)
+                if symmetry == 'symmetric':
+                    rows, cols = np.triu_indices(n_cols)
+                    dense = np.zeros((n_rows, n_cols))
+                    dense[cols, rows] = values
+                    dense[rows, cols] = values
+                    return dense
+                # Плотный формат хранит матрицу по столбцам
+                return values.reshape(n_cols, n_rows).T.copy()
+
+            n_rows, n_cols, nnz = sizes
+            capacity = 2 * nnz if symmetry == 'symmetric' else nnz
+            rows = np.empty(capacity, dtype=np.int64)
+            cols = np.empty(capacity, dtype=np.int64)
+            values = np.ones(capacity)
+            count = 0
+            lines = _data_lines(file, '%')
+            while True:
+                chunk = list(islice(lines, chunk_rows))
+                if not chunk:
+                    break
+                entries = np.loadtxt(chunk, ndmin=2, comments='%')
+                if count + len(entries) > nnz:
+                    raise ValueError(f"в файле больше элементов, чем указано в заголовке ({nnz}): {file_path}")
+                rows[count:count + len(entries)] = entries[:, 0]
+                cols[count:count + len(entries)] = entries[:, 1]
+                if field != 'pattern':
+                    values[count:count + len(entries)] = entries[:, 2]
+                count += len(entries)
+        if count != nnz:
+            raise ValueError(f"в файле {count} элементов, а в заголовке указано {nnz}: {file_path}")
+        rows[:nnz] -= 1
+        cols[:nnz] -= 1
+        if symmetry == 'symmetric':
+            # Отраженные внедиагональные элементы записываются в свободную вторую половину массивов
+            off_diagonal = np.flatnonzero(rows[:nnz] != cols[:nnz])
+            end = nnz + len(off_diagonal)
+            rows[nnz:end] = cols[off_diagonal]
+            cols[nnz:end] = rows[off_diagonal]
+            values[nnz:end] = values[off_diagonal]
+            rows, cols, values = rows[:end], cols[:end], values[:end]
+        return CSRMatrix.from_coo(rows, cols, values, (n_rows, n_cols))
+
+    def load_system(self, file_path, rhs_path=None):
+        """
+        Загружает систему уравнений, выбирая загрузчик по расширению файла.
+
+        Для .csv, .tsv, .txt и .npy файл содержит расширенную матрицу [A | b],
+        для .npz - массивы 'A' и 'b', для .mtx - только матрицу, а столбец
+        свободных членов берется из rhs_path (.mtx, .npy или текстовый файл).
+
+        Параметры:
+        - file_path: str, путь к файлу.
+        - rhs_path: str, путь к файлу со столбцом свободных членов (для .mtx).
+
+        Возвращает:
+        - A: двумерный массив или CSRMatrix.
+        - b: массив (столбец свободных членов).
+
+        Исключения:
+        - ValueError: неизвестное расширение или нет столбца свободных членов.
+        """
+        extension = os.path.splitext(file_path)[1].lower()
+        if extension in ('.csv', '.tsv', '.txt'):
+            return self.load_csv(file_path)
+        if extension == '.npy':
+            return self.load_npy(file_path)
+        if extension == '.npz':
+            return self.load_npz(file_path)
+        if extension == '.mtx':
+            if rhs_path is None:
+                raise ValueError("для матрицы .mtx нужен файл со столбцом свободных членов")
+            rhs_extension = os.path.splitext(rhs_path)[1].lower()
+            if rhs_extension == '.mtx':
+                b = self.load_matrix_market(rhs_path)
+                b = b.to_dense() if isinstance(b, CSRMatrix) else b
+            elif rhs_extension == '.npy':
+                b = np.load(rhs_path, mmap_mode='r')
+            else:
+                b = np.loadtxt(rhs_path, ndmin=1)
+            return self.load_matrix_market(file_path), np.ravel(b)
+        raise ValueError(f"неизвестный формат файла: {extension}")
@@ -0,0 +1,196 @@
+import io
+import sqlite3
+import threading
+from collections import deque
+from datetime import datetime
+
+import numpy as np
+
+from r_engen.sparse_matrix import CSRMatrix
+
+
+def _pack_arrays(**arrays):
+    """Сериализует массивы в байты формата .npz (без pickle)."""
+    buffer = io.BytesIO()
+    np.savez(buffer, **arrays)
+    return buffer.getvalue()
+
+
+def _unpack_arrays(data):
+    """Восстанавливает словарь массивов из байтов формата .npz."""
+    with np.load(io.BytesIO(data), allow_pickle=False) as archive:
+        return {name: archive[name] for name in archive.files}
+
+
+class HistoryRecord:
+    """
+    Запись истории решений.
+
+    Атрибуты:
+    - id: номер записи в базе.
+    - created: время решения (datetime).
+    - method: метод, которым решена система.
+    - solve_time: время решения в секундах.
+    - size: размерность системы.
+    - x: решение в полной точности (массив float64).
+    """
+    def __init__(self, id, created, method, solve_time, size, x):
+        self.id = id
+        self.created = created
+        self.method = method
+        self.solve_time = solve_time
+        self.size = size
+        self.x = x
+
+    @classmethod
+    def from_row(cls, row):
+        """Создает запись из строки (id, created, method, solve_time, size, solution) таблицы history."""
+        record_id, created, method, solve_time, size, solution = row
+        return cls(record_id, datetime.fromtimestamp(created), method, solve_time, size,
+                   np.load(io.BytesIO(solution), allow_pickle=False))
+
+
+class HistoryStore:
+    """
+    Класс для хранения истории решений в базе SQLite.
+
+    Каждая запись содержит исходную систему, метод, время решения и решение
+    в полной точности. В памяти хранятся только последние recent_size записей
+    (кольцевой буфер без исходных систем), поэтому расход памяти не зависит от
+    длины истории: первые страницы истории берутся из буфера, остальные
+    читаются из базы постранично, а система конкретной записи - по запросу.
+
+    Методы можно вызывать из разных потоков.
+
+    Атрибуты:
+    - path: путь к файлу базы (':memory:' - база в памяти).
+    - recent: кольцевой буфер последних записей (deque, новые записи справа).
+    - max_records: сколько записей хранить в базе (старые удаляются; None - без ограничения).
+    - max_system_entries: системы с большим числом элементов сохраняются без A и b.
+    """
+    def __init__(self, path, recent_size=50, max_records=10000, max_system_entries=10 ** 6):
+        self.path = path
+        self.max_records = max_records
+        self.max_system_entries = max_system_entries
+        self._lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS history (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                created REAL NOT NULL,
+                method TEXT NOT NULL,
+                solve_time REAL NOT NULL,
+                size INTEGER NOT NULL,
+                solution BLOB NOT NULL,
+                system BLOB
+            )""")
+        self.connection.commit()
+        self._count = self.connection.execute("SELECT COUNT(*) FROM history").fetchone()[0]
+        rows = self.connection.execute(
+            "SELECT id, created, method, solve_time, size, solution FROM history ORDER BY id DESC LIMIT ?",
+            (recent_size,)).fetchall()
+        self.recent = deque((HistoryRecord.from_row(row) for row in reversed(rows)), maxlen=recent_size)
+
+    def __len__(self):
+        return self._count
+
+    def add(self, A, b, x, method, solve_time, created=None):
+        """
+        Сохраняет решение системы.
+
+        Параметры:
+        - A: матрица коэффициентов (массив или CSRMatrix)
+        - b: столбец свободных членов
+        - x: решение (сохраняется в полной точности)
+        - method: метод решения
+        - solve_time: время решения в секундах
+        - created: время решения (по умолчанию текущее)
+
+        Возвращает:
+        - HistoryRecord
+        """
+        x = np.array(x, dtype=np.float64)
+        created = datetime.now() if created is None else created
+        solution = io.BytesIO()
+        np.save(solution, x, allow_pickle=False)
+        system = None
+        if isinstance(A, CSRMatrix):
+            if A.nnz <= self.max_system_entries:
+                system = _pack_arrays(data=A.data, indices=A.indices, indptr=A.indptr,
+                                      shape=np.array(A.shape), b=np.asarray(b, dtype=np.float64))
+        elif np.size(A) <= self.max_system_entries:
+            system = _pack_arrays(A=np.asarray(A, dtype=np.float64), b=np.asarray(b, dtype=np.float64))
+
+        with self._lock:
+            cursor = self.connection.execute(
+                "INSERT INTO history (created, method, solve_time, size, solution, system) VALUES (?, ?, ?, ?, ?, ?)",
+                (created.timestamp(), method, float(solve_time), len(x), solution.getvalue(), system))
+            record = HistoryRecord(cursor.lastrowid, created, method, float(solve_time), len(x), x)
+            self._count += 1
+            if self.max_records is not None and self._count > self.max_records:
+                self.connection.execute(
+                    "DELETE FROM history WHERE id <= (SELECT id FROM history ORDER BY id DESC LIMIT 1 OFFSET ?)",
+                    (self.max_records,))
+                self._count = self.max_records
+            self.connection.commit()
+            self.recent.append(record)
+        return record
+
+    def page(self, number, page_size):
+        """
+        Возвращает страницу истории (новые записи первыми).
+
+        Параметры:
+        - number: номер страницы (с нуля)
+        - page_size: количество записей на странице
+
+        Возвращает:
+        - список HistoryRecord
+        """
+        start = number * page_size
+        with self._lock:
+            if start + page_size <= len(self.recent) or len(self.recent) == self._count:
+                newest_first = list(reversed(self.recent))
+                return newest_first[start:start + page_size]
+            rows = self.connection.execute(
+                "SELECT id, created, method, solve_time, size, solution FROM history "
+                "ORDER BY id DESC LIMIT ? OFFSET ?", (page_size, start)).fetchall()
+        return [HistoryRecord.from_row(row) for row in rows]
+
+    def page_count(self, page_size):
+        """Возвращает количество страниц истории (не меньше одной)."""
+        return max(1, -(-self._count // page_size))
+
+    def load_system(self, record_id):
+        """
+        Загружает исходную систему записи.
+
+        Параметры:
+        - record_id: номер записи
+
+        Возвращает:
+        - (A, b), где A - массив или CSRMatrix, или None, если запись удалена
+          или система была слишком большой для сохранения
+        """
+        with self._lock:
+            row = self.connection.execute("SELECT system FROM history WHERE id = ?", (record_id,)).fetchone()
+        if row is None or row[0] is None:
+            return None
+        arrays = _unpack_arrays(row[0])
+        if 'A' in arrays:
+            return arrays['A'], arrays['b']
+        return CSRMatrix(arrays['data'], arrays['indices'], arrays['indptr'], tuple(arrays['shape'])), arrays['b']
+
+    def clear(self):
+        """Удаляет всю историю."""
+        with self._lock:
+            self.connection.execute("DELETE FROM history")
+            self.connection.commit()
+            self.recent.clear()
+            self._count = 0
+
+    def close(self):
+        """Закрывает соединение с базой."""
+        with self._lock:
+            self.connection.close()
+
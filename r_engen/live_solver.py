@@ -0,0 +1,155 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from r_engen.equation_solver import EquationSolver, SolveCancelledError, SolverError
+
+
+class LiveSolver:
+    """
+    Класс для решения системы на лету, пока пользователь редактирует матрицу.
+
+    Каждое изменение ячейки обновляет только соответствующий элемент числовых
+    массивов A и b. Решение запускается в фоновом потоке после паузы delay
+    секунд без новых изменений. Если во время решения пришли новые изменения,
+    ожидающие решения отменяются, а уже запущенное прерывается на ближайшем
+    вызове progress: в on_result попадает только решение для последней версии матрицы.
+
+    Атрибуты:
+    - size: размерность системы уравнений.
+    - A: матрица коэффициентов.
+    - b: столбец свободных членов.
+    - valid: массив size x (size + 1), True для ячеек с корректным числом.
+    - method: метод решения (см. EquationSolver.solve) или функция без параметров,
+      возвращающая его; функция вызывается при каждом решении, поэтому смена
+      метода в настройках действует без пересоздания LiveSolver.
+    - delay: пауза после последнего изменения перед решением, в секундах.
+    - on_result: функция, вызываемая с SolveResult из фонового потока.
+    - on_error: функция, вызываемая с SolverError или ValueError (например, неизвестный
+      метод) из фонового потока (необязательно).
+    - generation: номер версии матрицы, увеличивается при каждом изменении.
+    """
+    def __init__(self, size, on_result, on_error=None, method='auto', delay=0.15):
+        self.size = size
+        self.A = np.zeros((size, size))
+        self.b = np.zeros(size)
+        self.valid = np.zeros((size, size + 1), dtype=bool)
+        self.method = method
+        self.delay = delay
+        self.on_result = on_result
+        self.on_error = on_error
+        self.generation = 0
+        self._lock = threading.Lock()
+        self._timer = None
+        self._pending = []
+        self._closed = False
+        self._executor = ThreadPoolExecutor(max_workers=1)
+
+    def set_cell(self, i, j, text):
+        """
+        Обновляет одну ячейку по введенному тексту и планирует решение.
+
+        Параметры:
+        - i: номер строки
+        - j: номер столбца (столбец size - свободный член)
+        - text: введенное значение (допускается запятая вместо точки)
+        """
+        with self._lock:
+            self._set_cell(i, j, text)
+            self.generation += 1
+            self._schedule()
+
+    def _set_cell(self, i, j, text):
+        """Записывает значение одной ячейки (вызывается под блокировкой)."""
+        try:
+            value = float(text.replace(',', '.'))
+            valid = np.isfinite(value)
+        except ValueError:
+            value, valid = 0.0, False
+        if j == self.size:
+            self.b[i] = value
+        else:
+            self.A[i, j] = value
+        self.valid[i, j] = valid
+
+    def load(self, values):
+        """
+        Загружает все ячейки сразу (например, при включении режима) и планирует одно решение.
+
+        Параметры:
+        - values: двумерный список строк размера size x (size + 1)
+        """
+        with self._lock:
+            for i, row in enumerate(values):
+                for j, text in enumerate(row):
+                    self._set_cell(i, j, text)
+            self.generation += 1
+            self._schedule()
+
+    def set_values(self, values, valid):
+        """
+        Загружает все ячейки сразу из числовых массивов (например, при включении режима).
+
+        Параметры:
+        - values: массив size x (size + 1) (столбец size - свободные члены)
+        - valid: массив size x (size + 1), True для ячеек с корректным числом
+        """
+        with self._lock:
+            self.A[:] = values[:, :self.size]
+            self.b[:] = values[:, self.size]
+            self.valid[:] = valid
+            self.generation += 1
+            self._schedule()
+
+    def _schedule(self):
+        """Перезапускает таймер паузы и отменяет еще не начатые решения (вызывается под блокировкой)."""
+        if self._closed:
+            return
+        if self._timer is not None:
+            self._timer.cancel()
+        for future in self._pending:
+            future.cancel()
+        self._pending = [future for future in self._pending if not future.done()]
+        self._timer = threading.Timer(self.delay, self._submit)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _submit(self):
+        """Отправляет решение текущей версии матрицы в фоновый поток."""
+        with self._lock:
+            if self._closed or not self.valid.all():
+                return
+            self._pending.append(self._executor.submit(self._solve, self.generation, self.A.copy(), self.b.copy()))
+
+    def _solve(self, generation, A, b):
+        """Решает систему и передает результат, только если матрица с тех пор не менялась."""
+        def progress(column, n):
+            # Матрица изменилась или страница закрыта, пока шло решение: результат не нужен
+            if generation != self.generation or self._closed:
+                raise SolveCancelledError()
+
+        try:
+            method = self.method() if callable(self.method) else self.method
+            result = EquationSolver().solve(A, b, method, progress)
+        except SolveCancelledError:
+            return
+        except (SolverError, ValueError) as error:
+            result = error
+        if generation != self.generation or self._closed:
+            return
+        if isinstance(result, Exception):
+            if self.on_error is not None:
+                self.on_error(result)
+        else:
+            self.on_result(result)
+
+    def close(self):
+        """Останавливает таймер и фоновый поток; после этого результаты больше не передаются."""
+        with self._lock:
+            self._closed = True
+            if self._timer is not None:
+                self._timer.cancel()
+            for future in self._pending:
+                future.cancel()
+        self._executor.shutdown(wait=False)
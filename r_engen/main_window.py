@@ -1,8 +1,15 @@
 import flet as ft
 import json
-from datetime import datetime
-from r_engen.equation_solver import EquationSolver  # Используйте абсолютный путь
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from r_engen.equation_solver import EquationSolver, SolveCancelledError, SolverError  # Используйте абсолютный путь
 from r_engen.file_loader import LoadFiles  # Используйте абсолютный путь
+from r_engen.history_store import HistoryStore  # Используйте абсолютный путь
+from r_engen.live_solver import LiveSolver  # Используйте абсолютный путь
+from r_engen.matrix_entries import MatrixEntries, parse_matrix_text  # Используйте абсолютный путь
+from r_engen.sparse_matrix import CSRMatrix  # Используйте абсолютный путь
+from r_engen.view_cache import ViewCache  # Используйте абсолютный путь
 
 
 class MainWindow:
@@ -10,17 +17,30 @@ class MainWindow:
     Основной класс, управляющий интерфейсом приложения и его настройками.
 
     Атрибуты:
-    - solution_history: список истории решений.
+    - history: HistoryStore с историей решений (открывается при создании первого окна).
+    - history_path: файл базы истории решений.
+    - history_page_size: количество записей на странице истории.
     - rounding: количество знаков после запятой при округлении.
     - method: метод решения системы уравнений.
     - current_language: текущий язык интерфейса.
     - theme_mode: текущая тема интерфейса.
+    - live_mode: решать систему на лету при каждом изменении ячейки.
+
+    Состояние сессии хранится на объекте страницы:
+    - page.view_cache: кэш построенных страниц (ViewCache).
+    - page.factorization: разложение последней матрицы, решенной методом LU (для повторного решения после правок).
+    - page.solve_executor: фоновый поток, в котором решаются системы, чтобы интерфейс не блокировался.
+    - page.solve_generation: номер последнего запрошенного решения; результаты более старых отбрасываются.
+    - page.live_solver: LiveSolver страницы ввода (закрывается, когда страница ввода строится заново).
     """
-    solution_history = []
+    history = None
+    history_path = "history.sqlite3"
+    history_page_size = 10
     rounding = 3
     method = 'Gauss'
     current_language = 'en'
     theme_mode = 'light'
+    live_mode = False
 
     def __init__(self, page):
         """
@@ -35,57 +55,198 @@ class MainWindow:
         self.page.window_width = 1920
         self.theme = 'light'
 
-        self.page.translations = LoadFiles.load_translations(self.page, "Translate.json")
+        # Каталог загружается один раз на процесс и перечитывается только после изменения файла
+        self.catalog = LoadFiles.load_catalog("Translate.json")
+        self.page.translations = self.catalog.translations
+
+        # Страницы строятся один раз за сессию и хранятся на объекте страницы
+        if getattr(self.page, 'view_cache', None) is None:
+            self.page.view_cache = ViewCache(self.theme_mode, self.current_language)
+        self.views = self.page.view_cache
+        # Разложение последней матрицы, решенной методом LU (для повторного решения после правок),
+        # у каждой сессии свое
+        if not hasattr(self.page, 'factorization'):
+            self.page.factorization = None
+        if not hasattr(self.page, 'live_solver'):
+            self.page.live_solver = None
+        # Фоновый поток и номер решения тоже свои у каждой сессии: новое решение
+        # в одной сессии не должно отбрасывать результат другой
+        if getattr(self.page, 'solve_executor', None) is None:
+            self.page.solve_executor = ThreadPoolExecutor(max_workers=1)
+            self.page.solve_generation = 0
+
+        # История хранится на диске, в памяти - только последние записи
+        if MainWindow.history is None:
+            MainWindow.history = HistoryStore(self.history_path)
+
+    def text(self, section, key):
+        """
+        Возвращает перевод для текущего языка из плоской таблицы каталога.
+
+        Параметры:
+        - section: раздел ('menu', 'buttons', 'labels', 'messages')
+        - key: ключ текста
+
+        Возвращает:
+        - str
+        """
+        return self.catalog.tables[self.current_language][(section, key)]
+
+    def invalid_cells_message(self, cells, limit=20):
+        """
+        Формирует сообщение со списком некорректных ячеек (номера с единицы).
+
+        Параметры:
+        - cells: список (строка, столбец)
+        - limit: сколько ячеек перечислить
+
+        Возвращает:
+        - str
+        """
+        listed = ", ".join(f"({i + 1}, {j + 1})" for i, j in cells[:limit])
+        more = f" ... (+{len(cells) - limit})" if len(cells) > limit else ""
+        return f"{self.text('messages', 'invalid_cells')}: {listed}{more}"
+
+    def translated(self, control, attribute, section, key):
+        """
+        Устанавливает атрибуту элемента перевод и обновляет его при смене языка.
+
+        Параметры:
+        - control: элемент интерфейса
+        - attribute: имя атрибута ('value', 'text', 'hint_text', ...)
+        - section: раздел ('menu', 'buttons', 'labels', 'messages')
+        - key: ключ текста
+
+        Возвращает:
+        - control
+        """
+        catalog = self.catalog
+        return self.views.bind(control, attribute,
+                               lambda theme, language: catalog.tables[language][(section, key)])
+
+    def themed(self, control, attribute, light, dark):
+        """
+        Устанавливает атрибуту элемента значение для текущей темы и обновляет его при смене темы.
+
+        Параметры:
+        - control: элемент интерфейса
+        - attribute: имя атрибута ('color', 'bgcolor', 'style', ...)
+        - light: значение для светлой темы
+        - dark: значение для темной темы
+
+        Возвращает:
+        - control
+        """
+        return self.views.bind(control, attribute, lambda theme, language: light if theme == 'light' else dark)
+
+    def custom_button(self, key, action):
+        """
+        Создает CustomButton с переводимым текстом из раздела 'buttons'.
+
+        Параметры:
+        - key: ключ текста кнопки
+        - action: действие при нажатии
+
+        Возвращает:
+        - CustomButton
+        """
+        return self.translated(CustomButton(self.text('buttons', key), action, self.page), 'text', 'buttons', key)
+
+    def show_view(self, name, builder, refresh=None):
+        """
+        Показывает страницу name из кэша сессии, при первом обращении строя ее функцией builder().
+
+        Построенная страница остается в дереве элементов, при переходе меняется
+        только видимость страниц, и клиенту отправляется одно небольшое обновление.
+
+        Параметры:
+        - name: имя страницы
+        - builder: функция без параметров, возвращающая элемент страницы
+        - refresh: функция refresh(view), обновляющая изменяемые данные страницы перед показом (необязательно)
+
+        Возвращает:
+        - элемент страницы
+        """
+        header, built = self.views.build('top_panel', self.create_top_panel, pinned=True)
+        if built:
+            self.page.controls.insert(0, header)
+        view, built = self.views.build(name, builder)
+        if built:
+            self.page.controls.append(view)
+        self.views.show(name)
+        if refresh is not None:
+            refresh(view)
+        self.page.update()
+        return view
+
+    def drop_view(self, name):
+        """
+        Удаляет страницу из кэша и из дерева элементов (следующий показ построит ее заново).
+
+        Параметры:
+        - name: имя страницы
+        """
+        view = self.views.drop(name)
+        if view is not None and view in self.page.controls:
+            self.page.controls.remove(view)
+
+    def apply_settings(self):
+        """
+        Применяет текущие тему и язык ко всем построенным страницам без их перестроения:
+        меняются только привязанные свойства элементов.
+        """
+        self.page.theme_mode = self.theme_mode
+        self.views.apply(self.theme_mode, self.current_language)
+        self.page.update()
 
     def main_window_page(self):
-        """Создает интерфейс приложения."""
-        self.page.controls.clear()
-        MainWindow.create_top_panel(self)
-        MainWindow.create_dimension_selection_page(self)
+        """Показывает главную страницу (выбор размерности матрицы)."""
+        self.show_view('main', self.create_dimension_selection_page)
+
+    @staticmethod
+    def panel_button_style(theme, inverted=False):
+        """
+        Возвращает стиль кнопок верхней панели и главной страницы.
+
+        Параметры:
+        - theme: тема ('light' или 'dark')
+        - inverted: светлый текст на темном фоне для светлой темы (и наоборот)
+
+        Возвращает:
+        - ft.ButtonStyle
+        """
+        light = (theme == 'light') != inverted
+        return ft.ButtonStyle(
+            color={ft.MaterialState.DEFAULT: ft.colors.BLACK if light else ft.colors.WHITE},
+            bgcolor={ft.MaterialState.HOVERED: ft.colors.PURPLE,
+                     "": ft.colors.WHITE if light else ft.colors.BLACK},
+            overlay_color=ft.colors.TRANSPARENT,
+            elevation={"pressed": 0, "": 1})
 
     def create_top_panel(self):
         """
-        Создает верхнюю панель интерфейса приложения.
+        Создает верхнюю панель интерфейса приложения (один раз за сессию, см. show_view).
+
+        Возвращает:
+        - ft.Container
         """
         settings_manager = SettingsManager(self.page)
         settings_button = ft.IconButton(
             icon=ft.icons.SETTINGS,
             on_click=lambda e: settings_manager.show_settings_page(),
-            icon_size=39,
-            style=ft.ButtonStyle(
-                color={
-                    ft.MaterialState.DEFAULT: ft.colors.BLACK if self.page.theme_mode == 'light' else ft.colors.WHITE},
-                bgcolor={
-                    ft.MaterialState.HOVERED: ft.colors.PURPLE if self.page.theme_mode == 'light' else ft.colors.PURPLE,
-                    "": ft.colors.WHITE if self.page.theme_mode == 'light' else ft.colors.BLACK},
-                overlay_color=ft.colors.TRANSPARENT,
-                elevation={"pressed": 0, "": 1})
+            icon_size=39
         )
         help_button = ft.TextButton("FAQ",
                                     on_click=lambda e: CreateHelpPage(self.page).show_help_page(),
-                                    style=ft.ButtonStyle(
-                                        color={
-                                            ft.MaterialState.DEFAULT: ft.colors.BLACK if self.page.theme_mode == 'light' else ft.colors.WHITE},
-                                        bgcolor={
-                                            ft.MaterialState.HOVERED: ft.colors.PURPLE if self.page.theme_mode == 'light' else ft.colors.PURPLE,
-                                            "": ft.colors.WHITE if self.page.theme_mode == 'light' else ft.colors.BLACK},
-                                        overlay_color=ft.colors.TRANSPARENT,
-                                        elevation={"pressed": 0, "": 1}),
                                     width=100,
                                     height=50)
         history_button = ft.TextButton("History",
                                        on_click=lambda e: CreateHistoryPage(self.page).
                                        show_history_page(),
-                                       style=ft.ButtonStyle(
-                                           color={
-                                               ft.MaterialState.DEFAULT: ft.colors.BLACK if self.page.theme_mode == 'light' else ft.colors.WHITE},
-                                           bgcolor={
-                                               ft.MaterialState.HOVERED: ft.colors.PURPLE if self.page.theme_mode == 'light' else ft.colors.PURPLE,
-                                               "": ft.colors.WHITE if self.page.theme_mode == 'light' else ft.colors.BLACK},
-                                           overlay_color=ft.colors.TRANSPARENT,
-                                           elevation={"pressed": 0, "": 1}),
                                        width=100,
                                        height=50)
+        for button in (settings_button, help_button, history_button):
+            self.views.bind(button, 'style', lambda theme, language: MainWindow.panel_button_style(theme))
 
         buttons = ft.Row([
             help_button,
@@ -96,79 +257,56 @@ class MainWindow:
 
         header = ft.Container(
             content=ft.Row([
-                ft.Text("Linear solver ", size=30, color='black' if self.page.theme_mode == 'light' else 'white'),
+                self.themed(ft.Text("Linear solver ", size=30), 'color', 'black', 'white'),
                 buttons],
                 alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
             width=self.page.window_width,
-            border=ft.border.all(1, 'black' if self.page.theme_mode == 'light' else "WHITE"),
             border_radius=10,
-            bgcolor='white' if self.page.theme_mode == 'light' else 'black',
             padding=10,
             margin=-10)
+        self.themed(header, 'border', ft.border.all(1, 'black'), ft.border.all(1, "WHITE"))
+        self.themed(header, 'bgcolor', 'white', 'black')
 
         self.page.on_keyboard_event = KeyboardBindings(self.page).on_keyboard
 
-        self.page.add(header)
+        return header
 
     def create_dimension_selection_page(self):
         """
         Создает страницу выбора размерности матрицы.
+
+        Возвращает:
+        - ft.Column
         """
 
         size_entry = ft.TextField(
-            hint_text=self.page.translations['labels']['square_matrix_size'][self.current_language],
-            hint_style=ft.TextStyle(color='black' if self.page.theme_mode == 'light' else 'yellow'),
             text_align=ft.TextAlign.CENTER,
-            color='black' if self.page.theme_mode == 'light' else 'yellow',
             width=600,
-            text_size=30,
-            border_color='white' if self.page.theme_mode == 'light' else 'black'
-        )
-
-        matrix_input_size_slider = ft.Slider(
-            min=1,
-            max=10,
-            width=100,
-            active_color='green',
-            inactive_color='red',
-            divisions=9,
-            adaptive=False,
-            label='Matrix Input Size: {value}',
-            round=0,
-            thumb_color='blue',
-            value=5,
-            rotate=-1.55,
-            on_change=lambda e: print(f"Selected input size: {matrix_input_size_slider.value}")
+            text_size=30
         )
+        self.translated(size_entry, 'hint_text', 'labels', 'square_matrix_size')
+        self.themed(size_entry, 'hint_style', ft.TextStyle(color='black'), ft.TextStyle(color='yellow'))
+        self.themed(size_entry, 'color', 'black', 'yellow')
+        self.themed(size_entry, 'border_color', 'white', 'black')
 
         submit_button = ft.TextButton(
-            self.page.translations['buttons']['confirm'][self.current_language],
             on_click=lambda e: CreateMatrixInputPage(self.page, size_entry.value).validate_and_create_matrix_input_page(
                 size_entry.value),
-            style=ft.ButtonStyle(
-                color={
-                    ft.MaterialState.DEFAULT: ft.colors.WHITE if self.page.theme_mode == 'light' else ft.colors.BLACK},
-                bgcolor={
-                    ft.MaterialState.HOVERED: ft.colors.PURPLE if self.page.theme_mode == 'light' else ft.colors.PURPLE,
-                    "": ft.colors.BLACK if self.page.theme_mode == 'light' else ft.colors.WHITE},
-                overlay_color=ft.colors.TRANSPARENT,
-                elevation={"pressed": 0, "": 1}),
             width=150,
             height=50,
         )
+        self.translated(submit_button, 'text', 'buttons', 'confirm')
+        self.views.bind(submit_button, 'style',
+                        lambda theme, language: MainWindow.panel_button_style(theme, inverted=True))
 
         text_1 = ft.Container(
             alignment=ft.alignment.center,
             margin=ft.margin.only(left=450, top=50),
             content=ft.Row(
-                [ft.Text(self.page.translations['menu']['Main_page_text_1'][self.current_language],
-                         size=35,
-                         weight=ft.FontWeight.W_800)],
+                [self.translated(ft.Text(size=35, weight=ft.FontWeight.W_800), 'value', 'menu', 'Main_page_text_1')],
                 alignment=ft.MainAxisAlignment.CENTER),
             width=600,
-            border=ft.border.all(0, 'white' if self.page.theme_mode == 'light' else "black"),
             border_radius=10,
-            bgcolor='white' if self.page.theme_mode == 'light' else 'black',
             padding=0
         )
         pull = ft.Container(
@@ -176,23 +314,55 @@ class MainWindow:
             margin=ft.margin.only(left=450, top=75),
             content=ft.Row([size_entry], alignment=ft.MainAxisAlignment.CENTER),
             width=600,
-            border=ft.border.all(1, 'black' if self.page.theme_mode == 'light' else "WHITE"),
             border_radius=10,
-            bgcolor='white' if self.page.theme_mode == 'light' else 'black',
             padding=0
         )
+        file_picker = ft.FilePicker(on_result=self.open_system_file)
+        self.page.overlay.append(file_picker)
+        open_button = self.custom_button('open_file',
+                                         lambda e: file_picker.pick_files(
+                                             allow_multiple=True,
+                                             allowed_extensions=['csv', 'tsv', 'txt', 'npy', 'npz', 'mtx']))
+
         button_container = ft.Container(
             alignment=ft.alignment.center,
             margin=ft.margin.only(left=450, top=50),
-            content=ft.Row([submit_button], alignment=ft.MainAxisAlignment.CENTER),
+            content=ft.Row([submit_button, open_button], alignment=ft.MainAxisAlignment.CENTER),
             width=600,
-            border=ft.border.all(0, 'white' if self.page.theme_mode == 'light' else "black"),
             border_radius=10,
-            bgcolor='white' if self.page.theme_mode == 'light' else 'black',
             padding=0
         )
-        self.page.add(text_1, pull, button_container)
-        self.page.update()
+        for container, border_width in ((text_1, 0), (pull, 1), (button_container, 0)):
+            if border_width:
+                self.themed(container, 'border', ft.border.all(1, 'black'), ft.border.all(1, "WHITE"))
+            else:
+                self.themed(container, 'border', ft.border.all(0, 'white'), ft.border.all(0, "black"))
+            self.themed(container, 'bgcolor', 'white', 'black')
+        return ft.Column([text_1, pull, button_container])
+
+    def open_system_file(self, e: ft.FilePickerResultEvent):
+        """
+        Загружает систему из выбранного файла и сразу передает ее решателю, не создавая полей ввода.
+
+        Для матрицы .mtx вторым файлом выбирается столбец свободных членов.
+
+        Параметры:
+        - e: событие выбора файлов
+        """
+        if not e.files:
+            return
+        paths = sorted((file.path for file in e.files), key=lambda path: not path.lower().endswith('.mtx'))
+        try:
+            A, b = LoadFiles().load_system(paths[0], paths[1] if len(paths) > 1 else None)
+        except (OSError, ValueError):
+            InvalidInputError(self.page).show_error_alert(
+                self.text('messages', 'invalid_file'))
+            return
+        solution_page = SolutionPage(self.page, len(b), None)
+        if isinstance(A, CSRMatrix):
+            # Разреженную матрицу решаем без перевода в плотную
+            solution_page.method = 'auto'
+        solution_page.start_solve(A, b, None)
 
 
 class SettingsManager(MainWindow):
@@ -209,35 +379,39 @@ class SettingsManager(MainWindow):
         """
         Отображает страницу настроек.
         """
+        self.show_view('settings', self.create_settings_page)
+
+    def create_settings_page(self):
+        """
+        Создает страницу настроек.
 
-        self.page.controls.clear()
+        Возвращает:
+        - ft.Column
+        """
+
+        def option(key):
+            return self.translated(ft.dropdown.Option(self.text('labels', key)), 'key', 'labels', key)
 
         language_dropdown = ft.Dropdown(
             options=[
                 ft.dropdown.Option('Русский'),
                 ft.dropdown.Option('English')
             ],
-            hint_text=self.page.translations['labels']['language'][self.current_language],
             on_change=lambda e: self.change_language(language_dropdown.value)
         )
+        self.translated(language_dropdown, 'hint_text', 'labels', 'language')
 
         full_screen_dropdown = ft.Dropdown(
-            options=[
-                ft.dropdown.Option(self.page.translations['labels']['yes'][self.current_language]),
-                ft.dropdown.Option(self.page.translations['labels']['no'][self.current_language])
-            ],
-            hint_text=self.page.translations['labels']['fullscreen_mode'][self.current_language],
+            options=[option('yes'), option('no')],
             on_change=lambda e: self.change_full_screen_mode(full_screen_dropdown.value)
         )
+        self.translated(full_screen_dropdown, 'hint_text', 'labels', 'fullscreen_mode')
 
         theme_dropdown = ft.Dropdown(
-            options=[
-                ft.dropdown.Option(self.page.translations['labels']['light'][self.current_language]),
-                ft.dropdown.Option(self.page.translations['labels']['dark'][self.current_language])
-            ],
-            hint_text=self.page.translations['labels']['choose_theme'][self.current_language],
+            options=[option('light'), option('dark')],
             on_change=lambda e: self.change_theme(theme_dropdown.value)
         )
+        self.translated(theme_dropdown, 'hint_text', 'labels', 'choose_theme')
 
         rounding_dropdown = ft.Dropdown(
             options=[
@@ -247,37 +421,39 @@ class SettingsManager(MainWindow):
                 ft.dropdown.Option('4'),
                 ft.dropdown.Option('5')
             ],
-            hint_text=self.page.translations['labels']['round_to'][self.current_language],
             on_change=lambda e: self.change_rounding(rounding_dropdown.value)
         )
+        self.translated(rounding_dropdown, 'hint_text', 'labels', 'round_to')
 
         method_dropdown = ft.Dropdown(
             options=[
-                ft.dropdown.Option(self.page.translations['labels']['gauss'][self.current_language]),
-                ft.dropdown.Option('LU')
+                option('auto'),
+                option('gauss'),
+                ft.dropdown.Option('LU'),
+                option('mixed_precision'),
+                option('cholesky'),
+                ft.dropdown.Option('LDLT'),
+                option('sparse_lu'),
+                ft.dropdown.Option('CG'),
+                ft.dropdown.Option('BiCGSTAB'),
+                ft.dropdown.Option('GMRES')
             ],
-            hint_text=self.page.translations['labels']['choose_solution_method'][self.current_language],
             on_change=lambda e: self.change_method(method_dropdown.value)
         )
+        self.translated(method_dropdown, 'hint_text', 'labels', 'choose_solution_method')
 
-        back_button = CustomButton(self.page.translations['buttons']['back'][self.current_language],
-                                   lambda e: self.main_window_page(), self.page)
-
-        self.create_top_panel()
+        back_button = self.custom_button('back', lambda e: self.main_window_page())
 
-        self.page.add(ft.Text('\n\n\n\n\n\n\n\n\n\n\n'))
-
-        self.page.add(ft.Column([ft.Row([theme_dropdown, full_screen_dropdown],
-                                        alignment=ft.MainAxisAlignment.CENTER),
-                                 ft.Row([rounding_dropdown, method_dropdown],
-                                        alignment=ft.MainAxisAlignment.CENTER),
-                                 ft.Row([language_dropdown],
-                                        alignment=ft.MainAxisAlignment.CENTER),
-                                 ft.Row([back_button],
-                                        alignment=ft.MainAxisAlignment.CENTER)],
-                                alignment=ft.MainAxisAlignment.CENTER))
-
-        self.page.update()
+        return ft.Column([ft.Text('\n\n\n\n\n\n\n\n\n\n\n'),
+                          ft.Column([ft.Row([theme_dropdown, full_screen_dropdown],
+                                            alignment=ft.MainAxisAlignment.CENTER),
+                                     ft.Row([rounding_dropdown, method_dropdown],
+                                            alignment=ft.MainAxisAlignment.CENTER),
+                                     ft.Row([language_dropdown],
+                                            alignment=ft.MainAxisAlignment.CENTER),
+                                     ft.Row([back_button],
+                                            alignment=ft.MainAxisAlignment.CENTER)],
+                                    alignment=ft.MainAxisAlignment.CENTER)])
 
     def change_full_screen_mode(self, mode: str):
         """
@@ -313,7 +489,7 @@ class SettingsManager(MainWindow):
             MainWindow.theme_mode = 'light'
         else:
             MainWindow.theme_mode = 'dark'
-        self.show_settings_page()
+        self.apply_settings()
 
     def change_rounding(self, rounding: str):
         """
@@ -330,10 +506,20 @@ class SettingsManager(MainWindow):
         Изменяет метод решения системы уравнений.
 
         Параметры:
-        - method: метод решения (Гаусса/LU).
+        - method: метод решения (автоматический выбор/Гаусса/LU/LU в смешанной точности/Холецкого/LDLT/разреженное LU/CG/BiCGSTAB/GMRES).
         """
-        if method in self.page.translations['labels']['gauss']:
+        if method in self.page.translations['labels']['auto'].values():
+            MainWindow.method = 'auto'
+        elif method in self.page.translations['labels']['gauss'].values():
             MainWindow.method = 'Gauss'
+        elif method in self.page.translations['labels']['mixed_precision'].values():
+            MainWindow.method = 'mixed'
+        elif method in self.page.translations['labels']['cholesky'].values():
+            MainWindow.method = 'cholesky'
+        elif method in self.page.translations['labels']['sparse_lu'].values():
+            MainWindow.method = 'sparse'
+        elif method in ('LDLT', 'CG', 'BiCGSTAB', 'GMRES'):
+            MainWindow.method = method.lower()
         else:
             MainWindow.method = 'lu'
 
@@ -351,7 +537,7 @@ class SettingsManager(MainWindow):
         else:
             print("Translation not found for selected language.")
 
-        self.show_settings_page()
+        self.apply_settings()
 
 
 class Error(Exception):
@@ -367,7 +553,7 @@ class InvalidInputError(MainWindow, Error):
 
     def show_error_alert(self, message):
         alert_dialog = ft.AlertDialog(
-            title=ft.Text(self.page.translations['messages']['error'][self.current_language]),
+            title=ft.Text(self.text('messages', 'error')),
             content=ft.Text(message),
             actions=[ft.TextButton("OK", on_click=lambda e: self.close_dialog(self.page))],
             actions_alignment=ft.MainAxisAlignment.END,
@@ -392,84 +578,339 @@ class InvalidInputError(MainWindow, Error):
         page.update()
 
 
+class VirtualMatrixGrid:
+    """
+    Виртуализированная таблица для ввода расширенной матрицы [A | b].
+
+    Поля ввода создаются только для видимого окна visible_rows x visible_columns
+    и переиспользуются при прокрутке: меняются только их значения и то, какой
+    ячейке MatrixEntries они соответствуют. Поэтому количество элементов
+    интерфейса не зависит от размера матрицы.
+
+    Атрибуты:
+    - page: объект страницы.
+    - entries: MatrixEntries с введенными значениями.
+    - on_change: функция on_change(i, j, text), вызываемая после изменения ячейки (необязательно).
+    - row_offset, column_offset: номер первой видимой строки и первого видимого столбца.
+    """
+    visible_rows = 8
+    visible_columns = 8
+
+    def __init__(self, page, entries, on_change=None):
+        self.page = page
+        self.entries = entries
+        self.on_change = on_change
+        self.row_offset = 0
+        self.column_offset = 0
+        n_rows, n_columns = entries.shape
+        self.rows = min(self.visible_rows, n_rows)
+        self.columns = min(self.visible_columns, n_columns)
+        # Небольшие матрицы отображаются крупно, как раньше
+        large = n_columns <= 6
+        self.fields = [[ft.TextField(value="",
+                                     hint_text="0",
+                                     text_align=ft.TextAlign.CENTER,
+                                     width=200 if large else 110,
+                                     text_size=50 if large else 18,
+                                     on_change=lambda e, r=r, c=c: self.change_cell(r, c, e.control.value))
+                        for c in range(self.columns)]
+                       for r in range(self.rows)]
+        label_width = 200 if large else 110
+        self.column_labels = [ft.Text("", width=label_width, text_align=ft.TextAlign.CENTER)
+                              for _ in range(self.columns)]
+        self.row_labels = [ft.Text("", width=50) for _ in range(self.rows)]
+        # Цвета привязаны к теме и меняются на месте при ее смене
+        text_color = lambda theme, language: 'black' if theme == 'light' else 'yellow'
+        hint_style = lambda theme, language: ft.TextStyle(color='grey' if theme == 'light' else 'green')
+        for field in (field for row in self.fields for field in row):
+            page.view_cache.bind(field, 'color', text_color)
+            page.view_cache.bind(field, 'hint_style', hint_style)
+        for label in self.column_labels + self.row_labels:
+            page.view_cache.bind(label, 'color', text_color)
+        self.row_slider = None
+        self.column_slider = None
+        if n_rows > self.rows:
+            self.row_slider = ft.Slider(min=0, max=n_rows - self.rows, divisions=n_rows - self.rows, value=0,
+                                        on_change=lambda e: self.scroll_to(int(e.control.value), self.column_offset))
+        if n_columns > self.columns:
+            self.column_slider = ft.Slider(min=0, max=n_columns - self.columns, divisions=n_columns - self.columns,
+                                           value=0, width=600,
+                                           on_change=lambda e: self.scroll_to(self.row_offset, int(e.control.value)))
+        self.refresh(update=False)
+
+    def change_cell(self, r, c, text):
+        """Записывает значение видимого поля r, c в соответствующую ячейку матрицы."""
+        i, j = self.row_offset + r, self.column_offset + c
+        valid = self.entries.set_text(i, j, text)
+        field = self.fields[r][c]
+        border_color = 'red' if not valid and text else None
+        if field.border_color != border_color:
+            field.border_color = border_color
+            field.update()
+        if self.on_change is not None:
+            self.on_change(i, j, text)
+
+    def scroll_to(self, row_offset, column_offset):
+        """
+        Прокручивает таблицу так, чтобы первой видимой была ячейка row_offset, column_offset.
+
+        Параметры:
+        - row_offset: номер первой видимой строки
+        - column_offset: номер первого видимого столбца
+        """
+        n_rows, n_columns = self.entries.shape
+        self.row_offset = max(0, min(row_offset, n_rows - self.rows))
+        self.column_offset = max(0, min(column_offset, n_columns - self.columns))
+        self.refresh()
+
+    def refresh(self, update=True):
+        """Переносит значения видимого окна матрицы в поля ввода."""
+        size = self.entries.size
+        for c, label in enumerate(self.column_labels):
+            j = self.column_offset + c
+            label.value = "b" if j == size else f"x{j + 1}"
+        for r, label in enumerate(self.row_labels):
+            label.value = str(self.row_offset + r + 1)
+            for c, field in enumerate(self.fields[r]):
+                cell = (self.row_offset + r, self.column_offset + c)
+                field.value = self.entries.text(*cell)
+                field.border_color = 'red' if cell in self.entries.invalid_texts else None
+        if update:
+            self.page.update()
+
+    def control(self):
+        """
+        Собирает элементы таблицы для добавления на страницу.
+
+        Возвращает:
+        - ft.Column
+        """
+        grid = [ft.Row([ft.Text("", width=50)] + self.column_labels, alignment=ft.MainAxisAlignment.CENTER)]
+        grid += [ft.Row([label] + fields, alignment=ft.MainAxisAlignment.CENTER)
+                 for label, fields in zip(self.row_labels, self.fields)]
+        body = ft.Column(grid)
+        if self.row_slider is not None:
+            # Вертикальный ползунок: верхнее положение соответствует первой строке
+            body = ft.Row([body, ft.Container(self.row_slider, rotate=ft.Rotate(1.5708), width=60)],
+                          alignment=ft.MainAxisAlignment.CENTER)
+        controls = [body]
+        if self.column_slider is not None:
+            controls.append(ft.Row([self.column_slider], alignment=ft.MainAxisAlignment.CENTER))
+        return ft.Column(controls, horizontal_alignment=ft.CrossAxisAlignment.CENTER)
+
+
 class CreateMatrixInputPage(MainWindow):
     """
-    Эта функция очищает введенные значения матрицы.
+    Класс страницы ввода матрицы.
 
-    Параметры:
-    - entries: список полей для ввода значений матрицы.
+    Атрибуты:
+    - size: размерность системы уравнений.
+    - max_size: наибольшая размерность, которую можно ввести вручную.
     """
+    max_size = 500
+
     def __init__(self, page, size):
         super().__init__(page)
         self.size = size
+        self.grid = None
 
     def clear_matrix(self, entries):
         """
         Эта функция очищает введенные значения матрицы.
          Она принимает один параметр:
-        - entries (список полей для ввода значений матрицы).
+        - entries (MatrixEntries с введенными значениями).
         """
-        for row in entries:
-            for entry in row:
-                entry.value = ""
-        self.page.update()
+        entries.clear()
+        self.grid.refresh()
+        self.update_live_solver(entries)
+
+    def update_live_solver(self, entries):
+        """
+        Передает все значения матрицы в LiveSolver после изменения многих ячеек сразу
+        (вставка, очистка); вне режима на лету ничего не делает.
+
+        Параметры:
+        - entries: MatrixEntries с введенными значениями
+        """
+        if MainWindow.live_mode and self.page.live_solver is not None:
+            self.page.live_solver.set_values(entries.values, entries.filled)
 
     def create_entries(self, size):
-        return [[ft.TextField(value="",
-                              hint_text="0",
-                              hint_style=ft.TextStyle(color='grey' if self.page.theme_mode == 'light' else 'green'),
-                              color='black' if self.page.theme_mode == 'light' else 'yellow',
-                              text_align=ft.TextAlign.CENTER,
-                              width=200,
-                              text_size=50)
-                 for _ in range(int(size) + 1)]
-                for _ in range(int(size))]
+        """
+        Создает хранилище значений матрицы (поля ввода создает VirtualMatrixGrid).
+
+        Параметры:
+        - size: размерность системы уравнений
+
+        Возвращает:
+        - MatrixEntries
+        """
+        return MatrixEntries(size)
 
     def create_matrix_input_page(self, entries):
+        """
+        Показывает страницу для ввода значений матрицы.
+
+        Страница кэшируется для последней введенной матрицы: при возврате к тем же
+        entries поля ввода не создаются заново, а только получают текущие значения.
+
+        Параметры:
+        - entries: MatrixEntries с введенными значениями
+        """
+        view = self.views.get('input')
+        if view is not None and view.data.entries is not entries:
+            self.close_live_solver()
+            self.drop_view('input')
+
+        def refresh(view):
+            self.grid = view.data
+            self.grid.refresh(update=False)
+
+        self.show_view('input', lambda: self.create_input_view(entries), refresh)
+
+    def close_live_solver(self):
+        """Останавливает LiveSolver страницы ввода: его таймер, фоновый поток и вывод результатов."""
+        if self.page.live_solver is not None:
+            self.page.live_solver.close()
+            self.page.live_solver = None
+
+    def create_input_view(self, entries):
         """
         Создает страницу для ввода значений матрицы.
 
         Параметры:
-        - page: объект страницы, на которой будет создан ввод
-        - size: размер квадратной матрицы
-        - entries: список полей для ввода значений матрицы
-        """
-        self.page.controls.clear()
-        save_button = CustomButton(self.page.translations['buttons']['confirm'][self.current_language],
-                                   lambda e: SolutionPage(self.page,
-                                                          self.size,
-                                                          entries
-                                                          ).
-                                   show_create_matrix_page(entries), self.page)
-        back_button = CustomButton(self.page.translations['buttons']['back'][self.current_language],
-                                   lambda e: MainWindow.main_window_page(self), self.page)
-        clear_button = CustomButton(self.page.translations['buttons']['clear'][self.current_language],
-                                    lambda e: self.clear_matrix(entries), self.page)
-
-        MainWindow.create_top_panel(self)
-
-        self.page.add(ft.Row([ft.Text(self.page.translations['menu']['final_solve'][self.current_language],
-                                      size=30,
-                                      color='black' if self.page.theme_mode == 'light' else 'purple')],
-                             alignment=ft.MainAxisAlignment.CENTER))
-        for row in entries:
-            self.page.add(ft.Row(row, alignment=ft.MainAxisAlignment.CENTER))  # Выравнивание по центру
+        - entries: MatrixEntries с введенными значениями
+
+        Возвращает:
+        - ft.Column (в data хранится VirtualMatrixGrid)
+        """
+        self.grid = VirtualMatrixGrid(self.page, entries)
+        save_button = self.custom_button('confirm',
+                                         lambda e: SolutionPage(self.page,
+                                                                self.size,
+                                                                entries
+                                                                ).
+                                         show_create_matrix_page(entries))
+        back_button = self.custom_button('back', lambda e: MainWindow.main_window_page(self))
+        clear_button = self.custom_button('clear', lambda e: self.clear_matrix(entries))
+        paste_button = self.custom_button('paste', lambda e: self.show_paste_dialog(entries))
+
+        title = self.translated(ft.Text(size=30), 'value', 'menu', 'final_solve')
+        self.themed(title, 'color', 'black', 'purple')
+        controls = [ft.Row([title], alignment=ft.MainAxisAlignment.CENTER),
+                    ft.Row([self.grid.control()], alignment=ft.MainAxisAlignment.CENTER)]
+        controls += self.add_live_solution(entries)
         save_button.enabled = False  # Блокируем кнопку "Сохранить" при открытии страницы
-        self.page.add(ft.Row([back_button, clear_button, save_button],
-                             alignment=ft.MainAxisAlignment.CENTER))  # Выравнивание кнопки по центру
+        controls.append(ft.Row([back_button, clear_button, paste_button, save_button],
+                               alignment=ft.MainAxisAlignment.CENTER))  # Выравнивание кнопки по центру
+        return ft.Column(controls, data=self.grid)
+
+    def show_paste_dialog(self, entries):
+        """
+        Показывает окно для вставки блока значений из буфера обмена.
+
+        Расширенная матрица n x (n + 1) с 2 <= n <= max_size заменяет всю матрицу
+        (при другом n страница создается заново), остальные блоки вставляются
+        с левой верхней видимой ячейки. Текст разбирается один раз, страница
+        обновляется один раз, в режиме на лету значения передаются в LiveSolver.
+
+        Параметры:
+        - entries: MatrixEntries с введенными значениями
+        """
+        text_field = ft.TextField(multiline=True, min_lines=8, max_lines=16, width=600,
+                                  hint_text=self.text('messages', 'paste_hint'))
+
+        def apply_paste(e):
+            self.page.dialog.open = False
+            values, invalid_texts = parse_matrix_text(text_field.value or "")
+            size = values.shape[0]
+            if MatrixEntries.is_system_shape(values.shape) and 2 <= size <= self.max_size and size != entries.size:
+                pasted = MatrixEntries.from_values(values, invalid_texts)
+                CreateMatrixInputPage(self.page, size).create_matrix_input_page(pasted)
+                invalid = pasted.invalid_cells()
+            else:
+                if values.shape == entries.shape:
+                    invalid = entries.paste_values(values, invalid_texts)
+                else:
+                    invalid = entries.paste_values(values, invalid_texts,
+                                                   self.grid.row_offset, self.grid.column_offset)
+                self.grid.refresh()
+                self.update_live_solver(entries)
+            if invalid:
+                InvalidInputError(self.page).show_error_alert(self.invalid_cells_message(sorted(invalid)))
+
+        self.page.dialog = ft.AlertDialog(
+            title=ft.Text(self.text('buttons', 'paste')),
+            content=text_field,
+            actions=[ft.TextButton("OK", on_click=apply_paste),
+                     ft.TextButton(self.text('buttons', 'cancel'),
+                                   on_click=lambda e: InvalidInputError.close_dialog(self, self.page))],
+            actions_alignment=ft.MainAxisAlignment.END,
+        )
+        self.page.dialog.open = True
         self.page.update()
 
+    def add_live_solution(self, entries):
+        """
+        Создает переключатель режима решения на лету и строку с текущим решением.
+
+        В режиме на лету изменение ячейки обновляет только ее значение в LiveSolver,
+        решение выполняется в фоне, и обновляется только текст решения, без перестроения страницы.
+
+        Параметры:
+        - entries: MatrixEntries с введенными значениями
+
+        Возвращает:
+        - список строк (ft.Row) для страницы ввода
+        """
+        solution_text = self.themed(ft.Text("", size=25), 'color', 'black', 'purple')
+
+        def show_result(result):
+            solution_text.value = ", ".join(f"x{i + 1} = {round(value, self.rounding)}"
+                                            for i, value in enumerate(result.x))
+            self.page.update()
+
+        def show_error(error):
+            solution_text.value = self.text('messages', getattr(error, 'message_key', 'error'))
+            self.page.update()
+
+        # Страница ввода строится заново: прежний LiveSolver больше не нужен
+        self.close_live_solver()
+        # Метод читается при каждом решении: смена метода в настройках сразу действует и на лету
+        live_solver = LiveSolver(entries.size, show_result, show_error, lambda: MainWindow.method)
+        self.page.live_solver = live_solver
+
+        def on_change(i, j, text):
+            if MainWindow.live_mode:
+                live_solver.set_cell(i, j, text)
+
+        self.grid.on_change = on_change
+
+        def toggle_live_mode(e):
+            MainWindow.live_mode = e.control.value
+            solution_text.value = ""
+            if MainWindow.live_mode:
+                live_solver.set_values(entries.values, entries.filled)
+            self.page.update()
+
+        live_switch = ft.Switch(value=MainWindow.live_mode, on_change=toggle_live_mode)
+        self.translated(live_switch, 'label', 'labels', 'live_mode')
+        if MainWindow.live_mode:
+            live_solver.set_values(entries.values, entries.filled)
+        return [ft.Row([live_switch], alignment=ft.MainAxisAlignment.CENTER),
+                ft.Row([solution_text], alignment=ft.MainAxisAlignment.CENTER)]
+
     def validate_and_create_matrix_input_page(self, size_value):
         try:
             size = int(size_value)
-            if (2 <= size <= 5) == 0:
+            if not 2 <= size <= self.max_size:
                 InvalidInputError(self.page).show_error_alert(
-                    self.page.translations['messages']['matrix_size'][self.current_language])
+                    self.text('messages', 'matrix_size'))
             else:
                 self.create_matrix_input_page(self.create_entries(size))
         except ValueError:
             InvalidInputError(self.page).show_error_alert(
-                self.page.translations['messages']['matrix_size'][self.current_language])
+                self.text('messages', 'matrix_size'))
 
 
 class SolutionPage(MainWindow):
@@ -480,7 +921,10 @@ class SolutionPage(MainWindow):
        - page: объект страницы, на которой отображается решение.
        - size: размерность системы уравнений.
        - entries: введенные пользователем значения.
+       - progress_interval: наименьший промежуток между обновлениями индикатора хода решения, в секундах.
     """
+    progress_interval = 0.1
+
     def __init__(self, page, size, entries):
         """
         Инициализация страницы с решением системы уравнений.
@@ -504,14 +948,165 @@ class SolutionPage(MainWindow):
         Возвращает:
         - bool: True, если ввод корректен, False в противном случае.
         """
-        for row in entries:
-            for entry in row:
-                cleaned_value = entry.value.replace(',', '.')
-                try:
-                    float(cleaned_value)
-                except ValueError:
-                    return False
-        return True
+        return entries.is_valid()
+
+    def solve_updated(self, solver, coefficients_matrix, constants_vector, progress=None):
+        """
+        Решает систему методом LU, применяя к разложению прошлой матрицы только изменения
+        отредактированных строк или столбцов (O(n^2) вместо нового разложения за O(n^3)).
+
+        Параметры:
+        - solver: объект EquationSolver
+        - coefficients_matrix: матрица коэффициентов
+        - constants_vector: столбец свободных членов
+        - progress: функция progress(column, n) для разложения (необязательно)
+
+        Возвращает:
+        - X: массив (решение системы уравнений)
+        """
+        try:
+            if self.page.factorization is None or self.page.factorization.size != len(coefficients_matrix):
+                self.page.factorization = solver.factorize_updatable(coefficients_matrix, progress=progress)
+            else:
+                self.page.factorization.update_matrix(coefficients_matrix, progress)
+            return self.page.factorization.solve(constants_vector, progress)
+        except SolverError:
+            # Разложение могло остаться несогласованным с матрицей - в следующий раз строим заново
+            self.page.factorization = None
+            raise
+
+    def solve(self, coefficients_matrix, constants_vector, progress):
+        """
+        Решает систему выбранным методом (выполняется в фоновом потоке).
+
+        Параметры:
+        - coefficients_matrix: матрица коэффициентов
+        - constants_vector: столбец свободных членов
+        - progress: функция progress(column, n) для отображения хода исключения
+
+        Возвращает:
+        - X: массив (решение системы уравнений)
+        - method: метод, которым решена система
+        - solve_time: время решения в секундах
+        """
+        solver = EquationSolver()
+        start = time.perf_counter()
+        if self.method == 'lu':
+            X = self.solve_updated(solver, coefficients_matrix, constants_vector, progress)
+            return X, 'lu', time.perf_counter() - start
+        result = solver.solve(coefficients_matrix, constants_vector, self.method, progress)
+        return result.x, result.method, time.perf_counter() - start
+
+    def show_input_page(self, entries):
+        """
+        Возвращает к вводу матрицы; для системы, загруженной из файла (entries равно None), - на главную страницу.
+
+        Параметры:
+        - entries: введенные пользователем значения или None
+        """
+        if entries is None:
+            MainWindow.main_window_page(self)
+        else:
+            CreateMatrixInputPage(self.page, self.size).create_matrix_input_page(entries)
+
+    def start_solve(self, coefficients_matrix, constants_vector, entries):
+        """
+        Запускает решение в фоновом потоке и показывает индикатор хода решения с кнопкой отмены.
+
+        Решение прерывается на ближайшей панели исключения, если пользователь нажал
+        отмену или запросил новое решение; результат такого решения не отображается.
+
+        Параметры:
+        - coefficients_matrix: матрица коэффициентов
+        - constants_vector: столбец свободных членов
+        - entries: введенные пользователем значения (None для системы из файла)
+        """
+        self.page.solve_generation += 1
+        generation = self.page.solve_generation
+        cancelled = threading.Event()
+
+        def is_current():
+            return not cancelled.is_set() and generation == self.page.solve_generation
+
+        def cancel(e):
+            cancelled.set()
+            self.show_input_page(entries)
+
+        def refresh(view):
+            progress_bar, cancel_button = view.data
+            progress_bar.value = 0
+            cancel_button.on_click = cancel
+
+        view = self.show_view('solving', self.create_solving_page, refresh)
+        progress_bar = view.data[0]
+
+        last_update = [0.0, -1]
+
+        def progress(column, n):
+            if not is_current():
+                raise SolveCancelledError()
+            # Итерационные методы вызывают progress на каждой итерации: клиенту отправляем
+            # не больше одного обновления за progress_interval секунд и только при смене
+            # целого процента, а завершение - всегда
+            percent = 100 * column // n
+            now = time.monotonic()
+            if column < n and (percent == last_update[1] or now - last_update[0] < self.progress_interval):
+                return
+            last_update[:] = [now, percent]
+            progress_bar.value = column / n
+            self.page.update()
+
+        future = self.page.solve_executor.submit(self.solve, coefficients_matrix, constants_vector, progress)
+        future.add_done_callback(lambda future: self.finish_solve(future, is_current, entries,
+                                                                  coefficients_matrix, constants_vector))
+
+    def create_solving_page(self):
+        """
+        Создает страницу с индикатором хода решения и кнопкой отмены.
+
+        Возвращает:
+        - ft.Column (в data хранятся индикатор и кнопка отмены)
+        """
+        progress_bar = ft.ProgressBar(width=400, value=0)
+        cancel_button = self.custom_button('cancel', None)
+        title = self.translated(ft.Text(size=35), 'value', 'labels', 'solving')
+        self.themed(title, 'color', 'black', 'purple')
+        return ft.Column([
+            ft.Row([title], alignment=ft.MainAxisAlignment.CENTER),
+            ft.Row([progress_bar], alignment=ft.MainAxisAlignment.CENTER),
+            ft.Row([cancel_button], alignment=ft.MainAxisAlignment.CENTER)],
+            alignment=ft.MainAxisAlignment.CENTER,
+            data=(progress_bar, cancel_button))
+
+    def finish_solve(self, future, is_current, entries, coefficients_matrix, constants_vector):
+        """
+        Показывает результат фонового решения, если оно не было отменено или заменено новым,
+        и сохраняет его в историю.
+
+        Параметры:
+        - future: Future с решением
+        - is_current: функция, возвращающая True, если решение все еще актуально
+        - entries: введенные пользователем значения
+        - coefficients_matrix: матрица коэффициентов
+        - constants_vector: столбец свободных членов
+        """
+        if not is_current():
+            return
+        try:
+            X, method, solve_time = future.result()
+        except SolveCancelledError:
+            return
+        except SolverError as error:
+            # Решатель не зависит от интерфейса: перевод ошибки в сообщение выполняется здесь
+            self.show_input_page(entries)
+            InvalidInputError(self.page).show_error_alert(
+                self.text('messages', error.message_key))
+            return
+        print(f"{self.text('menu', 'final_solve')}:", X)
+        # В историю решение попадает в полной точности, округляется только отображаемое
+        self.history.add(coefficients_matrix, constants_vector, X, method, solve_time)
+        X = [round(value, self.rounding) for value in X]
+        self.show_solution_page(X, entries)
 
     def show_create_matrix_page(self, entries):
         """
@@ -520,62 +1115,29 @@ class SolutionPage(MainWindow):
         Параметры:
         - entries: введенные пользователем значения.
         """
-        self.page.controls.clear()
         if self.is_valid_input(entries):
-            coefficients_matrix = []
-            constants_vector = []
-            for row in entries:
-                row_coefficients = []
-                for entry in row[:-1]:
-                    # Заменяем запятую на точку, если она есть
-                    value = entry.value.replace(',', '.')
-                    row_coefficients.append(float(value))
-                coefficients_matrix.append(row_coefficients)
-                # Также обрабатываем значение вектора констант
-                value = row[-1].value.replace(',', '.')
-                constants_vector.append(float(value))
-            print(f"{self.page.translations['menu']['coefficients_matrix'][self.current_language]}:",
+            # Значения уже разобраны при вводе и хранятся в числовом массиве
+            coefficients_matrix = entries.A
+            constants_vector = entries.b
+            print(f"{self.text('menu', 'coefficients_matrix')}:",
                   coefficients_matrix)
-            print(f"{self.page.translations['menu']['constants_vector'][self.current_language]}:", constants_vector)
-            solver = EquationSolver(self.page, self.size, self.current_language, entries)
-            X = None
-            if self.method == 'Gauss':
-                A, B = solver.the_triangular_matrix(coefficients_matrix, constants_vector)
-                if A is not None:
-                    X = solver.backward_substitution(A, B)
-                else:
-                    CreateMatrixInputPage(self.page, self.size).create_matrix_input_page(entries)
-            else:
-                X = solver.solve_lu(coefficients_matrix, constants_vector)
-            print(f"{self.page.translations['menu']['final_solve'][self.current_language]}:", X)
-            for i in range(len(X)):
-                X[i] = round(X[i], self.rounding)
-            current_time = datetime.now()
-            time_executed = current_time.strftime('%H:%M')
-            self.solution_history.append((X, current_time))
-            print(self.solution_history)
-            self.show_solution_page(X, entries)
+            print(f"{self.text('menu', 'constants_vector')}:", constants_vector)
+            self.start_solve(coefficients_matrix, constants_vector, entries)
         else:
             CreateMatrixInputPage(self.page, self.size).create_matrix_input_page(entries)
-            InvalidInputError(self.page).show_error_alert(self.
-                                                          page.
-                                                          translations['messages']
-                                                          ['invalid_input']
-                                                          [self.current_language])
+            InvalidInputError(self.page).show_error_alert(self.invalid_cells_message(entries.invalid_cells()))
 
     def show_solution_page(self, solution, entries):
         """
         Отображает страницу с решением системы уравнений.
 
+        Страница строится один раз, при новом решении меняются только текст ответа
+        и действие кнопки "Назад".
+
         Параметры:
         - solution: решение системы уравнений.
         - entries: введенные пользователем значения.
         """
-
-        self.page.controls.clear()
-
-        MainWindow.create_top_panel(self)
-
         answer = ""
         for index, item in enumerate(solution, start=1):
             item_str = str(item)
@@ -584,27 +1146,32 @@ class SolutionPage(MainWindow):
             else:
                 answer += f"x{index} = {item_str}"
 
-        answer = ft.Text(answer,
-                         color='black' if self.page.theme_mode == 'light' else 'green',
-                         size=30)
+        def refresh(view):
+            answer_text, back_button = view.data
+            answer_text.value = answer
+            back_button.on_click = lambda e: self.show_input_page(entries)
 
-        back_button = CustomButton(self.page.translations['buttons']['back'][self.current_language],
-                                   lambda e: CreateMatrixInputPage(self.page, self.size).
-                                   create_matrix_input_page(entries),
-                                   self.page)
+        self.show_view('solution', self.create_solution_page, refresh)
 
-        exit_button = CustomButton(self.page.translations['buttons']['exit'][self.current_language],
-                                   lambda e: self.page.window_close(),
-                                   self.page)
+    def create_solution_page(self):
+        """
+        Создает страницу с решением системы уравнений.
 
-        restart_button = CustomButton(self.page.translations['buttons']['restart'][self.current_language],
-                                      lambda e: MainWindow.main_window_page(self),
-                                      self.page)
+        Возвращает:
+        - ft.Column (в data хранятся текст ответа и кнопка "Назад")
+        """
+        answer = self.themed(ft.Text("", size=30), 'color', 'black', 'green')
+
+        back_button = self.custom_button('back', None)
+
+        exit_button = self.custom_button('exit', lambda e: self.page.window_close())
 
-        self.page.add(ft.Column([
-            ft.Row([ft.Text(self.page.translations['labels']['solve_system'][self.current_language],
-                            color='black' if self.page.theme_mode == 'light' else 'purple',
-                            size=35)],
+        restart_button = self.custom_button('restart', lambda e: MainWindow.main_window_page(self))
+
+        title = self.translated(ft.Text(size=35), 'value', 'labels', 'solve_system')
+        self.themed(title, 'color', 'black', 'purple')
+        return ft.Column([
+            ft.Row([title],
                    alignment=ft.MainAxisAlignment.CENTER),
             ft.Row([answer],
                    alignment=ft.MainAxisAlignment.CENTER),
@@ -612,48 +1179,120 @@ class SolutionPage(MainWindow):
                    alignment=ft.MainAxisAlignment.CENTER),
             ft.Row([exit_button],
                    alignment=ft.MainAxisAlignment.CENTER)],
-            alignment=ft.MainAxisAlignment.CENTER))
-
-        self.page.update()
+            alignment=ft.MainAxisAlignment.CENTER,
+            data=(answer, back_button))
 
 
 class CreateHistoryPage(MainWindow):
+    """
+    Класс страницы истории решений.
+
+    История читается из HistoryStore постранично: на странице создается
+    history_page_size строк, которые при листании получают новые значения.
+
+    Атрибуты:
+    - page: объект страницы, на которой отображается история.
+    - shown_components: сколько компонент решения показывать в строке истории.
+    """
+    shown_components = 10
+
     def __init__(self, page):
         super().__init__(page)
 
     def show_history_page(self):
-        self.page.controls.clear()
-
-        MainWindow.create_top_panel(self)
-
-        for entry in self.solution_history:
-            X, time_executed = entry  # Разделение данных решения и времени выполнения
-            solve_text = ', '.join([f"x{i+1} = {el}" for i, el in enumerate(X)])
-
-            hist_cont = ft.Container(
-                alignment=ft.alignment.center,
-                margin=ft.margin.only(left=450),
-                content=ft.Row([ft.Icon(name=ft.icons.TIMER,
-                                        color='black' if self.page.theme_mode == 'light' else 'green',
-                                        size=55),
-                                ft.Text(f"{time_executed.strftime('%H:%M')}: \n{solve_text}",
-                                        color='black' if self.page.theme_mode == 'light' else 'green',
-                                        size=35)],
-                               alignment=ft.MainAxisAlignment.CENTER),
-                width=600,
-                border=ft.border.all(0, 'white' if self.page.theme_mode == 'light' else "black"),
-                border_radius=10,
-                bgcolor='white' if self.page.theme_mode == 'light' else 'black',
-                padding=0
-            )
-
-            self.page.add(ft.Text('\n'), hist_cont)
-
-        back_button = CustomButton(self.page.translations['buttons']['back'][self.current_language],
-                                   lambda e: MainWindow.main_window_page(self),
-                                   self.page)
-        self.page.add(ft.Row([back_button], alignment=ft.MainAxisAlignment.CENTER))
+        """
+        Отображает первую (самую новую) страницу истории решений.
+        """
+        self.show_view('history', self.create_history_page, lambda view: self.show_history_entries(view, 0))
+
+    def create_history_page(self):
+        """
+        Создает страницу истории решений.
+
+        Возвращает:
+        - ft.Column (в data хранятся строки истории, подпись и кнопки листания)
+        """
+        slots = [self.create_history_slot() for _ in range(self.history_page_size)]
+        page_label = ft.Text(size=25)
+        self.themed(page_label, 'color', 'black', 'green')
+        previous_button = ft.IconButton(icon=ft.icons.CHEVRON_LEFT, icon_size=39)
+        next_button = ft.IconButton(icon=ft.icons.CHEVRON_RIGHT, icon_size=39)
+        back_button = self.custom_button('back', lambda e: MainWindow.main_window_page(self))
+        view = ft.Column([slot for slot, _ in slots] +
+                         [ft.Row([previous_button, page_label, next_button], alignment=ft.MainAxisAlignment.CENTER),
+                          ft.Row([back_button], alignment=ft.MainAxisAlignment.CENTER)],
+                         data={'slots': slots, 'label': page_label, 'number': 0})
+        previous_button.on_click = lambda e: self.turn_history_page(view, -1)
+        next_button.on_click = lambda e: self.turn_history_page(view, 1)
+        return view
+
+    def create_history_slot(self):
+        """
+        Создает строку истории для одного решения.
+
+        Возвращает:
+        - (ft.Column строки, ft.Text с текстом записи)
+        """
+        entry_text = self.themed(ft.Text("", size=35), 'color', 'black', 'green')
+        hist_cont = ft.Container(
+            alignment=ft.alignment.center,
+            margin=ft.margin.only(left=450),
+            content=ft.Row([self.themed(ft.Icon(name=ft.icons.TIMER, size=55), 'color', 'black', 'green'),
+                            entry_text],
+                           alignment=ft.MainAxisAlignment.CENTER),
+            width=600,
+            border_radius=10,
+            padding=0
+        )
+        self.themed(hist_cont, 'border', ft.border.all(0, 'white'), ft.border.all(0, "black"))
+        self.themed(hist_cont, 'bgcolor', 'white', 'black')
+
+        return ft.Column([ft.Text('\n'), hist_cont], visible=False), entry_text
+
+    def history_entry_text(self, record):
+        """
+        Формирует текст строки истории: время, метод, время решения и округленное решение.
+
+        Параметры:
+        - record: HistoryRecord
 
+        Возвращает:
+        - str
+        """
+        shown = record.x[:self.shown_components]
+        solve_text = ', '.join([f"x{i+1} = {round(float(el), self.rounding)}" for i, el in enumerate(shown)])
+        if record.size > len(shown):
+            solve_text += f" ... (+{record.size - len(shown)})"
+        return (f"{record.created.strftime('%H:%M')} ({record.method}, {record.solve_time:.3f} s): "
+                f"\n{solve_text}")
+
+    def show_history_entries(self, view, number):
+        """
+        Заполняет строки страницы записями страницы истории number.
+
+        Параметры:
+        - view: элемент страницы истории
+        - number: номер страницы истории (с нуля, обрезается до допустимого)
+        """
+        page_count = self.history.page_count(self.history_page_size)
+        number = max(0, min(number, page_count - 1))
+        records = self.history.page(number, self.history_page_size)
+        for (slot, entry_text), record in zip(view.data['slots'], records + [None] * len(view.data['slots'])):
+            slot.visible = record is not None
+            if record is not None:
+                entry_text.value = self.history_entry_text(record)
+        view.data['number'] = number
+        view.data['label'].value = f"{number + 1} / {page_count}"
+
+    def turn_history_page(self, view, step):
+        """
+        Листает историю на step страниц (отрицательный step - к более новым записям).
+
+        Параметры:
+        - view: элемент страницы истории
+        - step: на сколько страниц перейти
+        """
+        self.show_history_entries(view, view.data['number'] + step)
         self.page.update()
 
 
@@ -671,28 +1310,24 @@ class CreateHelpPage(MainWindow):
         """
         Метод для отображения страницы справки.
         """
-        self.page.controls.clear()
-
-        back_button = CustomButton(self.page.translations['buttons']['back'][self.current_language],
-                                   lambda e: MainWindow.main_window_page(self),
-                                   self.page)
-
-        faq_1 = self.create_expansion_tile(self.page.translations['menu']['faq_1'][self.current_language],
-                                           self.page.translations['menu']['ans_1'][self.current_language]
-                                           )
-        faq_2 = self.create_expansion_tile(self.page.translations['menu']['faq_2'][self.current_language],
-                                           self.page.translations['menu']['ans_2'][self.current_language]
-                                           )
-        faq_3 = self.create_expansion_tile(self.page.translations['menu']['faq_3'][self.current_language],
-                                           self.page.translations['menu']['ans_3'][self.current_language]
-                                           )
-        faq_4 = self.create_expansion_tile(self.page.translations['menu']['faq_4'][self.current_language],
-                                           self.page.translations['menu']['ans_4'][self.current_language]
-                                           )
-        MainWindow.create_top_panel(self)
+        self.show_view('help', self.create_help_page)
+
+    def create_help_page(self):
+        """
+        Создает страницу справки.
+
+        Возвращает:
+        - ft.Column
+        """
+        back_button = self.custom_button('back', lambda e: MainWindow.main_window_page(self))
+
+        faq_1 = self.create_expansion_tile('faq_1', 'ans_1')
+        faq_2 = self.create_expansion_tile('faq_2', 'ans_2')
+        faq_3 = self.create_expansion_tile('faq_3', 'ans_3')
+        faq_4 = self.create_expansion_tile('faq_4', 'ans_4')
 
         text_container = ft.Container(
-            content=ft.Column([ft.Text(self.page.translations['menu']['FAQ_page_text'][self.current_language], size=35),
+            content=ft.Column([self.translated(ft.Text(size=35), 'value', 'menu', 'FAQ_page_text'),
                                ft.Text('\n'),
                                faq_1,
                                faq_2,
@@ -702,27 +1337,34 @@ class CreateHelpPage(MainWindow):
 
             width=self.page.window_width,
             border_radius=0,
-            bgcolor='white' if self.page.theme_mode == 'light' else 'black',
             padding=10,
             margin=ft.margin.only(left=175, top=25))
-        self.page.add(text_container)
+        self.themed(text_container, 'bgcolor', 'white', 'black')
 
-        self.page.add(ft.Row([back_button], alignment=ft.MainAxisAlignment.CENTER))
+        return ft.Column([text_container, ft.Row([back_button], alignment=ft.MainAxisAlignment.CENTER)])
 
-        self.page.update()
+    def create_expansion_tile(self, title_key, answer_key):
+        """
+        Создает раскрывающийся вопрос справки.
+
+        Параметры:
+        - title_key: ключ текста вопроса в разделе 'menu'
+        - answer_key: ключ текста ответа в разделе 'menu'
 
-    def create_expansion_tile(self, title, controls):
-        return (ft.ExpansionTile(
-            title=ft.Text(title, size=20),
+        Возвращает:
+        - ft.ExpansionTile
+        """
+        tile = ft.ExpansionTile(
+            title=self.translated(ft.Text(size=20), 'value', 'menu', title_key),
             width=1200,
             subtitle=ft.Text(),
             affinity=ft.TileAffinity.PLATFORM,
             maintain_state=False,
-            collapsed_text_color='black' if self.page.theme_mode == 'light' else 'yellow',
-            text_color='black' if self.page.theme_mode == 'light' else 'yellow',
-            controls=[ft.ListTile(title=ft.Text(controls, size=18))],
-        ))
-
+            controls=[ft.ListTile(title=self.translated(ft.Text(size=18), 'value', 'menu', answer_key))],
+        )
+        self.themed(tile, 'collapsed_text_color', 'black', 'yellow')
+        self.themed(tile, 'text_color', 'black', 'yellow')
+        return tile
 
 
 class KeyboardBindings(MainWindow):
@@ -791,17 +1433,31 @@ class CustomButton(ft.TextButton):
             width=width,
             height=height,
             on_click=on_click_action,
-            style=ft.ButtonStyle(
-                color={ft.MaterialState.DEFAULT: ft.colors.WHITE if page.theme_mode == 'light' else ft.colors.BLACK},
-                bgcolor={ft.MaterialState.HOVERED: ft.colors.GREEN if page.theme_mode == 'light' else ft.colors.GREEN,
-                         "": ft.colors.BLACK if page.theme_mode == 'light' else ft.colors.WHITE},
-                overlay_color=ft.colors.TRANSPARENT,
-                elevation={"pressed": 0, "": 1},
-                animation_duration=500,
-                shape={
-                    ft.MaterialState.HOVERED: ft.RoundedRectangleBorder(radius=20),
-                    ft.MaterialState.DEFAULT: ft.RoundedRectangleBorder(radius=4),
-                },
-            ),
         )
-        self.page = page
\ No newline at end of file
+        self.page = page
+        # Стиль зависит от темы и обновляется на месте при ее смене
+        page.view_cache.bind(self, 'style', lambda theme, language: CustomButton.button_style(theme))
+
+    @staticmethod
+    def button_style(theme):
+        """
+        Возвращает стиль кнопки для темы.
+
+        Параметры:
+        - theme: тема ('light' или 'dark')
+
+        Возвращает:
+        - ft.ButtonStyle
+        """
+        return ft.ButtonStyle(
+            color={ft.MaterialState.DEFAULT: ft.colors.WHITE if theme == 'light' else ft.colors.BLACK},
+            bgcolor={ft.MaterialState.HOVERED: ft.colors.GREEN,
+                     "": ft.colors.BLACK if theme == 'light' else ft.colors.WHITE},
+            overlay_color=ft.colors.TRANSPARENT,
+            elevation={"pressed": 0, "": 1},
+            animation_duration=500,
+            shape={
+                ft.MaterialState.HOVERED: ft.RoundedRectangleBorder(radius=20),
+                ft.MaterialState.DEFAULT: ft.RoundedRectangleBorder(radius=4),
+            },
+        )
\ No newline at end of file
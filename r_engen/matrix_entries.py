@@ -0,0 +1,228 @@
+import re
+
+import numpy as np
+
+
+def parse_matrix_text(text):
+    """
+    Разбирает блок текста с матрицей, скопированный из таблицы или набранный вручную.
+
+    Строки разделяются переводом строки, ячейки - табуляцией (формат буфера
+    обмена электронных таблиц), точкой с запятой или пробелами; если ничего из
+    этого нет, ячейки разделяются запятыми. Десятичным разделителем может быть
+    точка или запятая. Все ячейки преобразуются в числа одним вызовом numpy,
+    и только при ошибке ищутся некорректные ячейки.
+
+    Параметры:
+    - text: str, блок текста
+
+    Возвращает:
+    - values: двумерный массив (nan в некорректных ячейках)
+    - invalid: словарь {(строка, столбец): текст} некорректных ячеек
+    """
+    lines = [line for line in text.replace('\r', '').split('\n') if line.strip()]
+    if any('\t' in line for line in lines):
+        rows = [line.split('\t') for line in lines]
+    elif any(';' in line for line in lines):
+        rows = [line.split(';') for line in lines]
+    elif any(len(line.split()) > 1 for line in lines):
+        rows = [line.split() for line in lines]
+    else:
+        rows = [line.split(',') for line in lines]
+    width = max((len(row) for row in rows), default=0)
+    cells = np.array([[cell.strip().replace(',', '.') for cell in row] + [''] * (width - len(row)) for row in rows],
+                     dtype=str).reshape(len(rows), width)
+    try:
+        values = cells.astype(np.float64)
+        if np.isfinite(values).all():
+            return values, {}
+    except ValueError:
+        pass
+    values = np.full(cells.shape, np.nan)
+    invalid = {}
+    number = re.compile(r'^[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?$')
+    for (i, j), cell in np.ndenumerate(cells):
+        if number.match(cell):
+            values[i, j] = float(cell)
+        else:
+            invalid[(i, j)] = str(cell)
+    return values, invalid
+
+
+class MatrixEntries:
+    """
+    Класс с введенными значениями расширенной матрицы системы [A | b].
+
+    Значения хранятся в числовом массиве, а не в полях ввода: интерфейс
+    создает поля только для видимой части матрицы, поэтому память и время
+    отрисовки зависят от размера окна, а не от n^2. Текст хранится только
+    для ячеек, которые не удалось разобрать как число, чтобы показать его
+    пользователю без изменений.
+
+    Атрибуты:
+    - size: размерность системы уравнений n.
+    - values: массив n x (n + 1) (столбец n - свободные члены).
+    - filled: массив n x (n + 1), True для ячеек с корректным числом.
+    - invalid_texts: словарь {(строка, столбец): текст} для ячеек с некорректным вводом.
+    """
+    def __init__(self, size):
+        self.size = int(size)
+        self.values = np.zeros((self.size, self.size + 1))
+        self.filled = np.zeros((self.size, self.size + 1), dtype=bool)
+        self.invalid_texts = {}
+
+    @property
+    def shape(self):
+        """Размер расширенной матрицы (n, n + 1)."""
+        return self.values.shape
+
+    @property
+    def A(self):
+        """Матрица коэффициентов (копия)."""
+        return self.values[:, :self.size].copy()
+
+    @property
+    def b(self):
+        """Столбец свободных членов (копия)."""
+        return self.values[:, self.size].copy()
+
+    def set_text(self, i, j, text):
+        """
+        Сохраняет введенный в ячейку текст.
+
+        Параметры:
+        - i: номер строки
+        - j: номер столбца (столбец n - свободный член)
+        - text: введенное значение (допускается запятая вместо точки)
+
+        Возвращает:
+        - bool: True, если текст - корректное число
+        """
+        self.invalid_texts.pop((i, j), None)
+        try:
+            value = float(text.replace(',', '.'))
+            valid = bool(np.isfinite(value))
+        except ValueError:
+            value, valid = 0.0, False
+        self.values[i, j] = value if valid else 0.0
+        self.filled[i, j] = valid
+        if not valid and text:
+            self.invalid_texts[(i, j)] = text
+        return valid
+
+    def text(self, i, j):
+        """
+        Возвращает текст ячейки для отображения в поле ввода.
+
+        Параметры:
+        - i: номер строки
+        - j: номер столбца
+
+        Возвращает:
+        - str: число, введенный некорректный текст или пустая строка
+        """
+        if self.filled[i, j]:
+            # Кратчайшая запись, из которой число восстанавливается точно
+            text = repr(float(self.values[i, j]))
+            return text[:-2] if text.endswith('.0') else text
+        return self.invalid_texts.get((i, j), "")
+
+    def paste(self, text, row=0, column=0):
+        """
+        Заполняет ячейки блоком текста (см. parse_matrix_text), начиная с ячейки row, column.
+
+        Части блока, выходящие за границы матрицы, отбрасываются.
+
+        Параметры:
+        - text: str, блок текста
+        - row, column: левая верхняя ячейка блока
+
+        Возвращает:
+        - список (строка, столбец) ячеек матрицы, в которые попали некорректные значения
+        """
+        values, invalid = parse_matrix_text(text)
+        return self.paste_values(values, invalid, row, column)
+
+    def paste_values(self, values, invalid, row=0, column=0):
+        """
+        Заполняет ячейки уже разобранным блоком (результатом parse_matrix_text).
+
+        Части блока, выходящие за границы матрицы, отбрасываются.
+
+        Параметры:
+        - values: двумерный массив (nan в некорректных ячейках)
+        - invalid: словарь {(строка, столбец): текст} некорректных ячеек блока
+        - row, column: левая верхняя ячейка блока
+
+        Возвращает:
+        - список (строка, столбец) ячеек матрицы, в которые попали некорректные значения
+        """
+        n_rows = max(0, min(values.shape[0], self.shape[0] - row))
+        n_columns = max(0, min(values.shape[1], self.shape[1] - column))
+        values = values[:n_rows, :n_columns]
+        target = (slice(row, row + n_rows), slice(column, column + n_columns))
+        valid = ~np.isnan(values)
+        self.values[target] = np.where(valid, values, 0.0)
+        self.filled[target] = valid
+        self.invalid_texts = {cell: text for cell, text in self.invalid_texts.items()
+                              if not (row <= cell[0] < row + n_rows and column <= cell[1] < column + n_columns)}
+        pasted_invalid = [(row + i, column + j) for i, j in invalid if i < n_rows and j < n_columns]
+        for (i, j), text in invalid.items():
+            if i < n_rows and j < n_columns and text:
+                self.invalid_texts[(row + i, column + j)] = text
+        return pasted_invalid
+
+    @staticmethod
+    def is_system_shape(shape):
+        """Возвращает True, если блок формы shape - расширенная матрица [A | b] размера n x (n + 1)."""
+        return len(shape) == 2 and shape[0] >= 1 and shape[1] == shape[0] + 1
+
+    @classmethod
+    def from_text(cls, text):
+        """
+        Создает хранилище по вставленной расширенной матрице [A | b] размера n x (n + 1).
+
+        Параметры:
+        - text: str, блок текста
+
+        Возвращает:
+        - MatrixEntries или None, если блок не является расширенной матрицей квадратной системы
+        """
+        return cls.from_values(*parse_matrix_text(text))
+
+    @classmethod
+    def from_values(cls, values, invalid):
+        """
+        Создает хранилище по уже разобранной расширенной матрице (результату parse_matrix_text).
+
+        Параметры:
+        - values: двумерный массив n x (n + 1) (nan в некорректных ячейках)
+        - invalid: словарь {(строка, столбец): текст} некорректных ячеек
+
+        Возвращает:
+        - MatrixEntries или None, если блок не является расширенной матрицей квадратной системы
+        """
+        if not cls.is_system_shape(values.shape):
+            return None
+        entries = cls(values.shape[0])
+        entries.paste_values(values, invalid)
+        return entries
+
+    def invalid_cells(self):
+        """
+        Возвращает все незаполненные или некорректные ячейки за один проход.
+
+        Возвращает:
+        - список (строка, столбец)
+        """
+        return [tuple(cell) for cell in np.argwhere(~self.filled).tolist()]
+
+    def is_valid(self):
+        """Возвращает True, если все ячейки заполнены корректными числами."""
+        return bool(self.filled.all())
+
+    def clear(self):
+        """Очищает все ячейки."""
+        self.values[:] = 0.0
+        self.filled[:] = False
+        self.invalid_texts.clear()
@@ -0,0 +1,183 @@
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from r_engen.equation_solver import BandMatrix, EquationSolver, SolverError
+from r_engen.sparse_matrix import CSRMatrix
+
+
+def _solve_chunk(shm_name, layout):
+    """
+    Решает пакет систем в рабочем процессе.
+
+    Матрицы читаются прямо из общей памяти без копирования и сериализации.
+    Разложения из результатов не возвращаются: их пересылка стоила бы
+    копирования матрицы n x n на каждую систему.
+
+    Параметры:
+    - shm_name: имя блока общей памяти
+    - layout: список (смещение A, форма A, смещение b, форма b, метод, объект A или None)
+
+    Возвращает:
+    - список SolveResult, SolverError или ValueError (неизвестный метод, неверные
+      размеры) для каждой системы пакета: ошибка одной задачи не прерывает остальные
+    """
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        solver = EquationSolver()
+        results = []
+        for a_offset, a_shape, b_offset, b_shape, method, matrix in layout:
+            if matrix is None:
+                matrix = np.ndarray(a_shape, dtype=np.float64, buffer=shm.buf, offset=a_offset)
+            b = np.ndarray(b_shape, dtype=np.float64, buffer=shm.buf, offset=b_offset)
+            try:
+                result = solver.solve(matrix, b, method)
+                result.factorization = None
+                results.append(result)
+            except (SolverError, ValueError) as error:
+                results.append(error)
+            del matrix, b
+        return results
+    finally:
+        shm.close()
+
+
+class ParallelSolver:
+    """
+    Класс для решения большого количества независимых систем на пуле процессов.
+
+    Системы группируются в пакеты; матрицы пакета копируются в один блок
+    общей памяти, откуда рабочие процессы читают их напрямую. Одновременно
+    в работе и в ожидании выдачи по порядку находится не больше max_pending
+    пакетов, поэтому память не зависит от общего количества задач, даже если
+    один из первых пакетов решается долго.
+
+    Атрибуты:
+    - max_workers: количество рабочих процессов (по умолчанию - количество ядер).
+    - chunk_size: количество систем в одном пакете.
+    - max_pending: максимальное количество пакетов в работе (вместе с готовыми, но еще не выданными).
+    """
+    def __init__(self, max_workers=None, chunk_size=16, max_pending=None):
+        self.max_workers = max_workers
+        self.chunk_size = chunk_size
+        self.max_pending = max_pending
+
+    def solve_many(self, jobs, ordered=True):
+        """
+        Решает системы из итерируемого набора задач.
+
+        Параметры:
+        - jobs: итерируемый набор кортежей (A, b, method); A - плотная матрица,
+          CSRMatrix или BandMatrix, method - как в EquationSolver.solve
+        - ordered: True - выдавать результаты в порядке задач, False - по мере готовности
+
+        Возвращает:
+        - генератор пар (номер задачи, SolveResult, SolverError или ValueError)
+        """
+        max_workers = self.max_workers or os.cpu_count() or 1
+        max_pending = self.max_pending or 2 * max_workers
+        pending = {}
+        try:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                try:
+                    finished = {}
+                    next_index = 0
+                    chunks = self._chunks(jobs)
+                    exhausted = False
+
+                    while True:
+                        # Готовые пакеты, ждущие выдачи по порядку, тоже занимают место: пока
+                        # не решен следующий по порядку пакет, новые не отправляются
+                        while not exhausted and len(pending) + len(finished) < max_pending:
+                            chunk = next(chunks, None)
+                            if chunk is None:
+                                exhausted = True
+                                break
+                            start, shm, layout = chunk
+                            try:
+                                future = executor.submit(_solve_chunk, shm.name, layout)
+                            except BaseException:
+                                shm.close()
+                                shm.unlink()
+                                raise
+                            pending[future] = (start, shm)
+                        if not pending:
+                            break
+
+                        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            start, shm = pending.pop(future)
+                            shm.close()
+                            shm.unlink()
+                            results = future.result()
+                            if ordered:
+                                finished[start] = results
+                            else:
+                                for offset, result in enumerate(results):
+                                    yield start + offset, result
+
+                        while next_index in finished:
+                            results = finished.pop(next_index)
+                            for offset, result in enumerate(results):
+                                yield next_index + offset, result
+                            next_index += len(results)
+                finally:
+                    # Генератор закрыт досрочно или произошла ошибка: пакеты, которые
+                    # еще не начали решаться, отменяются, начатые - дожидаются
+                    executor.shutdown(cancel_futures=True)
+        finally:
+            # Блоки общей памяти не освобождаются сами при завершении процесса
+            for _, shm in pending.values():
+                shm.close()
+                shm.unlink()
+
+    def _chunks(self, jobs):
+        """
+        Группирует задачи в пакеты и копирует их данные в общую память.
+
+        Возвращает:
+        - генератор кортежей (номер первой задачи, блок общей памяти, описание размещения)
+        """
+        start = 0
+        batch = []
+        for job in jobs:
+            batch.append(job)
+            if len(batch) == self.chunk_size:
+                yield (start,) + self._share(batch)
+                start += len(batch)
+                batch = []
+        if batch:
+            yield (start,) + self._share(batch)
+
+    def _share(self, batch):
+        """
+        Копирует матрицы и правые части пакета в один блок общей памяти.
+
+        Плотные матрицы размещаются в общей памяти, остальные (CSRMatrix,
+        BandMatrix) передаются рабочему процессу обычной сериализацией.
+
+        Возвращает:
+        - shm: блок общей памяти
+        - layout: описание размещения для _solve_chunk
+        """
+        arrays = []
+        for A, b, method in batch:
+            dense = None if isinstance(A, (CSRMatrix, BandMatrix)) else np.asarray(A, dtype=np.float64)
+            arrays.append((A if dense is None else None, dense, np.asarray(b, dtype=np.float64), method))
+
+        size = sum((dense.nbytes if dense is not None else 0) + b.nbytes for _, dense, b, _ in arrays)
+        shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        layout = []
+        offset = 0
+        for matrix, dense, b, method in arrays:
+            a_offset, a_shape = offset, None
+            if dense is not None:
+                np.ndarray(dense.shape, dtype=np.float64, buffer=shm.buf, offset=offset)[...] = dense
+                a_shape = dense.shape
+                offset += dense.nbytes
+            np.ndarray(b.shape, dtype=np.float64, buffer=shm.buf, offset=offset)[...] = b
+            layout.append((a_offset, a_shape, offset, b.shape, method, matrix))
+            offset += b.nbytes
+        return shm, layout
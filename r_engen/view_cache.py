@@ -0,0 +1,148 @@
+class ViewCache:
+    """
+    Кэш представлений (страниц) одной сессии интерфейса.
+
+    Каждая страница строится один раз и остается в дереве элементов страницы;
+    при переходе меняется только свойство visible у старой и новой страницы,
+    поэтому клиенту отправляется небольшая разница, а не все дерево заново.
+    Свойства, зависящие от темы и языка, регистрируются как привязки и при
+    смене настроек пересчитываются на месте.
+
+    Класс не зависит от flet: элементом может быть любой объект с атрибутами.
+
+    Атрибуты:
+    - views: словарь {имя: элемент} построенных страниц.
+    - pinned: множество имен элементов, которые видны всегда (например, верхняя панель).
+    - current: имя видимой страницы или None.
+    - bindings: словарь {имя: [(элемент, атрибут, функция value(theme, language))]}.
+    - theme: тема, с которой были пересчитаны привязки.
+    - language: язык, с которым были пересчитаны привязки.
+    """
+    def __init__(self, theme='light', language='en'):
+        self.views = {}
+        self.pinned = set()
+        self.current = None
+        self.bindings = {}
+        self.theme = theme
+        self.language = language
+        self._building = None
+
+    def __contains__(self, name):
+        return name in self.views
+
+    def get(self, name):
+        """Возвращает элемент страницы name или None, если она еще не построена."""
+        return self.views.get(name)
+
+    def build(self, name, builder, pinned=False):
+        """
+        Строит страницу name функцией builder(), если она еще не построена.
+
+        Привязки, созданные через bind во время работы builder, относятся к этой странице.
+
+        Параметры:
+        - name: имя страницы
+        - builder: функция без параметров, возвращающая элемент страницы
+        - pinned: элемент виден всегда и не участвует в переключении страниц
+
+        Возвращает:
+        - (элемент, True, если страница была построена сейчас)
+        """
+        view = self.views.get(name)
+        if view is not None:
+            return view, False
+        outer, self._building = self._building, name
+        try:
+            view = builder()
+        except BaseException:
+            self.bindings.pop(name, None)
+            raise
+        finally:
+            self._building = outer
+        self.views[name] = view
+        if pinned:
+            self.pinned.add(name)
+        else:
+            view.visible = False
+        return view, True
+
+    def show(self, name):
+        """
+        Делает видимой страницу name и скрывает предыдущую.
+
+        Параметры:
+        - name: имя построенной страницы
+
+        Возвращает:
+        - список элементов, у которых изменилась видимость
+        """
+        changed = []
+        for other, view in self.views.items():
+            if other in self.pinned:
+                continue
+            visible = other == name
+            if view.visible != visible:
+                view.visible = visible
+                changed.append(view)
+        self.current = name
+        return changed
+
+    def drop(self, name):
+        """
+        Удаляет страницу и ее привязки из кэша (например, когда ее содержимое устарело).
+
+        Параметры:
+        - name: имя страницы
+
+        Возвращает:
+        - удаленный элемент или None
+        """
+        self.bindings.pop(name, None)
+        self.pinned.discard(name)
+        if self.current == name:
+            self.current = None
+        return self.views.pop(name, None)
+
+    def bind(self, control, attribute, value):
+        """
+        Привязывает атрибут элемента к теме и языку и сразу устанавливает его значение.
+
+        Вне build привязка относится к уже показанной странице current.
+
+        Параметры:
+        - control: элемент интерфейса
+        - attribute: имя атрибута
+        - value: функция value(theme, language), возвращающая значение атрибута
+
+        Возвращает:
+        - control
+        """
+        name = self._building if self._building is not None else self.current
+        self.bindings.setdefault(name, []).append((control, attribute, value))
+        setattr(control, attribute, value(self.theme, self.language))
+        return control
+
+    def apply(self, theme, language):
+        """
+        Пересчитывает все привязки для новой темы и языка.
+
+        Атрибут присваивается только если его значение изменилось, поэтому
+        клиенту отправляются только действительно измененные свойства.
+
+        Параметры:
+        - theme: тема ('light' или 'dark')
+        - language: код языка
+
+        Возвращает:
+        - int: количество измененных атрибутов
+        """
+        self.theme = theme
+        self.language = language
+        changed = 0
+        for bindings in self.bindings.values():
+            for control, attribute, value in bindings:
+                new_value = value(theme, language)
+                if getattr(control, attribute, None) != new_value:
+                    setattr(control, attribute, new_value)
+                    changed += 1
+        return changed
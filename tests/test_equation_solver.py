@@ -1,13 +1,22 @@
+import os
+import subprocess
+import sys
+import tempfile
 import unittest
+from unittest.mock import patch
 import numpy as np
-from r_engen.equation_solver import EquationSolver  # Используйте абсолютный путь
+from r_engen.equation_solver import (BandMatrix, DimensionMismatchError, EquationSolver,  # Используйте абсолютный путь
+                                     NonSquareMatrixError, NotPositiveDefiniteError, NotSymmetricMatrixError,
+                                     OutOfCoreLUFactorization, SingularMatrixError, SolveCancelledError,
+                                     StreamingLeastSquares)
+from r_engen.sparse_matrix import CSRMatrix
 
 
 class TestEquationSolver(unittest.TestCase):
 
     def setUp(self):
         # Инициализация необходимых параметров для тестов
-        self.page = None  # Здесь можно создать mock объект для страницы
+        self.page = None  # Решателю страница не нужна
         self.size = 3
         self.current_language = 'en'
         self.entries = []
@@ -18,6 +27,30 @@ class TestEquationSolver(unittest.TestCase):
         for a, b in zip(list1, list2):
             self.assertAlmostEqual(a, b, places=places)
 
+    def test_the_triangular_matrix(self):
+        A = [
+            [2, 3, 1],
+            [4, 1, -3],
+            [3, -1, 2]
+        ]
+        b = [1, 2, 3]
+        expected_x = [0.75, -0.25, 0.25]
+
+        U, y = self.solver.the_triangular_matrix(A, b)
+        self.assertTrue(np.allclose(U, np.triu(U)))
+        result_x = self.solver.backward_substitution(U, y)
+        self.assertListAlmostEqual(result_x, expected_x)
+
+    def test_the_triangular_matrix_large(self):
+        rng = np.random.default_rng(0)
+        n = 300  # больше ширины панели, чтобы задеть блочное обновление
+        a = rng.standard_normal((n, n))
+        b = rng.standard_normal(n)
+
+        U, y = self.solver.the_triangular_matrix(a, b)
+        result_x = np.linalg.solve(U, y)
+        self.assertTrue(np.allclose(result_x, np.linalg.solve(a, b)))
+
     def test_solve_lu(self):
         A = [
             [2, 3, 1],
@@ -35,21 +68,487 @@ class TestEquationSolver(unittest.TestCase):
             [4, 3],
             [6, 3]
         ]
-        expected_L = [
-            [1.0, 0.0],
-            [1.5, 1.0]
-        ]
-        expected_U = [
-            [4, 3],
-            [0, -1.5]
+        # L и U упакованы в одну матрицу, строки переставлены по ведущему элементу
+        expected_LU = [
+            [6, 3],
+            [2 / 3, 1]
         ]
+        expected_perm = [1, 0]
 
-        L, U = self.solver.lu_decomposition(A)
-        for row_result, row_expected in zip(L, expected_L):
+        LU, perm = self.solver.lu_decomposition(A)
+        for row_result, row_expected in zip(LU, expected_LU):
             self.assertListAlmostEqual(row_result, row_expected)
-        for row_result, row_expected in zip(U, expected_U):
+        self.assertEqual(list(perm), expected_perm)
+        self.assertEqual(A, [[4, 3], [6, 3]])
+
+    def test_solve_lu_zero_leading_element(self):
+        A = [
+            [0, 1],
+            [1, 1]
+        ]
+        b = [2, 3]
+        expected_x = [1, 2]
+
+        result_x = self.solver.solve_lu(A, b)
+        self.assertListAlmostEqual(result_x, expected_x)
+
+    def test_factorize_solve_many(self):
+        rng = np.random.default_rng(1)
+        a = rng.standard_normal((6, 6))
+        b = rng.standard_normal((6, 4))
+
+        factorization = self.solver.factorize(a)
+        result_x = factorization.solve(b)
+        self.assertEqual(result_x.shape, (6, 4))
+        self.assertTrue(np.allclose(result_x, np.linalg.solve(a, b)))
+        self.assertTrue(np.allclose(factorization.solve(b[:, 0]), np.linalg.solve(a, b[:, 0])))
+        with self.assertRaises(DimensionMismatchError) as context:
+            self.solver.factorize(np.eye(3)).solve(np.arange(5.0))
+        self.assertEqual((context.exception.expected, context.exception.actual), (3, 5))
+        self.assertIsInstance(context.exception, ValueError)
+
+    def test_tiled_lu(self):
+        rng = np.random.default_rng(13)
+        a = rng.standard_normal((300, 300))
+        b = rng.standard_normal(300)
+
+        lu, perm = self.solver.lu_decomposition(a, tile_size=48, num_threads=4)
+        lower = np.tril(lu, -1) + np.eye(300)
+        self.assertTrue(np.allclose(lower @ np.triu(lu), a[perm]))
+
+        result = self.solver.solve(a, b, 'lu_tiled')
+        self.assertTrue(np.allclose(result.x, np.linalg.solve(a, b)))
+
+    def test_solve_unknown_method(self):
+        with self.assertRaises(ValueError):
+            self.solver.solve(np.eye(2), [1.0, 2.0], 'LU decomposition')
+
+    def test_gauss_and_substitution_routes_expose_determinant(self):
+        rng = np.random.default_rng(15)
+        a = rng.standard_normal((30, 30))
+        b = rng.standard_normal(30)
+
+        result = self.solver.solve(a, b, 'Gauss')
+        self.assertTrue(np.allclose(result.x, np.linalg.solve(a, b)))
+        self.assertTrue(np.isclose(result.det(), np.linalg.det(a)))
+        self.assertEqual(result.slogdet()[0], np.linalg.slogdet(a)[0])
+        self.assertEqual(result.rank(), 30)
+        condition = np.linalg.cond(a, 1)
+        self.assertTrue(condition / 3 <= result.condition_estimate() <= condition * (1 + 1e-8))
+        self.assertTrue(np.allclose(result.factorization.solve(b), result.x))
+
+        for matrix in (np.diag(np.arange(1.0, 31.0)), np.triu(a) + 10 * np.eye(30), np.tril(a) + 10 * np.eye(30)):
+            result = self.solver.solve(matrix, b, 'auto')
+            self.assertTrue(np.isclose(result.det(), np.linalg.det(matrix)), result.method)
+            self.assertTrue(np.allclose(result.factorization.solve(b), np.linalg.solve(matrix, b)), result.method)
+
+        self.assertIsNone(self.solver.solve(a + a.T, b, 'ldlt').det())
+
+    def test_factorization_determinant_rank_condition(self):
+        rng = np.random.default_rng(14)
+        a = rng.standard_normal((40, 40))
+        b = rng.standard_normal(40)
+
+        result = self.solver.solve(a, b, 'lu')
+        factorization = result.factorization
+        sign, logdet = np.linalg.slogdet(a)
+        self.assertEqual(factorization.slogdet()[0], sign)
+        self.assertAlmostEqual(factorization.slogdet()[1], logdet)
+        self.assertTrue(np.isclose(factorization.det(), np.linalg.det(a)))
+        self.assertEqual(factorization.rank(), 40)
+        self.assertTrue(np.allclose(factorization.solve_transposed(b), np.linalg.solve(a.T, b)))
+        condition = np.linalg.cond(a, 1)
+        self.assertTrue(condition / 3 <= factorization.condition_estimate() <= condition * (1 + 1e-8))
+
+        spd = a @ a.T + 40 * np.eye(40)
+        factorization = self.solver.solve(spd, b, 'cholesky').factorization
+        self.assertAlmostEqual(factorization.slogdet()[1], np.linalg.slogdet(spd)[1])
+        condition = np.linalg.cond(spd, 1)
+        self.assertTrue(condition / 3 <= factorization.condition_estimate() <= condition * (1 + 1e-8))
+
+    def test_streaming_least_squares(self):
+        rng = np.random.default_rng(15)
+        a = rng.standard_normal((1000, 6))
+        b = a @ np.arange(1.0, 7.0) + 0.01 * rng.standard_normal(1000)
+        expected_x, expected_rss, _, _ = np.linalg.lstsq(a, b, rcond=None)
+
+        fit = StreamingLeastSquares(6, self.solver, chunk_size=64)
+        fit.extend((a[start:start + 300], b[start:start + 300]) for start in range(0, 1000, 300))
+        self.assertEqual(fit.rows, 1000)
+        self.assertTrue(np.allclose(fit.solution(), expected_x))
+        self.assertAlmostEqual(fit.residual_sum_of_squares, expected_rss[0])
+
+        result = self.solver.solve(a, b)
+        self.assertEqual(result.method, 'least_squares')
+        self.assertTrue(np.allclose(result.x, expected_x))
+        with self.assertRaises(SingularMatrixError):
+            StreamingLeastSquares(6).add_rows(a[:3], b[:3]).solution()
+        with self.assertRaises(DimensionMismatchError):
+            StreamingLeastSquares(6).add_rows(a[:3], b[:4])
+
+    def test_updatable_factorization(self):
+        rng = np.random.default_rng(16)
+        a = rng.standard_normal((30, 30)) + 30 * np.eye(30)
+        b = rng.standard_normal(30)
+
+        factorization = self.solver.factorize_updatable(a, max_rank=4)
+        a[3, 7] = 5.0
+        factorization.update_entry(3, 7, 5.0)
+        a[10] = rng.standard_normal(30) + 30 * np.eye(30)[10]
+        factorization.update_row(10, a[10])
+        a[:, 2] = rng.standard_normal(30) + 30 * np.eye(30)[2]
+        factorization.update_column(2, a[:, 2])
+        self.assertTrue(np.allclose(factorization.solve(b), np.linalg.solve(a, b)))
+        self.assertEqual(factorization.refactorizations, 0)
+
+        a[[0, 1]] += 1.0
+        factorization.update_matrix(a)
+        self.assertEqual(factorization.refactorizations, 1)
+        self.assertTrue(np.allclose(factorization.solve(b), np.linalg.solve(a, b)))
+
+        # Изменен один столбец (все строки): достаточно изменения ранга 1
+        a[:, 5] += 2.0
+        factorization.update_matrix(a)
+        self.assertEqual(factorization.refactorizations, 1)
+        self.assertEqual(factorization.U.shape[1], 1)
+        self.assertTrue(np.allclose(factorization.solve(b), np.linalg.solve(a, b)))
+
+    def test_progress_and_cancellation(self):
+        rng = np.random.default_rng(18)
+        a = rng.standard_normal((150, 150))
+        b = rng.standard_normal(150)
+
+        columns = []
+        result = self.solver.solve(a, b, 'Gauss', progress=lambda column, n: columns.append((column, n)))
+        self.assertEqual(columns, [(64, 150), (128, 150), (150, 150)])
+        self.assertTrue(np.allclose(result.x, np.linalg.solve(a, b)))
+
+        def cancel(column, n):
+            raise SolveCancelledError()
+
+        spd = a @ a.T + 150 * np.eye(150)
+        for method in ('lu', 'cholesky', 'ldlt', 'mixed', 'sparse', 'banded', 'least_squares',
+                       'cg', 'bicgstab', 'gmres'):
+            with self.subTest(method=method), self.assertRaises(SolveCancelledError):
+                self.solver.solve(spd, b, method, progress=cancel)
+        with self.assertRaises(SolveCancelledError):
+            self.solver.solve_banded(BandMatrix.from_dense(np.diag(np.full(150, 4.0)) + np.eye(150, k=1)
+                                                           + np.eye(150, k=-1)), b, progress=cancel)
+        with self.assertRaises(SolveCancelledError):
+            self.solver.factorize_updatable(spd, progress=cancel)
+
+    def test_out_of_core_lu(self):
+        rng = np.random.default_rng(20)
+        a = rng.standard_normal((200, 200))
+        b = rng.standard_normal((200, 2))
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "factors.npy")
+            factorization = self.solver.factorize_out_of_core(a, path, memory_limit=3 * 8 * 200 * 48)
+            self.assertEqual(factorization.panel_width, 48)
+            self.assertTrue(np.allclose(factorization.solve(b), np.linalg.solve(a, b)))
+
+            reopened = OutOfCoreLUFactorization.open(self.solver, path)
+            self.assertTrue(np.allclose(reopened.solve(b[:, 0]), np.linalg.solve(a, b[:, 0])))
+            del factorization, reopened
+
+    def test_factorize_inverse(self):
+        A = [
+            [4, 7],
+            [2, 6]
+        ]
+        expected_inverse = [
+            [0.6, -0.7],
+            [-0.2, 0.4]
+        ]
+
+        inverse = self.solver.factorize(A).inverse()
+        for row_result, row_expected in zip(inverse, expected_inverse):
             self.assertListAlmostEqual(row_result, row_expected)
 
+    def test_solve_batch(self):
+        rng = np.random.default_rng(2)
+        a = rng.standard_normal((50, 4, 4)) + 4 * np.eye(4)
+        b = rng.standard_normal((50, 4))
+        a[7] = [[1, 2, 3, 4], [2, 4, 6, 8], [0, 1, 0, 1], [1, 0, 1, 0]]  # вырожденная система
+
+        result_x, singular = self.solver.solve_batch(a, b)
+        self.assertEqual(list(np.flatnonzero(singular)), [7])
+        self.assertTrue(np.all(np.isnan(result_x[7])))
+        regular = ~singular
+        expected_x = np.linalg.solve(a[regular], b[regular][..., None])[..., 0]
+        self.assertTrue(np.allclose(result_x[regular], expected_x))
+
+    def test_solve_sparse(self):
+        rng = np.random.default_rng(4)
+        n = 40
+        a = rng.standard_normal((n, n)) * (rng.random((n, n)) < 0.1) + np.diag(rng.uniform(1, 2, n))
+        a[0, 0] = 0.0  # требует выбора ведущего элемента
+        b = rng.standard_normal(n)
+
+        result_x = self.solver.solve_sparse(CSRMatrix.from_dense(a), b)
+        self.assertTrue(np.allclose(result_x, np.linalg.solve(a, b)))
+
+    def test_factorize_sparse_grid(self):
+        # Пятиточечный оператор Лапласа на сетке 30 x 30
+        m = 30
+        grid = 4 * np.eye(m) - np.eye(m, k=1) - np.eye(m, k=-1)
+        a = np.kron(np.eye(m), grid) - np.kron(np.eye(m, k=1) + np.eye(m, k=-1), np.eye(m))
+        b = np.random.default_rng(5).standard_normal(m * m)
+
+        factorization = self.solver.factorize_sparse(a)
+        self.assertIsNotNone(factorization.dense)
+        self.assertLess(factorization.nnz, self.solver.factorize_sparse(a, ordering='rcm').nnz)
+        self.assertTrue(np.allclose(factorization.solve(b), np.linalg.solve(a, b)))
+        with self.assertRaises(ValueError):
+            self.solver.factorize_sparse(a, ordering='unknown')
+
+    def test_band_matrix_from_dense(self):
+        A = [
+            [2, 1, 0, 0],
+            [3, 2, 1, 0],
+            [1, 3, 2, 1],
+            [0, 1, 3, 2]
+        ]
+
+        band = BandMatrix.from_dense(A)
+        self.assertEqual((band.lower, band.upper), (2, 1))
+        self.assertEqual(band.data.shape, (4, 4))
+        self.assertTrue(np.array_equal(band.to_dense(), A))
+        self.assertTrue(np.allclose(band @ [1, 2, 3, 4], np.dot(A, [1, 2, 3, 4])))
+
+    def test_solve_banded_tridiagonal(self):
+        n = 1000
+        band = BandMatrix.from_diagonals(-np.ones(n - 1), np.full(n, 2.5), -np.ones(n - 1))
+        b = np.random.default_rng(6).standard_normal(n)
+
+        result_x = self.solver.solve_banded(band, b)
+        self.assertTrue(np.allclose(band @ result_x, b))
+
+    def test_solve_banded_with_pivoting(self):
+        rng = np.random.default_rng(7)
+        n = 30
+        a = np.triu(np.tril(rng.standard_normal((n, n)), 3), -2)
+        a[0, 0] = 0.0  # прогонка и исключение без перестановок здесь невозможны
+        b = rng.standard_normal(n)
+
+        self.assertTrue(np.allclose(self.solver.solve_banded(a, b), np.linalg.solve(a, b)))
+        tridiagonal = [[0, 1, 0], [1, 0, 1], [0, 1, 1]]
+        self.assertListAlmostEqual(self.solver.solve_banded(tridiagonal, [1, 2, 3]), [0, 1, 2])
+
+    def test_solve_mixed_precision(self):
+        rng = np.random.default_rng(11)
+        a = rng.standard_normal((100, 100))
+        b = rng.standard_normal(100)
+
+        result = self.solver.solve_mixed_precision(a, b)
+        self.assertTrue(result.converged)
+        self.assertFalse(result.fallback)
+        self.assertEqual(result.factorization.LU.dtype, np.float32)
+        self.assertGreater(result.iterations, 0)
+        self.assertEqual(len(result.residuals), result.iterations + 1)
+        self.assertIsNone(result.fallback_residual)
+        self.assertLess(result.residuals[-1], result.residuals[0])
+        self.assertTrue(np.allclose(result.x, np.linalg.solve(a, b), rtol=1e-12, atol=1e-12))
+
+    def test_solve_mixed_precision_fallback(self):
+        # Число обусловленности 1e9 недостижимо для уточнения по разложению в float32
+        rng = np.random.default_rng(12)
+        q, _ = np.linalg.qr(rng.standard_normal((40, 40)))
+        a = q @ np.diag(np.logspace(0, -9, 40)) @ q.T
+        b = rng.standard_normal(40)
+
+        result = self.solver.solve_mixed_precision(a, b)
+        self.assertTrue(result.fallback)
+        self.assertEqual(result.factorization.LU.dtype, np.float64)
+        self.assertTrue(np.allclose(a @ result.x, b))
+        self.assertEqual(result.converged, result.fallback_residual <= np.finfo(np.float64).eps * np.sqrt(40))
+        # Шаги уточнения в float32 и переход на float64 учитываются отдельно
+        self.assertEqual(len(result.residuals), result.iterations + 1)
+        self.assertLessEqual(result.iterations, 10)
+
+        # Недостижимая точность: решение получено, но признак сходимости снят
+        result = self.solver.solve_mixed_precision(a, b, tol=1e-30)
+        self.assertTrue(result.fallback)
+        self.assertFalse(result.converged)
+
+    def test_cholesky_decomposition(self):
+        rng = np.random.default_rng(9)
+        n = 50
+        m = rng.standard_normal((n, n))
+        a = m @ m.T + n * np.eye(n)
+        b = rng.standard_normal((n, 3))
+
+        factorization = self.solver.cholesky_decomposition(a, block_size=16)
+        L = factorization.lower()
+        self.assertTrue(np.allclose(L, np.tril(L)))
+        self.assertTrue(np.allclose(L @ L.T, a))
+        # Хранится только нижний треугольник (построчными блоками)
+        self.assertLess(sum(block.size for block in factorization.blocks), 0.7 * n * n)
+        self.assertTrue(np.allclose(factorization.solve(b), np.linalg.solve(a, b)))
+
+    def test_cholesky_not_positive_definite(self):
+        A = [
+            [1, 2],
+            [2, 1]
+        ]
+        with self.assertRaises(NotPositiveDefiniteError) as context:
+            self.solver.solve_cholesky(A, [1, 1])
+        self.assertEqual(context.exception.column, 1)
+
+    def test_solve_ldlt_indefinite(self):
+        rng = np.random.default_rng(10)
+        m = rng.standard_normal((30, 30))
+        a = m + m.T
+        a[0, 0] = 0.0  # нулевой диагональный элемент требует перестановки или блока 2x2
+        b = rng.standard_normal(30)
+
+        factorization = self.solver.ldlt_decomposition(a)
+        self.assertIn(2, factorization.pivot_sizes)
+        self.assertTrue(np.allclose(factorization.solve(b), np.linalg.solve(a, b)))
+        self.assertListAlmostEqual(self.solver.solve_ldlt([[0, 1], [1, 0]], [2, 3]), [3, 2])
+
+    def test_ldlt_small_panels(self):
+        rng = np.random.default_rng(11)
+        n = 70
+        m = rng.standard_normal((n, n))
+        a = m + m.T
+        np.fill_diagonal(a, 0.0)
+        b = rng.standard_normal((n, 2))
+
+        factorization = self.solver.ldlt_decomposition(a, block_size=8)
+        self.assertIn(2, factorization.pivot_sizes)
+        self.assertTrue(np.allclose(factorization.solve(b), np.linalg.solve(a, b)))
+        self.assertTrue(np.allclose(factorization.solve(b[:, 0]), np.linalg.solve(a, b[:, 0])))
+
+    def test_symmetric_methods_reject_non_symmetric_matrix(self):
+        A = [[4, 1], [0, 3]]
+        for method in ('cholesky', 'ldlt'):
+            with self.subTest(method=method), self.assertRaises(NotSymmetricMatrixError):
+                self.solver.solve(A, [1, 1], method)
+        self.assertListAlmostEqual(self.solver.solve(A, [1, 1], 'auto').x, [1 / 6, 1 / 3])
+
+    def test_solve_auto_routes(self):
+        rng = np.random.default_rng(8)
+        n = 40
+        general = rng.standard_normal((n, n)) + n * np.eye(n)
+        block = np.zeros((n, n))
+        block[:20, :20] = general[:20, :20]
+        block[20:, 20:] = general[20:, 20:]
+        shuffle = rng.permutation(n)
+        b = rng.standard_normal(n)
+
+        cases = [
+            (np.diag(np.arange(1.0, n + 1)), 'diagonal'),
+            (np.triu(general), 'upper_triangular'),
+            (np.tril(general), 'lower_triangular'),
+            (np.triu(np.tril(general, 2), -1), 'banded'),
+            (block[np.ix_(shuffle, shuffle)], 'block_diagonal'),
+            (general @ general.T, 'spd'),
+            (general, 'lu'),
+        ]
+        for a, expected_route in cases:
+            result = self.solver.solve(a, b, method='auto')
+            self.assertEqual(result.method, expected_route)
+            self.assertGreaterEqual(result.detection_time, 0.0)
+            self.assertTrue(np.allclose(a @ result.x, b, atol=1e-8), expected_route)
+
+    def test_detect_structure_builds_sparse_pattern_only_for_sparse_matrices(self):
+        rng = np.random.default_rng(12)
+        n = 80
+        dense = rng.standard_normal((n, n)) + n * np.eye(n)
+        # Блоки разного размера (5 и 75) в перемешанном порядке
+        block = dense.copy()
+        block[:5, 5:] = 0.0
+        block[5:, :5] = 0.0
+        shuffle = rng.permutation(n)
+        with patch('r_engen.equation_solver.CSRMatrix.from_coo', side_effect=AssertionError):
+            self.assertEqual(self.solver.detect_structure(dense)[0], 'lu')
+            route, labels = self.solver.detect_structure(block[np.ix_(shuffle, shuffle)])
+        self.assertEqual(route, 'block_diagonal')
+        self.assertEqual(sorted(np.bincount(labels)), [5, 75])
+
+    def test_solve_auto_sparse_route_depends_on_fill(self):
+        rng = np.random.default_rng(9)
+        # Случайная разреженная матрица: после исключения почти плотная
+        n = 200
+        scattered = rng.standard_normal((n, n)) * (rng.random((n, n)) < 0.03) + n * np.eye(n)
+        self.assertEqual(self.solver.detect_structure(scattered)[0], 'lu')
+
+        # Сеточная задача 40 x 40 с перемешанными неизвестными: заполнение мало
+        m = 40
+        grid = 4 * np.eye(m) - np.eye(m, k=1) - np.eye(m, k=-1)
+        laplacian = np.kron(np.eye(m), grid) - np.kron(np.eye(m, k=1) + np.eye(m, k=-1), np.eye(m))
+        laplacian[0, 1] = 0.0  # несимметричная, чтобы не выбирался путь 'spd'
+        shuffle = rng.permutation(m * m)
+        laplacian = laplacian[np.ix_(shuffle, shuffle)]
+        b = rng.standard_normal(m * m)
+        result = self.solver.solve(laplacian, b, method='auto')
+        self.assertEqual(result.method, 'sparse')
+        self.assertTrue(np.allclose(laplacian @ result.x, b))
+
+    def test_solve_auto_singular_triangular(self):
+        with self.assertRaises(SingularMatrixError):
+            self.solver.solve([[1, 2], [0, 0]], [1, 1], method='auto')
+
+    def test_iterative_methods(self):
+        rng = np.random.default_rng(5)
+        n = 30
+        m = rng.standard_normal((n, n))
+        spd = m @ m.T + n * np.eye(n)
+        nonsymmetric = m + 2 * np.sqrt(n) * np.eye(n)
+        b = rng.standard_normal(n)
+
+        cases = [(self.solver.solve_cg, spd),
+                 (self.solver.solve_bicgstab, nonsymmetric),
+                 (self.solver.solve_gmres, nonsymmetric)]
+        for method, a in cases:
+            for preconditioner in (None, 'jacobi'):
+                result = method(CSRMatrix.from_dense(a), b, tol=1e-12, preconditioner=preconditioner)
+                self.assertTrue(result.converged, method.__name__)
+                self.assertEqual(len(result.residuals), result.iterations)
+                self.assertLess(result.residuals[-1], 1e-12)
+                self.assertTrue(np.allclose(result.x, np.linalg.solve(a, b)))
+
+    def test_iterative_not_converged(self):
+        a = np.diag(np.arange(1.0, 21.0))
+        result = self.solver.solve_cg(a, np.ones(20), max_iterations=3)
+        self.assertFalse(result.converged)
+        self.assertEqual(result.iterations, 3)
+
+    def test_singular_matrix_raises(self):
+        A = [
+            [1, 2],
+            [2, 4]
+        ]
+        b = [1, 2]
+
+        with self.assertRaises(SingularMatrixError):
+            self.solver.the_triangular_matrix(A, b)
+        with self.assertRaises(SingularMatrixError):
+            self.solver.solve_lu(A, b)
+        with self.assertRaises(SingularMatrixError):
+            self.solver.solve_sparse(A, b)
+
+    def test_non_square_matrix_raises(self):
+        A = [
+            [1, 2, 3],
+            [4, 5, 6]
+        ]
+        b = [1, 2]
+
+        with self.assertRaises(NonSquareMatrixError):
+            self.solver.the_triangular_matrix(A, b)
+        with self.assertRaises(NonSquareMatrixError):
+            self.solver.lu_decomposition(A)
+
+    def test_solver_does_not_import_ui(self):
+        code = "import sys, r_engen.equation_solver; print('flet' in sys.modules)"
+        project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                                cwd=project_root).stdout
+        self.assertEqual(output.strip(), "False")
+
     def test_forward_substitution(self):
         L = [
             [1, 0, 0],
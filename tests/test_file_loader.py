@@ -0,0 +1,110 @@
+import json
+import os
+import tempfile
+import unittest
+import numpy as np
+from r_engen.file_loader import LoadFiles  # Используйте абсолютный путь
+from r_engen.sparse_matrix import CSRMatrix
+
+
+class TestLoadFiles(unittest.TestCase):
+
+    def setUp(self):
+        self.loader = LoadFiles()
+        self.directory = tempfile.TemporaryDirectory()
+        self.A = np.array([[4.0, 1.0, 0.0], [1.0, 3.0, 0.0], [0.0, 0.0, 2.0]])
+        self.b = np.array([1.0, 2.0, 3.0])
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.directory.name, name)
+
+    def test_load_csv_in_chunks(self):
+        np.savetxt(self.path("system.csv"), np.column_stack([self.A, self.b]), delimiter=',')
+        A, b = self.loader.load_csv(self.path("system.csv"), chunk_rows=2)
+        self.assertTrue(np.array_equal(A, self.A))
+        self.assertTrue(np.array_equal(b, self.b))
+
+        np.savetxt(self.path("system.tsv"), np.column_stack([self.A, self.b]), delimiter='\t')
+        A, b = self.loader.load_system(self.path("system.tsv"))
+        self.assertTrue(np.array_equal(A, self.A))
+
+    def test_load_csv_skips_comments_and_rejects_empty_files(self):
+        with open(self.path("system.csv"), 'w', encoding='utf-8') as file:
+            file.write("# A | b\n4,1,0,1\n\n1,3,0,2  # вторая строка\n# конец\n0,0,2,3\n")
+        A, b = self.loader.load_csv(self.path("system.csv"), chunk_rows=1)
+        self.assertTrue(np.array_equal(A, self.A))
+        self.assertTrue(np.array_equal(b, self.b))
+
+        for text in ("", "# только комментарий\n\n"):
+            with open(self.path("empty.csv"), 'w', encoding='utf-8') as file:
+                file.write(text)
+            with self.assertRaises(ValueError):
+                self.loader.load_system(self.path("empty.csv"))
+
+        with open(self.path("ragged.csv"), 'w', encoding='utf-8') as file:
+            file.write("1,2,3\n4,5\n")
+        with self.assertRaises(ValueError):
+            self.loader.load_csv(self.path("ragged.csv"), chunk_rows=1)
+
+    def test_load_npy_is_memory_mapped(self):
+        np.save(self.path("system.npy"), np.column_stack([self.A, self.b]))
+        A, b = self.loader.load_system(self.path("system.npy"))
+        self.assertIsInstance(A.base, np.memmap)
+        self.assertTrue(np.array_equal(A, self.A))
+        self.assertTrue(np.array_equal(b, self.b))
+        del A, b
+
+    def test_load_npz(self):
+        np.savez(self.path("system.npz"), A=self.A, b=self.b)
+        A, b = self.loader.load_npz(self.path("system.npz"))
+        self.assertTrue(np.array_equal(A, self.A))
+        self.assertTrue(np.array_equal(b, self.b))
+
+    def test_load_matrix_market(self):
+        with open(self.path("matrix.mtx"), 'w', encoding='utf-8') as file:
+            file.write("%%MatrixMarket matrix coordinate real symmetric\n% comment\n3 3 4\n"
+                       "1 1 4.0\n2 1 1.0\n2 2 3.0\n3 3 2.0\n")
+        with open(self.path("rhs.mtx"), 'w', encoding='utf-8') as file:
+            file.write("%%MatrixMarket matrix array real general\n3 1\n1.0\n2.0\n3.0\n")
+        A, b = self.loader.load_system(self.path("matrix.mtx"), self.path("rhs.mtx"))
+        self.assertIsInstance(A, CSRMatrix)
+        self.assertTrue(np.array_equal(A.to_dense(), self.A))
+        self.assertTrue(np.array_equal(b, self.b))
+
+        with open(self.path("pattern.mtx"), 'w', encoding='utf-8') as file:
+            file.write("%%MatrixMarket matrix coordinate pattern general\n2 3 3\n1 1\n% comment\n2 3\n1 2\n")
+        A = self.loader.load_matrix_market(self.path("pattern.mtx"), chunk_rows=1)
+        self.assertTrue(np.array_equal(A.to_dense(), [[1, 1, 0], [0, 0, 1]]))
+
+        with open(self.path("short.mtx"), 'w', encoding='utf-8') as file:
+            file.write("%%MatrixMarket matrix coordinate real general\n2 2 3\n1 1 1.0\n2 2 1.0\n")
+        with self.assertRaises(ValueError):
+            self.loader.load_matrix_market(self.path("short.mtx"))
+
+    def test_translation_catalog_is_cached_until_file_changes(self):
+        path = self.path("Translate.json")
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump({"buttons": {"back": {"en": "Back", "ru": "Назад"}}}, file)
+        catalog = LoadFiles.load_catalog(path)
+        self.assertIs(LoadFiles.load_catalog(path), catalog)
+        self.assertEqual(catalog.text('buttons', 'back', 'ru'), "Назад")
+        self.assertEqual(catalog.tables['en'][('buttons', 'back')], "Back")
+
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump({"buttons": {"back": {"en": "Return", "ru": "Назад"}}}, file)
+        os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 10 ** 9))
+        check_interval = LoadFiles.check_interval
+        LoadFiles.check_interval = 0.0
+        try:
+            reloaded = LoadFiles.load_catalog(path)
+        finally:
+            LoadFiles.check_interval = check_interval
+        self.assertIsNot(reloaded, catalog)
+        self.assertEqual(reloaded.text('buttons', 'back', 'en'), "Return")
+
+
+if __name__ == '__main__':
+    unittest.main()
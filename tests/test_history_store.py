@@ -0,0 +1,84 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime
+import numpy as np
+from r_engen.history_store import HistoryStore  # Используйте абсолютный путь
+from r_engen.sparse_matrix import CSRMatrix  # Используйте абсолютный путь
+
+
+class TestHistoryStore(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'history.sqlite3')
+        self.store = HistoryStore(self.path, recent_size=3)
+
+    def tearDown(self):
+        self.store.close()
+        self.directory.cleanup()
+
+    def add_solutions(self, count):
+        for k in range(count):
+            A = np.array([[2.0, 1.0], [1.0, 3.0]]) * (k + 1)
+            self.store.add(A, np.array([3.0, 5.0]), [k + 1 / 3, k], 'Gauss', 0.001 * k)
+
+    def test_record_keeps_full_precision_and_system(self):
+        created = datetime(2024, 1, 2, 3, 4, 5)
+        record = self.store.add(np.eye(2), np.array([1.0, 2.0]), [1 / 3, 2 / 3], 'lu', 0.25, created)
+        self.store.close()
+
+        self.store = HistoryStore(self.path, recent_size=3)
+        loaded = self.store.page(0, 10)[0]
+        self.assertEqual(loaded.id, record.id)
+        self.assertEqual(loaded.created, created)
+        self.assertEqual(loaded.method, 'lu')
+        self.assertEqual(loaded.solve_time, 0.25)
+        np.testing.assert_array_equal(loaded.x, [1 / 3, 2 / 3])
+        A, b = self.store.load_system(record.id)
+        np.testing.assert_array_equal(A, np.eye(2))
+        np.testing.assert_array_equal(b, [1.0, 2.0])
+
+    def test_ring_buffer_is_bounded_and_pages_come_from_disk(self):
+        self.add_solutions(8)
+        self.assertEqual(len(self.store), 8)
+        self.assertEqual(len(self.store.recent), 3)
+        self.assertEqual(self.store.page_count(3), 3)
+        first = [record.x[1] for record in self.store.page(0, 3)]
+        second = [record.x[1] for record in self.store.page(1, 3)]
+        last = [record.x[1] for record in self.store.page(2, 3)]
+        self.assertEqual(first, [7, 6, 5])
+        self.assertEqual(second, [4, 3, 2])
+        self.assertEqual(last, [1, 0])
+
+    def test_old_records_are_pruned(self):
+        self.store.max_records = 5
+        self.add_solutions(8)
+        self.assertEqual(len(self.store), 5)
+        self.assertEqual([record.x[1] for record in self.store.page(1, 3)], [4, 3])
+        self.store.close()
+        self.store = HistoryStore(self.path)
+        self.assertEqual(len(self.store), 5)
+
+    def test_sparse_and_oversized_systems(self):
+        A = CSRMatrix.from_dense([[4.0, 0.0], [0.0, 5.0]])
+        record = self.store.add(A, [4.0, 5.0], [1.0, 1.0], 'sparse', 0.0)
+        loaded, b = self.store.load_system(record.id)
+        self.assertIsInstance(loaded, CSRMatrix)
+        np.testing.assert_array_equal(loaded.to_dense(), A.to_dense())
+
+        self.store.max_system_entries = 3
+        record = self.store.add(np.eye(2), [1.0, 1.0], [1.0, 1.0], 'Gauss', 0.0)
+        self.assertIsNone(self.store.load_system(record.id))
+        self.assertEqual(len(self.store), 2)
+
+    def test_clear(self):
+        self.add_solutions(4)
+        self.store.clear()
+        self.assertEqual(len(self.store), 0)
+        self.assertEqual(self.store.page(0, 10), [])
+        self.assertEqual(self.store.page_count(10), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import threading
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+import numpy as np
+from r_engen.live_solver import LiveSolver  # Используйте абсолютный путь
+
+
+class TestLiveSolver(unittest.TestCase):
+
+    def setUp(self):
+        self.results = []
+        self.errors = []
+        self.done = threading.Event()
+
+        def on_result(result):
+            self.results.append(result)
+            self.done.set()
+
+        def on_error(error):
+            self.errors.append(error)
+            self.done.set()
+
+        self.solver = LiveSolver(2, on_result, on_error, method='lu', delay=0.05)
+
+    def tearDown(self):
+        self.solver.close()
+
+    def test_debounced_edits_solve_latest_matrix(self):
+        self.solver.load([["2", "1", "3"], ["1", "3", "5"]])
+        self.solver.set_cell(0, 2, "4,0")
+        self.assertTrue(self.done.wait(5))
+        self.assertEqual(len(self.results), 1)
+        self.assertTrue(np.allclose(self.results[0].x, np.linalg.solve([[2, 1], [1, 3]], [4, 5])))
+
+    def test_invalid_cell_is_not_solved(self):
+        self.solver.load([["2", "1", "3"], ["1", "", "5"]])
+        self.assertFalse(self.done.wait(0.3))
+        self.solver.set_cell(1, 1, "x")
+        self.solver.set_cell(1, 1, "2")
+        self.assertTrue(self.done.wait(5))
+        self.assertEqual(len(self.results), 1)
+
+    def test_singular_matrix_reports_error(self):
+        self.solver.load([["1", "2", "1"], ["2", "4", "2"]])
+        self.assertTrue(self.done.wait(5))
+        self.assertEqual(len(self.errors), 1)
+
+    def test_stale_solve_is_cancelled(self):
+        finished = []
+
+        def solve(A, b, method, progress=None):
+            # Решение из нескольких панелей: после первой проверяется актуальность
+            progress(1, 2)
+            finished.append(method)
+            return SimpleNamespace(x=b)
+
+        with patch('r_engen.live_solver.EquationSolver', lambda: SimpleNamespace(solve=solve)):
+            self.solver.generation = 2
+            self.solver._solve(1, np.eye(2), np.ones(2))
+            self.assertEqual(finished, [])
+            self.assertEqual(self.results, [])
+            self.solver._solve(2, np.eye(2), np.ones(2))
+            self.assertEqual(finished, ['lu'])
+            self.assertEqual(len(self.results), 1)
+
+    def test_load_schedules_one_solve(self):
+        with patch.object(self.solver, '_schedule', wraps=self.solver._schedule) as schedule:
+            self.solver.load([["2", "1", "3"], ["1", "3", "5"]])
+        self.assertEqual(schedule.call_count, 1)
+        self.assertEqual(self.solver.generation, 1)
+        self.assertTrue(self.done.wait(5))
+        self.assertEqual(len(self.results), 1)
+
+    def test_bad_method_reports_error(self):
+        self.solver.method = 'bogus'
+        self.solver.load([["2", "1", "3"], ["1", "3", "5"]])
+        self.assertTrue(self.done.wait(5))
+        self.assertIsInstance(self.errors[0], ValueError)
+
+    def test_closed_solver_reports_nothing(self):
+        self.solver.load([["2", "1", "3"], ["1", "3", "5"]])
+        self.solver.close()
+        self.solver.set_cell(0, 0, "3")
+        self.assertFalse(self.done.wait(0.3))
+        self.solver._solve(self.solver.generation, np.eye(2), np.ones(2))
+        self.assertEqual(self.results, [])
+
+    def test_method_is_read_at_solve_time(self):
+        settings = SimpleNamespace(method='Gauss')
+        self.solver.method = lambda: settings.method
+        self.solver.load([["2", "1", "3"], ["1", "3", "5"]])
+        settings.method = 'cholesky'
+        self.assertTrue(self.done.wait(5))
+        self.assertEqual(self.results[0].method, 'cholesky')
+
+
+if __name__ == '__main__':
+    unittest.main()
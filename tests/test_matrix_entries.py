@@ -0,0 +1,75 @@
+import unittest
+import numpy as np
+from r_engen.matrix_entries import MatrixEntries, parse_matrix_text  # Используйте абсолютный путь
+
+
+class TestMatrixEntries(unittest.TestCase):
+
+    def setUp(self):
+        self.entries = MatrixEntries(2)
+
+    def test_set_text_updates_numeric_array(self):
+        for (i, j), text in {(0, 0): "2", (0, 1): "1", (0, 2): "3,5", (1, 0): "1", (1, 1): "3", (1, 2): "5"}.items():
+            self.assertTrue(self.entries.set_text(i, j, text))
+        self.assertTrue(self.entries.is_valid())
+        self.assertTrue(np.array_equal(self.entries.A, [[2, 1], [1, 3]]))
+        self.assertTrue(np.array_equal(self.entries.b, [3.5, 5]))
+        self.assertEqual(self.entries.text(0, 2), "3.5")
+        self.assertEqual(self.entries.text(0, 0), "2")
+
+    def test_invalid_text_is_kept_for_display(self):
+        self.assertFalse(self.entries.set_text(0, 0, "abc"))
+        self.assertFalse(self.entries.is_valid())
+        self.assertEqual(self.entries.text(0, 0), "abc")
+        self.assertEqual(self.entries.text(1, 1), "")
+
+        self.entries.set_text(0, 0, "0.1")
+        self.assertEqual(self.entries.text(0, 0), "0.1")
+        self.entries.clear()
+        self.assertEqual(self.entries.text(0, 0), "")
+        self.assertFalse(self.entries.filled.any())
+
+    def test_parse_matrix_text_formats(self):
+        expected = [[1, 2.5, 3], [4, 5, 6]]
+        for text in ("1\t2,5\t3\r\n4\t5\t6\n", "1;2,5;3\n4;5;6", "1 2.5 3\n4 5 6", "1,2.5,3\n4,5,6"):
+            values, invalid = parse_matrix_text(text)
+            self.assertTrue(np.array_equal(values, expected), text)
+            self.assertEqual(invalid, {})
+
+        values, invalid = parse_matrix_text("1\tx\t3\n4\t5")
+        self.assertEqual(invalid, {(0, 1): "x", (1, 2): ""})
+        self.assertTrue(np.isnan(values[0, 1]))
+
+    def test_paste_and_report_invalid_cells(self):
+        invalid = self.entries.paste("2\t1\t3\n1\tabc\t5")
+        self.assertEqual(invalid, [(1, 1)])
+        self.assertEqual(self.entries.invalid_cells(), [(1, 1)])
+        self.assertEqual(self.entries.text(1, 1), "abc")
+
+        self.assertEqual(self.entries.paste("3\n4", row=1, column=1), [])
+        self.assertTrue(self.entries.is_valid())
+        self.assertTrue(np.array_equal(self.entries.A, [[2, 1], [1, 3]]))
+
+        pasted = MatrixEntries.from_text("1 0 0 1\n0 1 0 2\n0 0 1 3")
+        self.assertEqual(pasted.size, 3)
+        self.assertTrue(np.array_equal(pasted.b, [1, 2, 3]))
+        self.assertIsNone(MatrixEntries.from_text("1 2\n3 4"))
+
+    def test_paste_parsed_values(self):
+        values, invalid = parse_matrix_text("5\t7")
+        self.assertTrue(MatrixEntries.is_system_shape(values.shape))
+        self.assertEqual(self.entries.paste_values(values, invalid, row=1, column=1), [])
+        self.assertEqual(self.entries.text(1, 1), "5")
+        self.assertEqual(self.entries.text(1, 2), "7")
+        self.assertEqual(self.entries.size, 2)
+
+        values, invalid = parse_matrix_text("1 0 x\n0 1 2")
+        pasted = MatrixEntries.from_values(values, invalid)
+        self.assertEqual(pasted.size, 2)
+        self.assertEqual(pasted.invalid_cells(), [(0, 2)])
+        self.assertEqual(pasted.text(0, 2), "x")
+        self.assertFalse(MatrixEntries.is_system_shape((2, 2)))
+
+
+if __name__ == '__main__':
+    unittest.main()
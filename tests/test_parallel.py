@@ -0,0 +1,95 @@
+import os
+import unittest
+from concurrent.futures import Future
+from unittest.mock import patch
+import numpy as np
+from r_engen.equation_solver import SingularMatrixError  # Используйте абсолютный путь
+from r_engen.parallel import ParallelSolver
+from r_engen.sparse_matrix import CSRMatrix
+
+
+class TestParallelSolver(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.jobs = [(rng.standard_normal((8, 8)) + 8 * np.eye(8), rng.standard_normal(8), 'lu')
+                     for _ in range(20)]
+        self.jobs[3] = ([[1, 2], [2, 4]], [1, 2], 'Gauss')  # вырожденная система
+        self.jobs[7] = (CSRMatrix.from_dense(self.jobs[7][0]), self.jobs[7][1], 'sparse')
+        self.jobs[11] = (self.jobs[11][0], self.jobs[11][1], 'bogus')  # неизвестный метод
+        self.solver = ParallelSolver(max_workers=2, chunk_size=3)
+
+    def check_results(self, results):
+        self.assertEqual(sorted(index for index, _ in results), list(range(len(self.jobs))))
+        for index, result in results:
+            A, b, method = self.jobs[index]
+            if index == 3:
+                self.assertIsInstance(result, SingularMatrixError)
+                continue
+            if index == 11:
+                self.assertIsInstance(result, ValueError)
+                continue
+            dense = A.to_dense() if isinstance(A, CSRMatrix) else A
+            self.assertEqual(result.method, method)
+            self.assertTrue(np.allclose(dense @ result.x, b))
+
+    def test_solve_many_ordered(self):
+        results = list(self.solver.solve_many(iter(self.jobs)))
+        self.assertEqual([index for index, _ in results], list(range(len(self.jobs))))
+        self.check_results(results)
+
+    def test_solve_many_unordered(self):
+        self.check_results(list(self.solver.solve_many(self.jobs, ordered=False)))
+
+    def test_results_do_not_carry_factorizations(self):
+        for _, result in self.solver.solve_many(self.jobs[:3]):
+            self.assertIsNone(result.factorization)
+
+    def test_ordered_results_wait_for_slow_first_chunk_with_bounded_memory(self):
+        submitted = []
+        yielded_at = []
+
+        class Executor:
+            def __init__(self, max_workers):
+                pass
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *args):
+                return False
+
+            def submit(self, function, *args):
+                future = Future()
+                future.set_result(function(*args))
+                submitted.append(future)
+                return future
+
+            def shutdown(self, cancel_futures=False):
+                pass
+
+        def wait(futures, return_when):
+            # Первый пакет "решается" дольше всех: он готов, только когда других нет
+            done = {future for future in futures if future is not submitted[0]}
+            return done or set(futures), set()
+
+        solver = ParallelSolver(max_workers=1, chunk_size=1, max_pending=3)
+        with patch('r_engen.parallel.ProcessPoolExecutor', Executor), patch('r_engen.parallel.wait', wait):
+            for index, _ in solver.solve_many(self.jobs):
+                yielded_at.append((index, len(submitted)))
+        self.assertEqual([index for index, _ in yielded_at], list(range(len(self.jobs))))
+        # До выдачи первого результата отправлено не больше max_pending пакетов
+        self.assertEqual(yielded_at[0][1], 3)
+
+    @unittest.skipUnless(os.path.isdir('/dev/shm'), 'блоки общей памяти не видны в файловой системе')
+    def test_closed_generator_releases_shared_memory(self):
+        before = set(os.listdir('/dev/shm'))
+        # Первый результат выдается, пока остальные пакеты еще числятся в работе
+        results = self.solver.solve_many(self.jobs, ordered=False)
+        next(results)
+        results.close()
+        self.assertEqual(set(os.listdir('/dev/shm')) - before, set())
+
+
+if __name__ == '__main__':
+    unittest.main()
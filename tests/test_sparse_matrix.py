@@ -0,0 +1,61 @@
+import unittest
+import numpy as np
+from r_engen.sparse_matrix import CSRMatrix, minimum_degree, reverse_cuthill_mckee  # Используйте абсолютный путь
+
+
+class TestCSRMatrix(unittest.TestCase):
+
+    def setUp(self):
+        self.dense = np.array([
+            [4, 0, 1, 0],
+            [0, 3, 0, 0],
+            [2, 0, 5, 7],
+            [0, 0, 0, 6]
+        ], dtype=float)
+        self.matrix = CSRMatrix.from_dense(self.dense)
+
+    def test_from_dense(self):
+        self.assertEqual(self.matrix.nnz, 7)
+        self.assertEqual(list(self.matrix.indptr), [0, 2, 3, 6, 7])
+        self.assertTrue(np.array_equal(self.matrix.to_dense(), self.dense))
+
+    def test_from_coo_sums_duplicates(self):
+        matrix = CSRMatrix.from_coo([0, 1, 0, 1], [1, 0, 1, 1], [1.0, 2.0, 3.0, 0.0], (2, 2))
+        self.assertTrue(np.array_equal(matrix.to_dense(), [[0, 4], [2, 0]]))
+        self.assertEqual(matrix.nnz, 2)
+
+    def test_matmul(self):
+        x = np.array([1.0, -2.0, 3.0, 0.5])
+        self.assertTrue(np.allclose(self.matrix @ x, self.dense @ x))
+        X = np.arange(8.0).reshape(4, 2)
+        self.assertTrue(np.allclose(self.matrix @ X, self.dense @ X))
+
+    def test_transpose_and_diagonal(self):
+        self.assertTrue(np.array_equal(self.matrix.transpose().to_dense(), self.dense.T))
+        self.assertTrue(np.array_equal(self.matrix.diagonal(), [4, 3, 5, 6]))
+
+    def test_reverse_cuthill_mckee_reduces_bandwidth(self):
+        # Трехдиагональная матрица со случайно перемешанными строками и столбцами
+        n = 40
+        tridiagonal = 2 * np.eye(n) - np.eye(n, k=1) - np.eye(n, k=-1)
+        shuffle = np.random.default_rng(3).permutation(n)
+        matrix = CSRMatrix.from_dense(tridiagonal[np.ix_(shuffle, shuffle)])
+
+        perm = reverse_cuthill_mckee(matrix)
+        self.assertEqual(sorted(perm), list(range(n)))
+        reordered = matrix.permute(perm, perm)
+        bandwidth = np.max(np.abs(reordered.row_indices() - reordered.indices))
+        self.assertEqual(bandwidth, 1)
+
+    def test_minimum_degree_starts_with_leaves(self):
+        # Звезда: центр связан со всеми вершинами, поэтому исключается среди последних двух
+        n = 10
+        star = np.eye(n)
+        star[0, 1:] = star[1:, 0] = 1.0
+        perm = minimum_degree(CSRMatrix.from_dense(star))
+        self.assertEqual(sorted(perm), list(range(n)))
+        self.assertIn(0, perm[-2:])
+
+
+if __name__ == '__main__':
+    unittest.main()
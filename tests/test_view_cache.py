@@ -0,0 +1,73 @@
+import unittest
+from types import SimpleNamespace
+from r_engen.view_cache import ViewCache  # Используйте абсолютный путь
+
+
+class TestViewCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = ViewCache('light', 'en')
+        self.texts = {'en': 'Back', 'ru': 'Назад'}
+
+    def build_page(self):
+        label = SimpleNamespace(value=None, color=None)
+        self.cache.bind(label, 'value', lambda theme, language: self.texts[language])
+        self.cache.bind(label, 'color', lambda theme, language: 'black' if theme == 'light' else 'white')
+        return SimpleNamespace(visible=True, label=label)
+
+    def test_page_is_built_once(self):
+        calls = []
+
+        def builder():
+            calls.append(1)
+            return self.build_page()
+
+        view, built = self.cache.build('main', builder)
+        self.assertTrue(built)
+        again, built = self.cache.build('main', builder)
+        self.assertFalse(built)
+        self.assertIs(view, again)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(view.label.value, 'Back')
+
+    def test_show_toggles_only_visibility(self):
+        header, _ = self.cache.build('top_panel', self.build_page, pinned=True)
+        main, _ = self.cache.build('main', self.build_page)
+        settings, _ = self.cache.build('settings', self.build_page)
+        self.assertEqual(self.cache.show('main'), [main])
+        self.assertEqual(self.cache.show('settings'), [main, settings])
+        self.assertEqual(self.cache.show('settings'), [])
+        self.assertTrue(header.visible)
+        self.assertFalse(main.visible)
+        self.assertTrue(settings.visible)
+
+    def test_apply_updates_bound_attributes_in_place(self):
+        main, _ = self.cache.build('main', self.build_page)
+        self.assertEqual(self.cache.apply('dark', 'ru'), 2)
+        self.assertEqual(main.label.value, 'Назад')
+        self.assertEqual(main.label.color, 'white')
+        # Повторное применение тех же настроек ничего не меняет
+        self.assertEqual(self.cache.apply('dark', 'ru'), 0)
+
+    def test_drop_removes_page_bindings(self):
+        main, _ = self.cache.build('main', self.build_page)
+        self.cache.show('main')
+        self.assertIs(self.cache.drop('main'), main)
+        self.assertNotIn('main', self.cache)
+        self.assertIsNone(self.cache.current)
+        self.cache.apply('dark', 'ru')
+        self.assertEqual(main.label.value, 'Back')
+
+    def test_failed_build_is_not_cached(self):
+        def builder():
+            self.build_page()
+            raise ValueError
+
+        with self.assertRaises(ValueError):
+            self.cache.build('main', builder)
+        self.assertNotIn('main', self.cache)
+        self.assertEqual(self.cache.bindings, {})
+
+
+if __name__ == '__main__':
+    unittest.main()